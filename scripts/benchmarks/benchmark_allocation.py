@@ -0,0 +1,45 @@
+# scripts/benchmarks/benchmark_allocation.py
+"""
+Measure how many households the multi-loan prepayment allocator solves per minute.
+
+Usage: python scripts/benchmarks/benchmark_allocation.py [--households 5000] [--loans 4]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "src"))
+
+from mortgage.allocation import LoanAccount, allocate_prepayments
+
+
+def random_households(count: int, loans_per_household: int, seed: int = 0) -> list:
+    rng = random.Random(seed)
+    households = []
+    for _ in range(count):
+        loans = [LoanAccount(f"loan{i}", rng.uniform(5000, 700000), rng.uniform(2.5, 11.0),
+                             rng.choice((60, 120, 180, 360))) for i in range(loans_per_household)]
+        households.append((loans, rng.uniform(0, 5000)))
+    return households
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--households", type=int, default=5000, help="Number of households to solve.")
+    parser.add_argument("--loans", type=int, default=4, help="Loans per household.")
+    args = parser.parse_args()
+
+    households = random_households(args.households, args.loans)
+    started = time.perf_counter()
+    for loans, budget in households:
+        allocate_prepayments(loans, budget)
+    seconds = time.perf_counter() - started
+    print(f"{args.households:,d} households of {args.loans} loans in {seconds:.3f}s -> "
+          f"{seconds / args.households * 1e6:.1f} us/household, {args.households / seconds * 60:,.0f}/minute")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+# scripts/benchmarks/benchmark_arm.py
+"""
+Compare pricing adjustable-rate loans in closed form (one segment per reset) with the
+month-by-month simulation.
+
+Usage: python scripts/benchmarks/benchmark_arm.py [--loans 2000]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "src"))
+
+from mortgage.cache import ScheduleCache
+from mortgage.calculator import MortgageCalculator
+from mortgage.rates import RateSchedule
+
+
+def random_arms(count: int, seed: int = 0) -> list:
+    """5/1 ARMs with random initial rates and projected index paths."""
+    rng = random.Random(seed)
+    loans = []
+    for _ in range(count):
+        initial_rate = rng.uniform(4.0, 7.5)
+        indexed_rates = [rng.uniform(3.0, 10.0) for _ in range(25)]
+        rates = RateSchedule.arm(initial_rate, indexed_rates)
+        loans.append(MortgageCalculator(rng.uniform(250000, 900000), rng.uniform(20000, 200000), 30, initial_rate,
+                                        cache=ScheduleCache(maxsize=0), rate_schedule=rates))
+    return loans
+
+
+def time_pricing(price, loans: list) -> float:
+    started = time.perf_counter()
+    for calculator in loans:
+        price(calculator)
+    return time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--loans", type=int, default=2000, help="Number of loans to price.")
+    args = parser.parse_args()
+
+    loans = random_arms(args.loans)
+    simulated_seconds = time_pricing(lambda calculator: calculator.summarize().total_interest, loans)
+    closed_form_seconds = time_pricing(lambda calculator: calculator.cumulative_interest(), loans)
+
+    for name, seconds in [("Monthly", simulated_seconds), ("Closed form", closed_form_seconds)]:
+        print(f"{name:<12} {args.loans:,d} loans in {seconds:8.3f}s -> {seconds / args.loans * 1e6:10.1f} us/loan")
+    print(f"Speedup: {simulated_seconds / closed_form_seconds:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+# scripts/benchmarks/benchmark_batch.py
+"""
+Compare loans/second of the vectorized batch engine against the scalar
+MortgageCalculator.get_amortization_schedule loop.
+
+Usage: python scripts/benchmarks/benchmark_batch.py [--loans 100000] [--scalar-loans 2000]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "src"))
+
+import numpy as np
+
+from mortgage.batch import iter_batches
+from mortgage.calculator import MortgageCalculator
+
+
+def random_portfolio(num_loans: int, seed: int = 0):
+    """Generate a reproducible portfolio of principals, rates (in 1/8% steps) and terms."""
+    rng = np.random.default_rng(seed)
+    principals = rng.uniform(100000, 900000, num_loans).round(2)
+    rates = rng.integers(40, 64, num_loans) / 8
+    terms = rng.choice([10, 15, 30], num_loans)
+    return principals, rates, terms
+
+
+def time_scalar(principals, rates, terms) -> float:
+    start = time.perf_counter()
+    for principal, rate, term in zip(principals.tolist(), rates.tolist(), terms.tolist()):
+        MortgageCalculator(principal, 0, term, rate).get_amortization_schedule({})
+    return time.perf_counter() - start
+
+
+def time_batch(principals, rates, terms, chunk_size: int) -> float:
+    start = time.perf_counter()
+    for _ in iter_batches(principals, rates, terms, chunk_size=chunk_size):
+        pass
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--loans", type=int, default=100000, help="Loans to amortize with the batch engine.")
+    parser.add_argument("--scalar-loans", type=int, default=2000, help="Loans to amortize with the scalar loop.")
+    parser.add_argument("--chunk-size", type=int, default=10000, help="Loans per batch chunk.")
+    args = parser.parse_args()
+
+    principals, rates, terms = random_portfolio(max(args.loans, args.scalar_loans))
+
+    scalar_seconds = time_scalar(principals[:args.scalar_loans], rates[:args.scalar_loans], terms[:args.scalar_loans])
+    batch_seconds = time_batch(principals[:args.loans], rates[:args.loans], terms[:args.loans], args.chunk_size)
+
+    scalar_rate = args.scalar_loans / scalar_seconds
+    batch_rate = args.loans / batch_seconds
+    print(f"Scalar loop:  {args.scalar_loans:>9,d} loans in {scalar_seconds:8.3f}s -> {scalar_rate:12,.0f} loans/s")
+    print(f"Batch engine: {args.loans:>9,d} loans in {batch_seconds:8.3f}s -> {batch_rate:12,.0f} loans/s")
+    print(f"Speedup: {batch_rate / scalar_rate:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+# scripts/benchmarks/benchmark_cents.py
+"""
+Compare loans/second of the exact integer-cents engine with the float engine, and with a
+straightforward decimal.Decimal loop, for single loans and for the NumPy batch engines.
+
+Usage: python scripts/benchmarks/benchmark_cents.py [--loans 100000] [--scalar-loans 2000]
+"""
+
+import argparse
+import os
+import sys
+import time
+from decimal import ROUND_HALF_EVEN, Decimal
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "src"))
+
+import numpy as np
+
+from mortgage.batch import amortize_cents_batch, iter_batches
+from mortgage.calculator import MortgageCalculator
+from mortgage.cents import amortize_cents, rate_units
+from mortgage.cache import ScheduleCache
+
+CENT = Decimal("0.01")
+_NO_CACHE = ScheduleCache(maxsize=0)
+
+
+def random_portfolio(num_loans: int, seed: int = 0):
+    """Generate a reproducible portfolio of whole-cent principals, rates (in 1/8% steps) and terms."""
+    rng = np.random.default_rng(seed)
+    principals = rng.integers(10000000, 90000000, num_loans)
+    rates = rng.integers(40, 64, num_loans) / 8
+    terms = rng.choice([10, 15, 30], num_loans)
+    return principals, rates, terms
+
+
+def decimal_schedule(principal: Decimal, annual_rate: Decimal, total_payments: int) -> list:
+    """The naive exact approach: the scalar loop with every value a Decimal quantized to cents."""
+    rate = annual_rate / 1200
+    payment = (principal * rate / (1 - (1 + rate) ** -total_payments)).quantize(CENT, ROUND_HALF_EVEN)
+    balance = principal
+    rows = []
+    for month in range(1, total_payments + 1):
+        interest = (balance * rate).quantize(CENT, ROUND_HALF_EVEN)
+        principal_payment = payment - interest
+        if principal_payment >= balance or month == total_payments:
+            principal_payment = balance
+        balance -= principal_payment
+        rows.append((month, principal_payment + interest, principal_payment, interest, balance))
+        if not balance:
+            break
+    return rows
+
+
+def time_loop(function, loans) -> float:
+    start = time.perf_counter()
+    for loan in loans:
+        function(*loan)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--loans", type=int, default=100000, help="Loans to amortize with the batch engines.")
+    parser.add_argument("--scalar-loans", type=int, default=2000, help="Loans to amortize with the scalar loops.")
+    parser.add_argument("--chunk-size", type=int, default=10000, help="Loans per batch chunk.")
+    args = parser.parse_args()
+
+    principals, rates, terms = random_portfolio(max(args.loans, args.scalar_loans))
+    scalar = list(zip(principals[:args.scalar_loans].tolist(), rates[:args.scalar_loans].tolist(),
+                      terms[:args.scalar_loans].tolist()))
+
+    results = [
+        ("Float scalar", args.scalar_loans, time_loop(
+            lambda cents, rate, term: MortgageCalculator(cents / 100, 0, term, rate,
+                                                         cache=_NO_CACHE).get_amortization_schedule(), scalar)),
+        ("Cents scalar", args.scalar_loans, time_loop(
+            lambda cents, rate, term: amortize_cents(cents, rate_units(rate), term * 12), scalar)),
+        ("Decimal scalar", args.scalar_loans, time_loop(
+            lambda cents, rate, term: decimal_schedule(Decimal(cents) / 100, Decimal(str(rate)), term * 12), scalar)),
+    ]
+
+    batch = (principals[:args.loans], rates[:args.loans], terms[:args.loans])
+    start = time.perf_counter()
+    for _ in iter_batches(batch[0] / 100, batch[1], batch[2], chunk_size=args.chunk_size):
+        pass
+    results.append(("Float batch", args.loans, time.perf_counter() - start))
+    start = time.perf_counter()
+    for begin in range(0, args.loans, args.chunk_size):
+        amortize_cents_batch(*(column[begin:begin + args.chunk_size] for column in batch))
+    results.append(("Int64 batch", args.loans, time.perf_counter() - start))
+
+    float_rate = args.scalar_loans / results[0][2]
+    for name, loans, seconds in results:
+        rate = loans / seconds
+        print(f"{name:<15} {loans:>9,d} loans in {seconds:8.3f}s -> {rate:12,.0f} loans/s "
+              f"({rate / float_rate:6.2f}x float scalar)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+# scripts/benchmarks/benchmark_costcompare.py
+"""
+Measure household configurations evaluated per second by mortgage.costcompare: one
+evaluate() call per household, and evaluate_households() over NumPy arrays of random
+children counts, tuition, elementary ratios, appreciation rates and horizons.
+
+Usage: python scripts/benchmarks/benchmark_costcompare.py [--households 100000] [--scalar-households 2000]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "src"))
+
+import numpy as np
+
+from mortgage.costcompare import CostComparison
+
+
+def random_households(count: int, seed: int = 0) -> dict:
+    rng = np.random.default_rng(seed)
+    return {
+        "num_children": rng.integers(1, 5, count),
+        "highest_grade_tuition": rng.uniform(10000, 45000, count),
+        "elementary_ratio": rng.uniform(0.4, 0.8, count),
+        "annual_growth_rate": rng.uniform(0.0, 0.06, count),
+        "years": rng.integers(10, 21, count),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--households", type=int, default=100000, help="Households for the vectorized pass.")
+    parser.add_argument("--scalar-households", type=int, default=2000, help="Households evaluated one at a time.")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    comparison = CostComparison()
+    comparison.housing()
+    setup_seconds = time.perf_counter() - start
+    households = random_households(max(args.households, args.scalar_households))
+    cells = len(comparison.cases) * len(comparison.options)
+
+    start = time.perf_counter()
+    for i in range(args.scalar_households):
+        comparison.evaluate(**{field: values[i].item() for field, values in households.items()})
+    scalar_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    comparison.evaluate_households(**{field: values[:args.households] for field, values in households.items()})
+    vector_seconds = time.perf_counter() - start
+
+    print(f"Amortizing the spec's loans: {setup_seconds * 1000:.1f} ms (once per spec)")
+    for name, count, seconds in (("evaluate()", args.scalar_households, scalar_seconds),
+                                 ("evaluate_households()", args.households, vector_seconds)):
+        print(f"{name:<22} {count:>9,d} households in {seconds:7.3f}s -> {count / seconds:12,.0f} households/s "
+              f"({count * cells / seconds:,.0f} option x case cells/s)")
+
+
+if __name__ == "__main__":
+    main()
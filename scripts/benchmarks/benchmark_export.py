@@ -0,0 +1,72 @@
+# scripts/benchmarks/benchmark_export.py
+"""
+Compare exporting schedules through MortgageCalculator.print_schedule (text printed row by row)
+with the binary ScheduleWriter, memory-mapped ScheduleReader slicing and the buffered CSV writer.
+
+Usage: python scripts/benchmarks/benchmark_export.py [--loans 2000]
+"""
+
+import argparse
+import contextlib
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "src"))
+
+from mortgage.cache import ScheduleCache
+from mortgage.calculator import MortgageCalculator
+from utils.export import ScheduleReader, ScheduleWriter, write_csv
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--loans", type=int, default=2000, help="Number of loan schedules to export.")
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    cache = ScheduleCache(maxsize=args.loans)
+    calculators = [MortgageCalculator(rng.uniform(200000, 900000), 0, rng.choice([15, 30]), rng.randint(40, 64) / 8,
+                                      cache=cache) for _ in range(args.loans)]
+    # Compute the schedules up front so that only the output paths are timed.
+    schedules = [calculator.get_amortization_schedule() for calculator in calculators]
+    rows = sum(len(schedule) for schedule in schedules)
+
+    timings = {}
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        start = time.perf_counter()
+        for calculator in calculators:
+            calculator.print_schedule()  # Served from the cache, so this times the printing only.
+        timings["print_schedule"] = time.perf_counter() - start
+
+    with tempfile.TemporaryDirectory() as directory:
+        with open(os.path.join(directory, "schedules.csv"), "w") as f:
+            start = time.perf_counter()
+            for loan_id, schedule in enumerate(schedules):
+                write_csv(schedule, f, loan_id=loan_id, header=loan_id == 0)
+            timings["buffered CSV"] = time.perf_counter() - start
+
+        path = os.path.join(directory, "schedules.bin")
+        start = time.perf_counter()
+        with ScheduleWriter(path) as writer:
+            for schedule in schedules:
+                writer.write(schedule)
+        timings["binary write"] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        with ScheduleReader(path) as reader:
+            for position in range(len(reader)):
+                reader.schedule(position, start_month=60, end_month=72)
+        timings["mmap read (12 months/loan)"] = time.perf_counter() - start
+
+    read_seconds = timings.pop("mmap read (12 months/loan)")
+    print(f"{args.loans:,d} schedules, {rows:,d} rows")
+    for name, seconds in timings.items():
+        print(f"{name:<16} {seconds:8.3f}s  {rows / seconds:14,.0f} rows/s")
+    print(f"Slicing 12 months of every loan: {args.loans / read_seconds:,.0f} loans/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+# scripts/benchmarks/benchmark_loan_index.py
+"""
+Time answering payoff-range and top-k queries over a loan book from a LoanBookIndex,
+against re-simulating every loan's schedule for each query, plus the cost of building
+the index and of refreshing it after 1% of the plans change.
+
+Usage: python scripts/benchmarks/benchmark_loan_index.py [--loans 5000]
+"""
+
+import argparse
+import heapq
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "src"))
+
+from mortgage.cache import ScheduleCache
+from mortgage.calculator import MortgageCalculator
+from mortgage.plan import PrepaymentPlan, PrepaymentRule
+from utils.loan_index import LoanBookIndex
+from utils.scenario_store import Scenario, ScenarioStore
+
+
+def random_scenarios(count: int, seed: int = 0) -> list:
+    rng = random.Random(seed)
+    scenarios = []
+    for i in range(count):
+        loan_term = rng.choice((15, 20, 30))
+        home_value = float(rng.randrange(200000, 1500000, 1000))
+        details = {"home_value": home_value, "down_payment": home_value * rng.choice((0.1, 0.2, 0.25)),
+                   "loan_term": loan_term, "interest_rate": rng.randrange(3000, 8000, 125) / 1000}
+        plan = PrepaymentPlan([PrepaymentRule(rng.randint(1, 24), rng.choice((1, 3, 12)), None,
+                                              float(rng.randrange(100, 5000, 100)))], horizon=loan_term * 12)
+        scenarios.append(Scenario(f"loan-{i:06d}", details, plan))
+    return scenarios
+
+
+def timed(function, *args):
+    start = time.perf_counter()
+    result = function(*args)
+    return result, time.perf_counter() - start
+
+
+def simulate_queries(store: ScenarioStore, last_payoff: int, month: int, k: int) -> tuple:
+    """The queries answered by amortizing every loan in the store."""
+    no_cache = ScheduleCache(maxsize=0)
+    payoffs, remaining = [], []
+    for scenario in store.find():
+        schedule = MortgageCalculator(**scenario.details, cache=no_cache).get_amortization_schedule(
+            scenario.plan.to_dict() if scenario.plan else None)
+        if len(schedule) <= last_payoff:
+            payoffs.append((len(schedule), scenario.name))
+        if len(schedule) > month:
+            remaining.append((sum(schedule.interest_payment[month:]), scenario.name))
+    return (sorted(payoffs), heapq.nlargest(k, remaining))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--loans", type=int, default=5000, help="Loans in the book.")
+    parser.add_argument("--top", type=int, default=100, help="k of the top-k query.")
+    args = parser.parse_args()
+
+    scenarios = random_scenarios(args.loans)
+    with tempfile.TemporaryDirectory() as directory:
+        with ScenarioStore(os.path.join(directory, "scenarios.db")) as store:
+            store.save_many(scenarios)
+            index = LoanBookIndex(store)
+            _, build_seconds = timed(index.refresh)
+
+            changed = [Scenario(scenario.name, scenario.details, None, scenario.borrower)
+                       for scenario in scenarios[::100]]
+            store.save_many(changed)
+            refreshed, refresh_seconds = timed(index.refresh)
+            assert refreshed == len(changed)
+
+            def indexed_queries():
+                return index.payoff_range(last=180), index.top(args.top, month=60)
+
+            (payoffs, top), index_seconds = timed(indexed_queries)
+            (expected_payoffs, expected_top), simulate_seconds = timed(simulate_queries, store, 180, 60, args.top)
+            assert [name for name, _ in payoffs] == [name for _, name in expected_payoffs]
+            assert [name for name, _ in top] == [name for _, name in expected_top]
+
+    print(f"{args.loans:,d} loans")
+    print(f"Build the index:                    {build_seconds:8.3f}s")
+    print(f"Refresh after {len(changed):,d} plans change:    {refresh_seconds:8.3f}s")
+    print(f"Payoff range + top-{args.top} (simulated): {simulate_seconds:8.3f}s")
+    print(f"Payoff range + top-{args.top} (indexed):   {index_seconds:8.4f}s "
+          f"({simulate_seconds / index_seconds:,.0f}x faster)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+# scripts/benchmarks/benchmark_scenarios.py
+"""
+Compare cold-loading many saved scenarios from per-scenario JSON files (the
+data/mortgage_details.json and data/prepayment_details.json layout, with expanded
+{month: amount} prepayments as older files have them) with loading them from a
+ScenarioStore, plus a bulk insert and an indexed borrower lookup.
+
+Usage: python scripts/benchmarks/benchmark_scenarios.py [--scenarios 5000]
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "src"))
+
+from mortgage.plan import PrepaymentPlan, PrepaymentRule
+from utils.scenario_store import Scenario, ScenarioStore
+
+
+def random_scenarios(count: int, seed: int = 0) -> list:
+    rng = random.Random(seed)
+    scenarios = []
+    for i in range(count):
+        loan_term = rng.choice((15, 20, 30))
+        home_value = float(rng.randrange(200000, 1500000, 1000))
+        details = {"home_value": home_value, "down_payment": home_value * rng.choice((0.1, 0.2, 0.25)),
+                   "loan_term": loan_term, "interest_rate": rng.randrange(3000, 8000, 125) / 1000}
+        plan = PrepaymentPlan([PrepaymentRule(rng.randint(1, 24), rng.choice((1, 3, 12)), None,
+                                              float(rng.randrange(100, 5000, 100)))], horizon=loan_term * 12)
+        scenarios.append(Scenario(f"scenario-{i:06d}", details, plan, f"borrower-{i % 500}"))
+    return scenarios
+
+
+def write_json_files(directory: str, scenarios: list):
+    for scenario in scenarios:
+        with open(os.path.join(directory, f"{scenario.name}.details.json"), "w") as f:
+            json.dump(scenario.details, f)
+        with open(os.path.join(directory, f"{scenario.name}.prepayments.json"), "w") as f:
+            json.dump({str(month): amount for month, amount in scenario.plan.to_dict().items()}, f)
+
+
+def load_json_files(directory: str, names: list) -> list:
+    scenarios = []
+    for name in names:
+        with open(os.path.join(directory, f"{name}.details.json")) as f:
+            details = json.load(f)
+        with open(os.path.join(directory, f"{name}.prepayments.json")) as f:
+            plan = PrepaymentPlan.from_dict(json.load(f), horizon=details["loan_term"] * 12)
+        scenarios.append(Scenario(name, details, plan))
+    return scenarios
+
+
+def timed(function, *args):
+    start = time.perf_counter()
+    result = function(*args)
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scenarios", type=int, default=5000, help="Scenarios to save and load.")
+    args = parser.parse_args()
+
+    scenarios = random_scenarios(args.scenarios)
+    names = [scenario.name for scenario in scenarios]
+    with tempfile.TemporaryDirectory() as directory:
+        write_json_files(directory, scenarios)
+        loaded, json_seconds = timed(load_json_files, directory, names)
+        assert len(loaded) == args.scenarios
+
+        path = os.path.join(directory, "scenarios.db")
+        with ScenarioStore(path) as store:
+            _, insert_seconds = timed(store.save_many, scenarios)
+        with ScenarioStore(path) as store:
+            loaded, store_seconds = timed(store.find)
+            assert loaded == scenarios
+            _, lookup_seconds = timed(lambda: [store.find(borrower=f"borrower-{i}") for i in range(100)])
+
+    print(f"{args.scenarios:,d} scenarios")
+    print(f"Bulk insert into the store:   {insert_seconds:8.3f}s")
+    print(f"Cold load from JSON files:    {json_seconds:8.3f}s")
+    print(f"Cold load from the store:     {store_seconds:8.3f}s ({json_seconds / store_seconds:.1f}x faster)")
+    print(f"100 borrower lookups:         {lookup_seconds:8.3f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+# scripts/benchmarks/benchmark_session.py
+"""
+Time a run of interactive what-if edits (late prepayment edits, with an occasional rate
+change) answered by a LoanSession, which recomputes only the values an edit affects and
+resumes the schedule from the edited month, against rebuilding the calculator and
+recomputing the schedule and both summaries from scratch after every edit.
+
+Usage: python scripts/benchmarks/benchmark_session.py [--edits 500] [--repeat 5]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "src"))
+
+from mortgage.cache import ScheduleCache
+from mortgage.calculator import MortgageCalculator
+from mortgage.session import LoanSession
+
+LOAN = (500000.0, 100000.0, 30, 6.375)
+
+
+def random_edits(count: int, seed: int = 0) -> list:
+    rng = random.Random(seed)
+    edits = []
+    for i in range(count):
+        if i % 50 == 49:
+            edits.append(("interest_rate", rng.randrange(5000, 7500, 125) / 1000))
+        else:
+            edits.append(("extra", (rng.randint(180, 300), float(rng.randrange(0, 20000, 1000)))))
+    return edits
+
+
+def from_scratch(edits: list) -> list:
+    no_cache = ScheduleCache(maxsize=0)
+    home_value, down_payment, loan_term, interest_rate = LOAN
+    plan, results = {}, []
+    for name, value in edits:
+        if name == "interest_rate":
+            interest_rate = value
+        else:
+            month, amount = value
+            plan = {m: a for m, a in plan.items() if m != month}
+            if amount:
+                plan[month] = amount
+        calculator = MortgageCalculator(home_value, down_payment, loan_term, interest_rate, cache=no_cache)
+        schedule = calculator.get_amortization_schedule(plan)
+        summary = calculator.summarize(plan)
+        base = calculator.summarize()
+        results.append((len(schedule), base.total_interest - summary.total_interest))
+    return results
+
+
+def with_session(edits: list) -> list:
+    session = LoanSession(*LOAN, cache=ScheduleCache(maxsize=0))
+    results = []
+    for name, value in edits:
+        if name == "interest_rate":
+            session.interest_rate = value
+        else:
+            session.set_prepayment(*value)
+        results.append((len(session.schedule), session.savings["interest_saved"]))
+    return results
+
+
+def best_of(repeat: int, function, *args):
+    best, result = float("inf"), None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function(*args)
+        best = min(best, time.perf_counter() - start)
+    return result, best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--edits", type=int, default=500, help="What-if edits to apply.")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per timing; the best is reported.")
+    args = parser.parse_args()
+
+    edits = random_edits(args.edits)
+    expected, scratch_seconds = best_of(args.repeat, from_scratch, edits)
+    results, session_seconds = best_of(args.repeat, with_session, edits)
+    assert [month for month, _ in results] == [month for month, _ in expected]
+    assert all(abs(saved - expected_saved) < 1e-6 for (_, saved), (_, expected_saved) in zip(results, expected))
+
+    print(f"{args.edits:,d} what-if edits")
+    print(f"Recomputed from scratch: {scratch_seconds:8.3f}s ({scratch_seconds / args.edits * 1000:.2f} ms/edit)")
+    print(f"LoanSession:             {session_seconds:8.3f}s ({session_seconds / args.edits * 1000:.2f} ms/edit, "
+          f"{scratch_seconds / session_seconds:.1f}x faster)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+# scripts/benchmarks/benchmark_solver.py
+"""
+Compare the closed-form target-payoff solver (solve_prepayment_amount) against the
+bisection search previously used by get_prepayment_amount.
+
+Usage: python scripts/benchmarks/benchmark_solver.py [--borrowers 2000]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "src"))
+
+from mortgage.prepayment import solve_prepayment_amount
+
+
+def bisection_prepayment_amount(mortgage_details: dict, target_months: int, frequency_months: int, start_month: int):
+    """
+    The former get_prepayment_amount search, without the input prompts: a bisection over a
+    full month-by-month simulation per iteration.
+    """
+    principal = mortgage_details['home_value'] - mortgage_details['down_payment']
+    monthly_rate = mortgage_details['interest_rate'] / 100 / 12
+    total_payments = mortgage_details['loan_term'] * 12
+    if monthly_rate != 0:
+        monthly_payment = principal * (monthly_rate * (1 + monthly_rate) ** total_payments) / (
+                (1 + monthly_rate) ** total_payments - 1)
+    else:
+        monthly_payment = principal / total_payments
+
+    def simulate_with_extra(X: float) -> float:
+        balance = principal
+        month = 1
+        while month <= target_months and balance > 0:
+            if month >= start_month and ((month - start_month) % frequency_months == 0):
+                balance -= X
+                if balance <= 0:
+                    return balance
+            interest_payment = balance * monthly_rate
+            principal_payment = monthly_payment - interest_payment
+            if principal_payment > balance:
+                principal_payment = balance
+            balance -= principal_payment
+            month += 1
+        return balance
+
+    low = 0.0
+    high = principal
+    tolerance = 1e-2
+    extra_payment = 0.0
+    while low <= high:
+        mid = (low + high) / 2
+        final_balance = simulate_with_extra(mid)
+        if abs(final_balance) < tolerance:
+            extra_payment = mid
+            break
+        elif final_balance > 0:
+            low = mid + tolerance
+        else:
+            high = mid - tolerance
+
+    num_intervals = ((target_months - start_month) // frequency_months) + 1 if target_months >= start_month else 0
+    prepayment_schedule = {start_month + i * frequency_months: extra_payment for i in range(num_intervals)}
+    return extra_payment, prepayment_schedule
+
+
+def random_borrowers(count: int, seed: int = 0) -> list:
+    rng = random.Random(seed)
+    borrowers = []
+    for _ in range(count):
+        home_value = rng.uniform(200000, 1000000)
+        details = {
+            'home_value': home_value,
+            'down_payment': home_value * rng.choice([0.05, 0.1, 0.2]),
+            'loan_term': rng.choice([15, 30]),
+            'interest_rate': rng.randint(40, 64) / 8,
+        }
+        borrowers.append((details, rng.randint(24, 120), rng.choice([1, 3, 12]), rng.randint(1, 12)))
+    return borrowers
+
+
+def time_solver(solver, borrowers) -> float:
+    start = time.perf_counter()
+    for details, target_months, frequency_months, start_month in borrowers:
+        solver(details, target_months, frequency_months, start_month)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--borrowers", type=int, default=2000, help="Number of borrowers to solve.")
+    args = parser.parse_args()
+
+    borrowers = random_borrowers(args.borrowers)
+    bisection_seconds = time_solver(bisection_prepayment_amount, borrowers)
+    closed_form_seconds = time_solver(solve_prepayment_amount, borrowers)
+    verified_seconds = time_solver(
+        lambda *solver_args: solve_prepayment_amount(*solver_args, verify=True), borrowers)
+
+    for name, seconds in [("Bisection", bisection_seconds), ("Closed form", closed_form_seconds),
+                          ("Verified", verified_seconds)]:
+        print(f"{name:<12} {args.borrowers:,d} borrowers in {seconds:8.3f}s -> "
+              f"{seconds / args.borrowers * 1e6:10.1f} us/borrower")
+    print(f"Speedup: {bisection_seconds / closed_form_seconds:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
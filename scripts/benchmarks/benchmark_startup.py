@@ -0,0 +1,68 @@
+# scripts/benchmarks/benchmark_startup.py
+"""
+Measure cold-start-to-first-output time of the command-line entry point: the time from
+launching a fresh interpreter until the first line of output arrives, over repeated runs.
+
+The one-shot mode (src/main.py --principal ... --rate ...) is compared with the bare
+interpreter and with importing the calculator and interactive modules, which is what
+every run used to pay for.
+
+Usage: python scripts/benchmarks/benchmark_startup.py [--runs 50] [--json]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+SRC = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "src")
+
+COMMANDS = {
+    "interpreter": ["-c", "print('ready')"],
+    "one-shot": ["main.py", "--principal", "400000", "--rate", "6.375"],
+    "one-shot (json)": ["main.py", "--principal", "400000", "--rate", "6.375", "--prepayment", "500", "--json"],
+    "eager imports": ["-c", "import mortgage.calculator, mortgage.prepayment, utils.mortgage_details; print('ready')"],
+}
+
+
+def time_to_first_output(arguments: list) -> float:
+    started = time.perf_counter()
+    process = subprocess.Popen([sys.executable, *arguments], cwd=SRC, stdout=subprocess.PIPE)
+    line = process.stdout.readline()
+    elapsed = time.perf_counter() - started
+    process.stdout.read()
+    if process.wait() != 0 or not line:
+        raise RuntimeError(f"{' '.join(arguments)} failed with status {process.returncode}.")
+    return elapsed
+
+
+def measure(arguments: list, runs: int) -> dict:
+    time_to_first_output(arguments)  # Warm the OS file cache and the bytecode cache.
+    samples = sorted(time_to_first_output(arguments) for _ in range(runs))
+    return {
+        "median_ms": statistics.median(samples) * 1000,
+        "p90_ms": samples[min(int(0.9 * runs), runs - 1)] * 1000,
+        "min_ms": samples[0] * 1000,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=50, help="Launches per command.")
+    parser.add_argument("--json", action="store_true", help="Print the results as JSON.")
+    args = parser.parse_args()
+
+    results = {name: measure(arguments, args.runs) for name, arguments in COMMANDS.items()}
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    print(f"{'Command':<16} {'median ms':>10} {'p90 ms':>8} {'min ms':>8}")
+    for name, result in results.items():
+        print(f"{name:<16} {result['median_ms']:>10.1f} {result['p90_ms']:>8.1f} {result['min_ms']:>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
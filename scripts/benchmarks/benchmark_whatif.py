@@ -0,0 +1,62 @@
+# scripts/benchmarks/benchmark_whatif.py
+"""
+Time comparing N prepayment plans on one loan: N independent simulations
+(MortgageCalculator.summarize), the NumPy batch engine (amortize_batch over N copies of
+the loan), and mortgage.whatif.compare_plans, which shares the loan's annuity terms across
+plans.
+
+Usage: python scripts/benchmarks/benchmark_whatif.py [--plans 50 200 1000] [--repeat 5]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "src"))
+
+from mortgage.batch import amortize_batch
+from mortgage.cache import ScheduleCache
+from mortgage.calculator import MortgageCalculator
+from mortgage.plan import PrepaymentPlan, PrepaymentRule
+from mortgage.whatif import compare_plans
+
+
+def random_plans(count: int, seed: int = 0) -> dict:
+    """Recurring extra payments with different amounts, frequencies and starts, plus a lump sum."""
+    rng = random.Random(seed)
+    return {f"plan-{i}": PrepaymentPlan([PrepaymentRule(rng.randint(1, 36), rng.choice((1, 3, 6, 12)), None,
+                                                        float(rng.randrange(100, 10000, 100)))],
+                                        {rng.randint(12, 120): float(rng.randrange(0, 100000, 5000))}, horizon=360)
+            for i in range(count)}
+
+
+def best_of(repeat: int, function, *args) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function(*args)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--plans", type=int, nargs="+", default=[50, 200, 1000], help="Numbers of plans to compare.")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per measurement; the fastest is reported.")
+    args = parser.parse_args()
+
+    calculator = MortgageCalculator(699000, 139800, 30, 6.625, cache=ScheduleCache(maxsize=0))
+    print(f"{'Plans':>6}  {'Simulations':>12}  {'Batch engine':>12}  {'compare_plans':>13}")
+    for count in args.plans:
+        plans = random_plans(count)
+        simulations = best_of(args.repeat, lambda: [calculator.summarize(plan) for plan in plans.values()])
+        batch = best_of(args.repeat, amortize_batch, [calculator.principal] * count, calculator.interest_rate,
+                        calculator.loan_term, list(plans.values()))
+        comparison = best_of(args.repeat, compare_plans, calculator, plans)
+        print(f"{count:>6}  {simulations * 1000:>9.1f} ms  {batch * 1000:>9.1f} ms  {comparison * 1000:>10.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,165 @@
+# scripts/benchmarks/load_test.py
+"""
+Load-test the pricing service (python -m service) on localhost and report latency
+percentiles and throughput per endpoint.
+
+Each of --concurrency clients keeps one keep-alive connection open and sends requests back
+to back, so concurrent requests exercise the service's batching. With --spawn the service
+is started (and stopped) by this script.
+
+Usage: python scripts/benchmarks/load_test.py [--spawn] [--port 8080] [--requests 5000]
+                                               [--concurrency 64] [--endpoint summary]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import subprocess
+import sys
+import time
+
+SRC = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "src")
+
+ENDPOINTS = ("payment", "summary", "schedule", "target-payoff")
+
+
+def random_body(rng: random.Random, endpoint: str) -> dict:
+    home_value = rng.uniform(200000, 1000000)
+    body = {
+        "home_value": round(home_value, 2),
+        "down_payment": round(home_value * rng.uniform(0.05, 0.3), 2),
+        "loan_term": rng.choice((15, 20, 30)),
+        "interest_rate": round(rng.uniform(3.0, 8.0), 3),
+    }
+    if endpoint in ("summary", "schedule") and rng.random() < 0.5:
+        body["prepayment_amount"] = rng.choice((100, 500, 2000))
+    if endpoint == "target-payoff":
+        body["target_months"] = rng.randint(60, body["loan_term"] * 12 - 1)
+    return body
+
+
+async def read_response(reader) -> tuple:
+    """Read one response; returns (status, body bytes), handling chunked bodies."""
+    status_line = await reader.readline()
+    if not status_line:
+        raise ConnectionError("Connection closed by the service.")
+    status = int(status_line.split()[1])
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+    if headers.get("transfer-encoding") == "chunked":
+        chunks = []
+        while True:
+            size = int((await reader.readline()).strip(), 16)
+            chunk = await reader.readexactly(size + 2)
+            if not size:
+                break
+            chunks.append(chunk[:-2])
+        return status, b"".join(chunks)
+    return status, await reader.readexactly(int(headers.get("content-length", 0)))
+
+
+async def client(host: str, port: int, endpoint: str, bodies: list, latencies: list, errors: list):
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        for body in bodies:
+            payload = json.dumps(body).encode()
+            request = (f"POST /{endpoint} HTTP/1.1\r\nHost: {host}\r\nContent-Type: application/json\r\n"
+                       f"Content-Length: {len(payload)}\r\n\r\n").encode() + payload
+            started = time.perf_counter()
+            writer.write(request)
+            status, _ = await read_response(reader)
+            latencies.append(time.perf_counter() - started)
+            if status != 200:
+                errors.append(status)
+    finally:
+        writer.close()
+
+
+def percentile(sorted_values: list, fraction: float) -> float:
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(int(fraction * len(sorted_values)), len(sorted_values) - 1)]
+
+
+async def run_load(host: str, port: int, endpoint: str, requests: int, concurrency: int, seed: int = 0) -> dict:
+    rng = random.Random(seed)
+    bodies = [random_body(rng, endpoint) for _ in range(requests)]
+    latencies, errors = [], []
+    started = time.perf_counter()
+    await asyncio.gather(*(client(host, port, endpoint, bodies[i::concurrency], latencies, errors)
+                           for i in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    latencies.sort()
+    return {
+        "endpoint": endpoint,
+        "requests": len(latencies),
+        "errors": len(errors),
+        "requests_per_second": len(latencies) / elapsed,
+        "p50_ms": percentile(latencies, 0.50) * 1000,
+        "p99_ms": percentile(latencies, 0.99) * 1000,
+        "max_ms": latencies[-1] * 1000 if latencies else 0.0,
+    }
+
+
+async def wait_until_up(host: str, port: int, process=None, timeout: float = 30.0):
+    deadline = time.monotonic() + timeout
+    while True:
+        if process is not None and process.poll() is not None:
+            raise RuntimeError(f"The service exited with status {process.returncode}.")
+        try:
+            _, writer = await asyncio.open_connection(host, port)
+            writer.close()
+            return
+        except OSError:
+            if time.monotonic() > deadline:
+                raise
+            await asyncio.sleep(0.1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--requests", type=int, default=5000, help="Requests per endpoint.")
+    parser.add_argument("--concurrency", type=int, default=64, help="Concurrent connections.")
+    parser.add_argument("--endpoint", choices=ENDPOINTS + ("all",), default="all")
+    parser.add_argument("--spawn", action="store_true", help="Start the service for the duration of the test.")
+    parser.add_argument("--workers", type=int, help="Worker processes of a spawned service.")
+    parser.add_argument("--json", action="store_true", help="Print the results as JSON.")
+    args = parser.parse_args()
+
+    process = None
+    if args.spawn:
+        command = [sys.executable, "-m", "service", "--host", args.host, "--port", str(args.port)]
+        if args.workers is not None:
+            command += ["--workers", str(args.workers)]
+        process = subprocess.Popen(command, cwd=SRC, stdout=subprocess.DEVNULL)
+    try:
+        asyncio.run(wait_until_up(args.host, args.port, process))
+        endpoints = ENDPOINTS if args.endpoint == "all" else (args.endpoint,)
+        results = [asyncio.run(run_load(args.host, args.port, endpoint, args.requests, args.concurrency))
+                   for endpoint in endpoints]
+    finally:
+        if process is not None:
+            process.terminate()
+            process.wait()
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    print(f"{'Endpoint':<14} {'Requests':>9} {'Errors':>7} {'Req/s':>9} {'p50 ms':>8} {'p99 ms':>8} {'max ms':>8}")
+    for result in results:
+        print(f"{result['endpoint']:<14} {result['requests']:>9,d} {result['errors']:>7,d} "
+              f"{result['requests_per_second']:>9,.0f} {result['p50_ms']:>8.2f} {result['p99_ms']:>8.2f} "
+              f"{result['max_ms']:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
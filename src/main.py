@@ -1,16 +1,191 @@
 # src/main.py
 
-from mortgage.calculator import MortgageCalculator
-from utils.mortgage_details import get_mortgage_details
-from mortgage.prepayment import get_prepayment_schedule, get_prepayment_amount
+import math
+import sys
+from types import SimpleNamespace
 
+# Everything else is imported by the mode that needs it, so that one-shot runs start quickly.
 
-def main():
-    # Retrieve mortgage details (using persisted data if available)
-    details = get_mortgage_details()
+# Options of the one-shot mode with their types and defaults.
+ONE_SHOT_OPTIONS = {"--principal": float, "--rate": float, "--term": int, "--prepayment": float}
+ONE_SHOT_DEFAULTS = {"term": 30, "prepayment": 0.0, "json": False}
 
-    # Create a MortgageCalculator instance.
-    calculator = MortgageCalculator(
+
+def one_shot_error(principal: float, rate: float, term: int, prepayment: float):
+    """Why a one-shot loan cannot be amortized, or None if it can."""
+    if not all(math.isfinite(value) for value in (principal, rate, prepayment)):
+        return "--principal, --rate and --prepayment must be finite numbers."
+    if principal <= 0:
+        return "--principal must be positive."
+    if term < 1:
+        return "--term must be at least 1 year."
+    if rate <= -1200:
+        return "--rate must be greater than -1200."
+    if prepayment < 0:
+        return "--prepayment cannot be negative."
+    return None
+
+
+def parse_one_shot(argv: list):
+    """
+    Parse a plain one-shot command line (--principal and --rate, optionally --term,
+    --prepayment and --json) without loading argparse, which costs more than the rest of
+    a one-shot run. Returns None for anything else, which parse_args then handles.
+    """
+    values = dict(ONE_SHOT_DEFAULTS)
+    arguments = iter(argv)
+    try:
+        for argument in arguments:
+            if argument == "--json":
+                values["json"] = True
+            elif argument in ONE_SHOT_OPTIONS:
+                values[argument[2:]] = ONE_SHOT_OPTIONS[argument](next(arguments))
+            else:
+                return None
+    except (StopIteration, ValueError):
+        return None
+    if "principal" not in values or "rate" not in values:
+        return None
+    if one_shot_error(values["principal"], values["rate"], values["term"], values["prepayment"]):
+        # parse_args reports the error.
+        return None
+    return SimpleNamespace(**values)
+
+
+def parse_args(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description="Mortgage calculator with prepayment options. "
+                    "Runs interactively unless --batch or --principal is given.")
+    parser.add_argument("--batch", metavar="LOANS",
+                        help="Process a CSV/JSONL file of loans without prompts.")
+    parser.add_argument("--output", metavar="SUMMARIES", default="-",
+                        help="Where to write the per-loan summaries in batch mode (.csv/.jsonl, default: stdout).")
+    parser.add_argument("--schedules", metavar="SCHEDULES",
+                        help="Also write every loan's full amortization schedule (.csv/.jsonl).")
+    parser.add_argument("--chunk-size", type=int, default=10000,
+                        help="Rows buffered per write in batch mode.")
+    one_shot = parser.add_argument_group("one-shot mode", "Print one loan's payment and totals without prompts.")
+    one_shot.add_argument("--principal", type=float, help="Loan amount in dollars.")
+    one_shot.add_argument("--rate", type=float, help="Annual interest rate in percent (e.g., 6.375).")
+    one_shot.add_argument("--term", type=int, default=30, help="Loan term in years (default: 30).")
+    one_shot.add_argument("--prepayment", type=float, default=0.0, help="Extra payment every month.")
+    one_shot.add_argument("--json", action="store_true", help="Print the result as one JSON object.")
+    parser.add_argument("--scenario", metavar="NAME",
+                        help="Load the named scenario from data/scenarios.db, or save the one entered under NAME.")
+    parser.add_argument("--what-if", action="store_true",
+                        help="After the summaries, keep prompting for changes such as 'rate 5.5' (interactive mode).")
+    parser.add_argument("--metrics", metavar="FILE",
+                        help="Collect counters and timings and write them on exit (.prom for Prometheus text, else JSON).")
+    parser.add_argument("--metrics-port", type=int, metavar="PORT",
+                        help="Collect counters and timings and serve them at http://127.0.0.1:PORT/metrics.")
+    parser.add_argument("--profile", metavar="FILE",
+                        help="Profile the run with cProfile and tracemalloc, dumping the statistics to FILE.")
+    args = parser.parse_args(argv)
+    if (args.principal is None) != (args.rate is None):
+        parser.error("--principal and --rate must be given together.")
+    if args.principal is not None and args.batch:
+        parser.error("--principal cannot be combined with --batch.")
+    if args.principal is not None:
+        error = one_shot_error(args.principal, args.rate, args.term, args.prepayment)
+        if error:
+            parser.error(error)
+    if (args.scenario or args.what_if) and (args.principal is not None or args.batch):
+        parser.error("--scenario and --what-if are for the interactive mode.")
+    return args
+
+
+def run_batch_mode(args):
+    from utils.batch_runner import run_batch
+
+    stats = run_batch(args.batch, args.output, args.schedules, args.chunk_size)
+    print(f"Processed {stats['processed']:,d} loans ({stats['skipped']:,d} skipped) in {stats['seconds']:.2f}s "
+          f"({stats['loans_per_second']:,.0f} loans/s).", file=sys.stderr)
+
+
+def run_one_shot(args):
+    """Payment and totals in closed form, importing only mortgage.annuity (and the plan if needed)."""
+    from mortgage.annuity import ClosedFormLoan, monthly_payment
+    from mortgage.schedule import payoff_time
+
+    monthly_rate = args.rate / 100 / 12
+    total_payments = args.term * 12
+    payment = monthly_payment(args.principal, monthly_rate, total_payments)
+    prepayments = None
+    if args.prepayment:
+        from mortgage.plan import PrepaymentPlan, PrepaymentRule
+
+        prepayments = PrepaymentPlan([PrepaymentRule(1, 1, None, args.prepayment)], horizon=total_payments)
+    loan = ClosedFormLoan(args.principal, monthly_rate, payment, total_payments, prepayments)
+    payoff_month = loan.payoff_month
+    total_interest = loan.cumulative_interest()
+
+    if args.json:
+        import json
+
+        print(json.dumps({"principal": args.principal, "monthly_payment": payment, "total_payments": total_payments,
+                          "payoff_month": payoff_month, "total_interest": total_interest}))
+        return
+    print(f"Monthly Payment: ${payment:,.2f}")
+    print(f"Total Payments (months): {total_payments}")
+    print(f"Loan is paid off in {payoff_time(payoff_month)}.")
+    print(f"Total interest paid: ${total_interest:,.2f}")
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    args = parse_one_shot(argv)
+    if args is not None:
+        run_one_shot(args)
+        return
+
+    args = parse_args(argv)
+    if not (args.metrics or args.metrics_port is not None or args.profile):
+        run(args)
+        return
+
+    from mortgage.instrumentation import METRICS, profiling, serve_metrics
+
+    if args.metrics or args.metrics_port is not None:
+        METRICS.enable()
+    server = serve_metrics(args.metrics_port) if args.metrics_port is not None else None
+    try:
+        with profiling(args.profile, enabled=bool(args.profile)) as profiler:
+            run(args)
+    finally:
+        if server is not None:
+            server.shutdown()
+        if args.metrics:
+            METRICS.save(args.metrics)
+    if profiler is not None:
+        print(profiler.report(), file=sys.stderr)
+
+
+def run(args):
+    if args.principal is not None:
+        run_one_shot(args)
+        return
+    if args.batch:
+        run_batch_mode(args)
+        return
+
+    from mortgage.prepayment import get_prepayment_amount, get_prepayment_schedule
+    from mortgage.session import LoanSession
+    from utils.mortgage_details import get_mortgage_details
+
+    store = scenario = None
+    if args.scenario:
+        from utils.scenario_store import ScenarioStore
+
+        store = ScenarioStore()
+        scenario = store.get(args.scenario)
+
+    # Retrieve mortgage details (from the scenario, else using persisted data if available)
+    details = scenario.details if scenario is not None else get_mortgage_details()
+
+    # The session computes the loan's values lazily and recomputes only what a change affects.
+    session = LoanSession(
         home_value=details['home_value'],
         down_payment=details['down_payment'],
         loan_term=details['loan_term'],
@@ -18,33 +193,59 @@ def main():
     )
 
     # Print the base mortgage summary.
-    calculator.print_summary()
+    session.print_summary()
 
     # Ask the user whether they want to add prepayments.
     prepayment_option = input(
         "\nDo you want to add prepayments?\n"
         "Enter 1 for a custom prepayment schedule,\n"
         "Enter 2 to calculate the required prepayment to achieve a target payoff time,\n"
-        "or press Enter to skip: "
+        + ("or press Enter to keep the scenario's saved prepayments: " if scenario is not None
+           else "or press Enter to skip: ")
     ).strip()
 
     if prepayment_option == "1":
         # Pass the total number of payments for indefinite scheduling.
-        prepayment_schedule = get_prepayment_schedule(total_payments=calculator.total_payments)
+        prepayment_schedule = get_prepayment_schedule(total_payments=session.total_payments)
     elif prepayment_option == "2":
         # get_prepayment_amount returns a tuple (extra_payment, prepayment_schedule)
         _, prepayment_schedule = get_prepayment_amount(details)
+    elif scenario is not None:
+        prepayment_schedule = scenario.plan or {}
     else:
         prepayment_schedule = {}
+    session.prepayments = prepayment_schedule
+
+    if store is not None:
+        store.save(args.scenario, details, prepayment_schedule, scenario.borrower if scenario is not None else None)
+        store.close()
 
     # Ask if the user wants to view the full amortization schedule.
     show_schedule = input(
         "\nWould you like to see the full amortization schedule? (y/yes to display): ").strip().lower()
     if show_schedule in ['y', 'yes']:
-        calculator.print_schedule(prepayment_schedule)
+        session.print_schedule()
 
     # Display the updated mortgage summary reflecting any prepayment inputs.
-    calculator.print_updated_summary(prepayment_schedule)
+    session.print_updated_summary()
+
+    # With --what-if, let the user try changes; each one recomputes only the values it affects.
+    while args.what_if:
+        try:
+            change = input("\nTry a change ('rate 5.5', 'term 15', 'home 550000', 'down 120000' or "
+                           "'extra MONTH AMOUNT'), or press Enter to finish: ").strip()
+        except EOFError:
+            break
+        if not change:
+            break
+        try:
+            invalidated = session.apply(change)
+            # The session computes lazily, so the reports are where a change is evaluated.
+            if "calculator" in invalidated:
+                session.print_summary()
+            session.print_updated_summary()
+        except (ValueError, ArithmeticError) as error:
+            print(error)
 
 
 if __name__ == "__main__":
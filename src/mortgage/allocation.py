@@ -0,0 +1,187 @@
+# src/mortgage/allocation.py
+"""
+Allocation of a household's monthly extra-payment budget across several loans.
+
+The allocation is greedy: every spare dollar goes to one priority loan at a time (the
+highest rate first for "avalanche", the smallest balance first for "snowball"), and when a
+loan is paid off its payment, and any extra it was receiving, roll over to the next one.
+With fixed regular payments the avalanche order minimizes total interest, since a dollar
+prepaid on a loan saves interest at that loan's rate for as long as the loan would
+otherwise run.
+
+Allocations only change when some loan is paid off, so the months are covered in at most
+one phase per loan, each evaluated with the closed-form balance formulas of
+mortgage.annuity. A constant extra payment E, applied before interest as in
+MortgageCalculator, acts like a regular payment of P + E * (1 + r).
+"""
+
+import math
+
+from mortgage.annuity import balance_after, monthly_payment, months_to_payoff
+from mortgage.plan import PrepaymentPlan, PrepaymentRule
+from mortgage.schedule import PAID_OFF_TOLERANCE
+
+STRATEGIES = ("avalanche", "snowball")
+
+
+class LoanAccount:
+    """
+    The outstanding part of one loan: balance, annual rate in percent, remaining number of
+    payments and the regular monthly payment (by default, the amortizing payment). A
+    target_month asks for the loan to be paid off by that month, counted from now.
+    """
+    __slots__ = ("name", "balance", "interest_rate", "remaining_months", "payment", "target_month")
+
+    def __init__(self, name: str, balance: float, interest_rate: float, remaining_months: int,
+                 payment: float = None, target_month: int = None):
+        self.name = name
+        self.balance = balance
+        self.interest_rate = interest_rate
+        self.remaining_months = remaining_months
+        self.payment = (monthly_payment(balance, self.monthly_rate, remaining_months)
+                        if payment is None else payment)
+        self.target_month = target_month
+
+    @property
+    def monthly_rate(self) -> float:
+        return self.interest_rate / 100 / 12
+
+    @classmethod
+    def from_calculator(cls, name: str, calculator, target_month: int = None):
+        """A new loan as described by a MortgageCalculator."""
+        return cls(name, calculator.principal, calculator.interest_rate, calculator.total_payments,
+                   calculator.monthly_payment, target_month)
+
+    def required_extra(self) -> float:
+        """Smallest constant monthly extra payment that pays the loan off by target_month."""
+        if self.target_month is None:
+            return 0.0
+        if self.target_month < 1:
+            raise ValueError(f"The target month of {self.name} must be at least 1.")
+        rate = self.monthly_rate
+        needed = monthly_payment(self.balance, rate, self.target_month)
+        return max((needed - self.payment) / (1 + rate), 0.0)
+
+    def __repr__(self) -> str:
+        return (f"LoanAccount({self.name!r}, ${self.balance:,.2f} at {self.interest_rate}%, "
+                f"{self.remaining_months} months)")
+
+
+class AllocationResult:
+    """Per-loan prepayment plans, payoff months and interest of an allocation."""
+
+    def __init__(self, loans: list, plans: dict, payoff_months: dict, interest: dict, baseline_interest: dict):
+        self.loans = loans
+        self.plans = plans
+        self.payoff_months = payoff_months
+        self.interest = interest
+        self.baseline_interest = baseline_interest
+
+    @property
+    def total_interest(self) -> float:
+        return sum(self.interest.values())
+
+    @property
+    def interest_saved(self) -> float:
+        return sum(self.baseline_interest.values()) - self.total_interest
+
+    def __repr__(self) -> str:
+        return (f"AllocationResult(total_interest=${self.total_interest:,.2f}, "
+                f"interest_saved=${self.interest_saved:,.2f}, payoff_months={self.payoff_months})")
+
+
+def _priority(loans: list, strategy: str) -> list:
+    if strategy == "avalanche":
+        return sorted(range(len(loans)), key=lambda i: (-loans[i].interest_rate, loans[i].balance))
+    if strategy == "snowball":
+        return sorted(range(len(loans)), key=lambda i: (loans[i].balance, -loans[i].interest_rate))
+    raise ValueError(f"Unknown strategy {strategy!r}; use one of {', '.join(STRATEGIES)}.")
+
+
+def _phase_payoff(balance: float, rate: float, payment: float, extra: float):
+    """Months until a loan with a constant extra payment is paid off, or None if never."""
+    return months_to_payoff(balance, rate, payment + extra * (1 + rate), PAID_OFF_TOLERANCE)
+
+
+def baseline_interest(loan: LoanAccount) -> float:
+    """Interest paid on a loan with regular payments only."""
+    rate = loan.monthly_rate
+    months = min(_phase_payoff(loan.balance, rate, loan.payment, 0.0) or loan.remaining_months,
+                 loan.remaining_months)
+    opening = balance_after(loan.balance, rate, loan.payment, months - 1)
+    return opening - loan.balance + (months - 1) * loan.payment + opening * rate
+
+
+def allocate_prepayments(loans: list, monthly_budget: float, strategy: str = "avalanche",
+                         rollover: bool = True) -> AllocationResult:
+    """
+    Allocate `monthly_budget` of extra payments per month across `loans` (LoanAccount objects).
+
+    Loans with a target_month first receive the constant extra payment that pays them off by
+    then; the rest of the budget goes to one loan at a time in `strategy` order. With rollover,
+    the regular payment of a paid-off loan joins the budget. Raises ValueError if the budget
+    cannot cover the targets.
+    """
+    order = _priority(loans, strategy)
+    reserved = [loan.required_extra() for loan in loans]
+    if sum(reserved) > monthly_budget + 1e-9:
+        raise ValueError(f"A monthly budget of ${monthly_budget:,.2f} cannot meet the payoff targets, "
+                         f"which need ${sum(reserved):,.2f}.")
+
+    balances = [loan.balance for loan in loans]
+    active = [True] * len(loans)
+    rules = [[] for _ in loans]
+    interest = [0.0] * len(loans)
+    payoff_months = [None] * len(loans)
+    freed = 0.0
+    month = 0
+
+    while any(active):
+        pool = monthly_budget + freed - sum(amount for amount, is_active in zip(reserved, active) if is_active)
+        extras = [reserved[i] if active[i] else 0.0 for i in range(len(loans))]
+        target = next(i for i in order if active[i])
+        extras[target] += pool
+
+        # The phase lasts until the next loan is paid off or reaches the end of its term.
+        durations = {}
+        for i, loan in enumerate(loans):
+            if active[i]:
+                months = _phase_payoff(balances[i], loan.monthly_rate, loan.payment, extras[i])
+                durations[i] = months if months is not None else math.inf
+        step = min(min(durations.values()),
+                   min(loans[i].remaining_months - month for i in durations))
+
+        for i, months in durations.items():
+            loan = loans[i]
+            rate, payment, extra = loan.monthly_rate, loan.payment, extras[i]
+            if extra:
+                rules[i].append(PrepaymentRule(month + 1, 1, step, extra))
+            if months == step:
+                # Paid off in the phase's last month, where the extra and payment are reduced.
+                opening = balance_after(balances[i], rate, payment + extra * (1 + rate), step - 1)
+                interest[i] += (opening - balances[i] + (step - 1) * (payment + extra)
+                                + max(opening - extra, 0.0) * rate)
+                balances[i] = 0.0
+                active[i] = False
+                payoff_months[i] = month + step
+                freed += payment if rollover else 0.0
+            else:
+                closing = balance_after(balances[i], rate, payment + extra * (1 + rate), step)
+                interest[i] += closing - balances[i] + step * (payment + extra)
+                balances[i] = closing
+                if month + step >= loan.remaining_months:
+                    # The term ended with a balance left (e.g., an interest-only line).
+                    active[i] = False
+                    freed += payment if rollover else 0.0
+        month += step
+
+    names = [loan.name for loan in loans]
+    plans = {name: PrepaymentPlan(loan_rules, horizon=loan.remaining_months)
+             for name, loan_rules, loan in zip(names, rules, loans)}
+    return AllocationResult(
+        loans,
+        plans,
+        dict(zip(names, payoff_months)),
+        dict(zip(names, interest)),
+        {loan.name: baseline_interest(loan) for loan in loans},
+    )
@@ -0,0 +1,211 @@
+# src/mortgage/annuity.py
+"""
+Closed-form annuity helpers shared by the calculator and the prepayment solver.
+
+Balances follow the same recurrence as MortgageCalculator.get_amortization_schedule:
+each month an optional extra payment is taken off the balance, interest accrues on what
+is left, and the regular monthly payment is applied. Until the loan is paid off this is
+linear in the starting balance and in every extra payment, so balances can be evaluated
+with geometric series instead of stepping month by month.
+"""
+
+import bisect
+import math
+
+from mortgage.schedule import PAID_OFF_TOLERANCE
+
+
+def annuity_factor(monthly_rate: float, total_payments: int) -> float:
+    """
+    The level payment per dollar borrowed, monthly_rate / (1 - (1 + monthly_rate) ** -total_payments).
+    The power is computed as exp(-total_payments * log1p(monthly_rate)) with expm1, which keeps
+    full precision for rates near zero, where 1 + monthly_rate rounds away the rate's low bits.
+    """
+    if monthly_rate == 0:
+        return 1 / total_payments
+    return monthly_rate / -math.expm1(-total_payments * math.log1p(monthly_rate))
+
+
+def monthly_payment(principal: float, monthly_rate: float, total_payments: int) -> float:
+    """
+    Standard amortization formula for the fixed monthly payment.
+    """
+    return principal * annuity_factor(monthly_rate, total_payments)
+
+
+def balance_after(principal: float, monthly_rate: float, payment: float, months: int) -> float:
+    """
+    Balance left after `months` regular payments with no extra payments.
+    The result is negative once the payments exceed what is owed.
+    """
+    if monthly_rate == 0:
+        return principal - payment * months
+    # growth - 1 with the same log1p/expm1 kernel as annuity_factor, so that the payment it
+    # gives leaves exactly nothing after the full term.
+    growth_minus_one = math.expm1(months * math.log1p(monthly_rate))
+    return principal * (1 + growth_minus_one) - payment * growth_minus_one / monthly_rate
+
+
+def prepayment_weight(monthly_rate: float, month: int, horizon: int) -> float:
+    """
+    Reduction of the balance at the end of month `horizon` per dollar prepaid in `month`.
+    A prepayment is applied before that month's interest, so it compounds for
+    horizon - month + 1 months.
+    """
+    if month > horizon:
+        return 0.0
+    return (1 + monthly_rate) ** (horizon - month + 1)
+
+
+def periodic_prepayment_weight(monthly_rate: float, start_month: int, frequency_months: int,
+                               num_intervals: int, horizon: int) -> float:
+    """
+    Sum of prepayment_weight over the months start_month + i * frequency_months
+    (i = 0 .. num_intervals - 1) that fall within the horizon, as a geometric series.
+    """
+    if start_month > horizon or num_intervals <= 0:
+        return 0.0
+    num_intervals = min(num_intervals, (horizon - start_month) // frequency_months + 1)
+    if monthly_rate == 0:
+        return float(num_intervals)
+    first = (1 + monthly_rate) ** (horizon - start_month + 1)
+    ratio = (1 + monthly_rate) ** -frequency_months
+    return first * (1 - ratio ** num_intervals) / (1 - ratio)
+
+
+def months_to_payoff(balance: float, monthly_rate: float, payment: float, tolerance: float = 0.0):
+    """
+    Smallest number of regular payments after which the balance is at most `tolerance`,
+    i.e., the month (counted from now) of the final, reduced payment. Returns None if the
+    payment does not cover the interest.
+    """
+    if balance <= tolerance:
+        return 0
+    if monthly_rate == 0:
+        months = math.ceil((balance - tolerance) / payment)
+    else:
+        if payment <= balance * monthly_rate:
+            return None
+        # Solve balance_after(...) == tolerance for n, then correct for rounding.
+        months = math.ceil(math.log((payment - tolerance * monthly_rate) / (payment - balance * monthly_rate))
+                           / math.log1p(monthly_rate))
+    months = max(months, 1)
+    while months > 1 and balance_after(balance, monthly_rate, payment, months - 1) <= tolerance:
+        months -= 1
+    while balance_after(balance, monthly_rate, payment, months) > tolerance:
+        months += 1
+    return months
+
+
+class ClosedFormLoan:
+    """
+    Random-access view of a loan's amortization without simulating it month by month.
+
+    Construction walks the prepayment and rate-reset months once, recording the balance after
+    each of them (a checkpoint) with the rate and payment in effect until the next one, and
+    locating the payoff month. Balances between checkpoints follow from balance_after, so
+    balance and cumulative-interest queries take O(log e) time for e such events, and an
+    adjustable-rate loan costs as much as its number of resets. Balances within
+    PAID_OFF_TOLERANCE of zero count as paid off.
+
+    rate_resets holds (month, monthly_rate) pairs, as returned by RateSchedule.monthly_resets:
+    from each such month the rate changes and the balance left after that month's extra
+    payment is re-amortized over the remaining term.
+    """
+
+    def __init__(self, principal: float, monthly_rate: float, payment: float, total_payments: int,
+                 prepayment_schedule=None, rate_resets=()):
+        self.principal = principal
+        self.monthly_rate = monthly_rate
+        self.payment = payment
+        self.total_payments = total_payments
+
+        extras = {int(month): amount for month, amount in (prepayment_schedule or {}).items()
+                  if amount and 1 <= int(month) <= total_payments}
+        resets = {month: rate for month, rate in rate_resets if 1 <= month <= total_payments}
+
+        # Checkpoints: the balance at the end of each event month, preceded by month 0, the
+        # rate and payment from the following month on, and the extra and regular payments
+        # made up to and including that month.
+        self._months = [0]
+        self._balances = [principal]
+        self._rates = [monthly_rate]
+        self._payments = [payment]
+        self._extras = [0.0]
+        self._paid = [0.0]
+        # The schedule's last month, and the interest charged in it if the loan is paid off.
+        self.payoff_month = total_payments
+        self.paid_off = False
+        self._final_interest = 0.0
+
+        # A sentinel after the last month lets the final segment be handled like the others.
+        for month in sorted(extras.keys() | resets.keys()) + [total_payments + 1]:
+            start, balance = self._months[-1], self._balances[-1]
+            rate, payment = self._rates[-1], self._payments[-1]
+            # The balance only falls between events, so regular payments clear the loan before
+            # this month exactly when the balance just before it is already (nearly) zero.
+            opening = balance_after(balance, rate, payment, month - start - 1)
+            if opening <= PAID_OFF_TOLERANCE:
+                remaining = months_to_payoff(balance, rate, payment, PAID_OFF_TOLERANCE)
+                final_opening = balance_after(balance, rate, payment, remaining - 1)
+                self._pay_off(start + remaining, final_opening * rate)
+                break
+            if month > total_payments:
+                break
+
+            amount = extras.get(month, 0.0)
+            balance = opening - amount
+            if month in resets:
+                rate = resets[month]
+                if balance > 0:
+                    payment = monthly_payment(balance, rate, total_payments - month + 1)
+            if balance <= 0 or balance * (1 + rate) - payment <= PAID_OFF_TOLERANCE:
+                # The extra payment, or the regular payment right after it, clears the loan.
+                self._pay_off(month, max(balance, 0.0) * rate)
+                break
+            self._paid.append(self._paid[-1] + (month - start - 1) * self._payments[-1] + payment)
+            self._months.append(month)
+            self._balances.append(balance * (1 + rate) - payment)
+            self._rates.append(rate)
+            self._payments.append(payment)
+            self._extras.append(self._extras[-1] + amount)
+
+    def _pay_off(self, month: int, final_interest: float):
+        self.payoff_month = month
+        self.paid_off = True
+        self._final_interest = final_interest
+
+    def _checkpoint(self, month: int) -> int:
+        return bisect.bisect_right(self._months, month) - 1
+
+    def _balance(self, month: int) -> float:
+        index = self._checkpoint(month)
+        return balance_after(self._balances[index], self._rates[index], self._payments[index],
+                             month - self._months[index])
+
+    def balance_at(self, month: int) -> float:
+        """Balance at the end of `month` (the principal for month 0)."""
+        if month <= 0:
+            return self.principal
+        if self.paid_off and month >= self.payoff_month:
+            return 0.0
+        return self._balance(min(month, self.total_payments))
+
+    def _interest_through(self, month: int) -> float:
+        """Total interest paid in months 1..month."""
+        month = min(month, self.payoff_month)
+        if month <= 0:
+            return 0.0
+        if self.paid_off and month == self.payoff_month:
+            return self._interest_through(month - 1) + self._final_interest
+        # Each month the balance changes by interest - payment - extra, so summing over
+        # months 1..k gives interest = balance(k) - principal + payments + extras.
+        index = self._checkpoint(month)
+        return (self._balance(month) - self.principal + self._paid[index]
+                + (month - self._months[index]) * self._payments[index] + self._extras[index])
+
+    def cumulative_interest(self, start: int = 1, end: int = None) -> float:
+        """Total interest paid in months start..end (inclusive); end defaults to the payoff month."""
+        if end is None:
+            end = self.payoff_month
+        return self._interest_through(end) - self._interest_through(start - 1)
@@ -0,0 +1,390 @@
+# src/mortgage/batch.py
+
+import numpy as np
+
+from mortgage.cents import RATE_DENOMINATOR, RATE_SCALE, CentsSchedule, check_rounding, payment_cents, to_cents
+from mortgage.plan import PrepaymentPlan
+from mortgage.schedule import PAID_OFF_TOLERANCE, SCHEDULE_FIELDS, AmortizationSchedule
+
+
+class BatchSchedule:
+    """
+    Amortization schedules for a portfolio of loans, stored as 2-D (loans x months) arrays.
+
+    Each field in SCHEDULE_FIELDS is available as an attribute holding one row per loan.
+    Months after a loan has been paid off are left as zero, and num_months holds the
+    number of scheduled months for every loan (the length of its scalar schedule).
+    """
+
+    def __init__(self, columns: dict, num_months: np.ndarray, schedule_class=AmortizationSchedule):
+        self.columns = columns
+        self.schedule_class = schedule_class
+        self.num_months = num_months
+        for field in SCHEDULE_FIELDS:
+            setattr(self, field, columns[field])
+
+    def __len__(self) -> int:
+        return len(self.num_months)
+
+    def schedule(self, index: int) -> AmortizationSchedule:
+        """
+        Return the schedule of a single loan, as MortgageCalculator.get_amortization_schedule would.
+        """
+        months = int(self.num_months[index])
+        return self.schedule_class.from_columns(
+            *(self.columns[field][index, :months].tolist() for field in SCHEDULE_FIELDS))
+
+    def total_interest(self) -> np.ndarray:
+        """Return the total interest paid over the life of each loan."""
+        return self.interest_payment.sum(axis=1)
+
+
+def annuity_factors(monthly_rates, total_payments) -> np.ndarray:
+    """
+    Vectorized form of mortgage.annuity.annuity_factor: the level payment per dollar borrowed,
+    computed with log1p/expm1 so that it stays accurate for rates near zero.
+    """
+    monthly_rates = np.asarray(monthly_rates, dtype=np.float64)
+    total_payments = np.asarray(total_payments, dtype=np.float64)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        factors = monthly_rates / -np.expm1(-total_payments * np.log1p(monthly_rates))
+    return np.where(monthly_rates != 0, factors, 1 / total_payments)
+
+
+def monthly_payments(principals, monthly_rates, total_payments) -> np.ndarray:
+    """
+    Vectorized form of MortgageCalculator._calculate_monthly_payment.
+    """
+    return np.asarray(principals, dtype=np.float64) * annuity_factors(monthly_rates, total_payments)
+
+
+# The grid of our rate sheets: annual rates in 1/8% steps, and the standard terms in years.
+RATE_SHEET_STEP = 0.125
+RATE_SHEET_MAX_RATE = 15.0
+STANDARD_TERMS = (10, 15, 20, 25, 30, 40)
+
+
+class AnnuityFactorTable:
+    """
+    Annuity factors precomputed for a rate sheet: annual rates from 0 to max_rate percent in
+    `step` increments, for each term (in years) in `terms`. payments() prices loans whose
+    rate and term are on the sheet with a table lookup and a multiply, and computes the
+    factors of any others with annuity_factors, so every loan gets the same payment as
+    from monthly_payments.
+
+    A rate is on the sheet when it equals a multiple of step exactly, as every 1/8% rate does.
+    """
+
+    def __init__(self, step: float = RATE_SHEET_STEP, max_rate: float = RATE_SHEET_MAX_RATE,
+                 terms: tuple = STANDARD_TERMS):
+        self.step = step
+        self.terms = tuple(terms)
+        self.rates = np.arange(int(round(max_rate / step)) + 1) * step
+        # The table column of every term up to the longest one, -1 for terms not on the sheet.
+        self._term_columns = np.full(max(self.terms) + 1, -1, dtype=np.intp)
+        self._term_columns[list(self.terms)] = np.arange(len(self.terms))
+        self.factors = annuity_factors(self.rates[:, None] / 100 / 12, np.array(self.terms)[None, :] * 12)
+
+    def lookup(self, interest_rates, loan_terms) -> np.ndarray:
+        """Annuity factors of loans given their annual rates (percent) and terms (years)."""
+        interest_rates = np.asarray(interest_rates, dtype=np.float64)
+        loan_terms = np.asarray(loan_terms, dtype=np.int64)
+        # Out-of-range indexes are clipped rather than masked (cheaper on large batches);
+        # the on_sheet test below catches every loan they would misprice.
+        rows = (interest_rates * (1 / self.step) + 0.5).astype(np.intp)
+        columns = self._term_columns.take(loan_terms, mode="clip")
+        factors = self.factors.ravel().take(rows * len(self.terms) + columns, mode="clip")
+        on_sheet = ((self.rates.take(rows, mode="clip") == interest_rates) & (columns >= 0)
+                    & (loan_terms < len(self._term_columns)))
+        if not on_sheet.all():
+            off_sheet = ~on_sheet
+            factors[off_sheet] = annuity_factors(interest_rates[off_sheet] / 100 / 12, loan_terms[off_sheet] * 12)
+        return factors
+
+    def payments(self, principals, interest_rates, loan_terms) -> np.ndarray:
+        """Monthly payments of loans given their principals, annual rates (percent) and terms (years)."""
+        return np.asarray(principals, dtype=np.float64) * self.lookup(interest_rates, loan_terms)
+
+
+def prepayment_matrix(prepayments, num_loans: int, max_months: int) -> np.ndarray:
+    """
+    Normalize per-loan prepayments into a (loans x months) array of extra payments.
+
+    prepayments may be None, a 2-D array-like indexed by [loan, month - 1], or a sequence
+    holding one {month: amount} dictionary (or None) per loan.
+    """
+    extras = np.zeros((num_loans, max_months), dtype=np.float64)
+    if prepayments is None:
+        return extras
+
+    if isinstance(prepayments, np.ndarray) or not any(
+            schedule is None or hasattr(schedule, "items") for schedule in prepayments):
+        matrix = np.asarray(prepayments, dtype=np.float64)
+        if matrix.ndim != 2 or matrix.shape[0] != num_loans:
+            raise ValueError("Prepayment matrix must have one row per loan.")
+        width = min(matrix.shape[1], max_months)
+        extras[:, :width] = matrix[:, :width]
+        return extras
+
+    if len(prepayments) != num_loans:
+        raise ValueError("Expected one prepayment schedule per loan.")
+    for index, schedule in enumerate(prepayments):
+        if not schedule:
+            continue
+        if isinstance(schedule, PrepaymentPlan):
+            _fill_plan(extras[index], schedule)
+            continue
+        for month, amount in schedule.items():
+            month = int(month)
+            if 1 <= month <= max_months:
+                extras[index, month - 1] = amount
+    return extras
+
+
+def _fill_plan(row: np.ndarray, plan: PrepaymentPlan):
+    """Write a plan's extra payments into a row of months, a strided slice per rule."""
+    horizon = len(row) if plan.horizon is None else min(plan.horizon, len(row))
+    for rule in plan.rules:
+        last = rule.last_month(horizon)
+        if rule.amount and last is not None and last >= rule.start_month:
+            row[rule.start_month - 1:last:rule.frequency_months] += rule.amount
+    for month, amount in plan.overrides.items():
+        if 1 <= month <= horizon:
+            row[month - 1] = amount
+
+
+def amortize_batch(principals, interest_rates, loan_terms, prepayments=None) -> BatchSchedule:
+    """
+    Compute the amortization schedules of many loans at once.
+
+    Parameters mirror MortgageCalculator: principals in dollars, annual interest rates as
+    percentages (e.g., 6.375) and loan terms in years. prepayments is optional; see
+    prepayment_matrix for the accepted forms.
+
+    The loop runs once per month over whole arrays of loans (loans that are already paid
+    off are masked out), applying the same arithmetic as
+    MortgageCalculator.get_amortization_schedule so every field matches the scalar schedule.
+    """
+    principals = np.atleast_1d(np.asarray(principals, dtype=np.float64))
+    interest_rates = np.broadcast_to(np.asarray(interest_rates, dtype=np.float64), principals.shape)
+    loan_terms = np.broadcast_to(np.asarray(loan_terms, dtype=np.int64), principals.shape)
+
+    num_loans = len(principals)
+    monthly_rates = interest_rates / 100 / 12
+    total_payments = loan_terms * 12
+    max_months = int(total_payments.max()) if num_loans else 0
+
+    # Work in month-major (months x loans) layout so that each month writes contiguous rows;
+    # the transposed views handed to BatchSchedule are (loans x months).
+    extras = np.ascontiguousarray(prepayment_matrix(prepayments, num_loans, max_months).T)
+    columns = {field: np.zeros((max_months, num_loans), dtype=np.float64) for field in SCHEDULE_FIELDS[1:]}
+    columns["month"] = np.zeros((max_months, num_loans), dtype=np.int64)
+
+    balance = principals.copy()
+    payment = monthly_payments(principals, monthly_rates, total_payments)
+
+    for month in range(1, max_months + 1):
+        active = (total_payments >= month) & (balance > 0)
+        if not active.any():
+            break
+        row = month - 1
+
+        # Apply extra payments, capping them at the outstanding balance.
+        extra_payment = np.where(active, extras[row], 0.0)
+        current_balance = balance - extra_payment
+        overpaid = current_balance < 0
+        extra_payment = np.where(overpaid, extra_payment + current_balance, extra_payment)
+        current_balance = np.where(overpaid, 0.0, current_balance)
+
+        interest_payment = current_balance * monthly_rates
+        principal_payment = payment - interest_payment
+
+        # Adjust the final payment when the remaining balance is less than the principal due.
+        final = principal_payment > current_balance
+        principal_payment = np.where(final, current_balance, principal_payment)
+        payment = np.where(final & active, principal_payment + interest_payment, payment)
+
+        current_balance = current_balance - principal_payment
+        current_balance = np.where(current_balance < 0, 0.0, current_balance)
+        balance = np.where(active, current_balance, balance)
+
+        columns["month"][row] = np.where(active, month, 0)
+        np.multiply(payment, active, out=columns["payment"][row])
+        np.multiply(principal_payment, active, out=columns["principal_payment"][row])
+        np.multiply(interest_payment, active, out=columns["interest_payment"][row])
+        np.multiply(extra_payment, active, out=columns["extra_payment"][row])
+        np.multiply(current_balance, active, out=columns["balance"][row])
+
+    num_months = np.count_nonzero(columns["month"], axis=0)
+    columns = {field: column.T for field, column in columns.items()}
+    return BatchSchedule(columns, num_months)
+
+
+def summarize_plans(principal: float, monthly_rate: float, payment: float, total_payments: int,
+                    prepayments) -> tuple:
+    """
+    Payoff month, total interest and total extra payments of one loan under each of many
+    prepayment plans (any form accepted by prepayment_matrix), as three arrays.
+
+    Until the loan is paid off, the balance after month k is the no-prepayment balance
+    minus every extra payment grown by the interest it saved:
+
+        balance[k] = base[k] - (1 + r) ** k * sum(extra[j] * (1 + r) ** -(j - 1) for j <= k)
+
+    The growth factors and the base balances are computed once for the loan, so every plan
+    costs a cumulative sum and a few elementwise operations over its months, with no loop
+    over months. As in ClosedFormLoan, a balance within PAID_OFF_TOLERANCE of zero counts
+    as paid off.
+    """
+    num_plans = len(prepayments)
+    extras = prepayment_matrix(prepayments, num_plans, total_payments)
+    months = np.arange(total_payments + 1, dtype=np.float64)
+    if monthly_rate:
+        growth_minus_one = np.expm1(months * np.log1p(monthly_rate))
+        base = principal + (principal - payment / monthly_rate) * growth_minus_one
+        growth = 1 + growth_minus_one
+    else:
+        base = principal - payment * months
+        growth = np.ones_like(months)
+
+    # balances[:, k] is the balance after month k (column 0 holds the principal).
+    balances = np.empty((num_plans, total_payments + 1))
+    balances[:, 0] = principal
+    np.cumsum(extras / growth[:-1], axis=1, out=balances[:, 1:])
+    balances[:, 1:] *= -growth[1:]
+    balances[:, 1:] += base[1:]
+
+    paid_off = balances[:, 1:] <= PAID_OFF_TOLERANCE
+    payoff_month = np.where(paid_off.any(axis=1), paid_off.argmax(axis=1) + 1, total_payments)
+    in_term = months[1:] <= payoff_month[:, None]
+    # Extra payments are capped at the balance, and interest accrues on what is left.
+    previous = balances[:, :-1]
+    extra_paid = np.minimum(extras, previous)
+    interest = np.maximum(previous - extras, 0.0) * monthly_rate
+    return (payoff_month, np.where(in_term, interest, 0.0).sum(axis=1),
+            np.where(in_term, extra_paid, 0.0).sum(axis=1))
+
+
+def iter_batches(principals, interest_rates, loan_terms, prepayments=None, chunk_size: int = 10000):
+    """
+    Amortize a large portfolio in fixed-size chunks so that memory stays bounded.
+
+    Full (loans x months) arrays for hundreds of thousands of loans would not fit in memory,
+    so this yields (start_index, BatchSchedule) pairs covering chunk_size loans at a time.
+    """
+    principals = np.atleast_1d(np.asarray(principals, dtype=np.float64))
+    interest_rates = np.broadcast_to(np.asarray(interest_rates, dtype=np.float64), principals.shape)
+    loan_terms = np.broadcast_to(np.asarray(loan_terms, dtype=np.int64), principals.shape)
+
+    for start in range(0, len(principals), chunk_size):
+        stop = start + chunk_size
+        chunk_prepayments = prepayments[start:stop] if prepayments is not None else None
+        yield start, amortize_batch(principals[start:stop], interest_rates[start:stop],
+                                    loan_terms[start:stop], chunk_prepayments)
+
+
+def _round_div(numerator: np.ndarray, denominator: int, rounding: str) -> np.ndarray:
+    """Vectorized mortgage.cents.round_div for non-negative int64 numerators."""
+    check_rounding(rounding)
+    quotient, remainder = np.divmod(numerator, denominator)
+    if rounding == "half_even":
+        twice = 2 * remainder
+        return quotient + ((twice > denominator) | ((twice == denominator) & (quotient & 1 == 1)))
+    if rounding == "half_up":
+        return quotient + (2 * remainder >= denominator)
+    if rounding == "up":
+        return quotient + (remainder > 0)
+    return quotient
+
+
+def payments_cents(principals: np.ndarray, units: np.ndarray, total_payments: np.ndarray,
+                   rounding: str = "half_even") -> np.ndarray:
+    """
+    Vectorized mortgage.cents.payment_cents. The payments are computed in floating point
+    and only those within a hair of a rounding boundary are recomputed with Decimal, so
+    the result is the same as the scalar function.
+    """
+    check_rounding(rounding)
+    exact = monthly_payments(principals, units / RATE_DENOMINATOR, total_payments)
+    boundary = 0.5 if rounding in ("half_even", "half_up") else 0.0
+    fraction = exact - np.floor(exact)
+    payments = {"half_even": np.rint, "half_up": lambda x: np.floor(x + 0.5), "down": np.floor,
+                "up": np.ceil}[rounding](exact).astype(np.int64)
+    ambiguous = np.abs(fraction - boundary) < 1e-4
+    if boundary == 0.0:
+        ambiguous |= np.abs(fraction - 1.0) < 1e-4
+    for i in np.flatnonzero(ambiguous):
+        payments[i] = payment_cents(int(principals[i]), int(units[i]), int(total_payments[i]), rounding)
+    return payments
+
+
+def dollars_to_cents(dollars: np.ndarray) -> np.ndarray:
+    """
+    Vectorized mortgage.cents.to_cents (half up). Amounts within a hair of half a cent are
+    converted with to_cents itself, so that e.g. 1.005 (100.49999... cents in binary)
+    rounds up as it does in the scalar engine.
+    """
+    scaled = dollars * 100
+    cents = np.floor(scaled + 0.5).astype(np.int64)
+    for index in zip(*np.nonzero(np.abs(scaled - np.floor(scaled) - 0.5) < 1e-6)):
+        cents[index] = to_cents(float(dollars[index]))
+    return cents
+
+
+def amortize_cents_batch(principals, interest_rates, loan_terms, prepayments=None, rounding: str = "half_even",
+                         payment_rounding: str = None) -> BatchSchedule:
+    """
+    Integer-cents schedules of many loans at once: mortgage.cents.amortize_cents on int64
+    (loans x months) arrays, matching it exactly.
+
+    principals are in cents, interest rates in percent with at most four decimals and loan
+    terms in years; prepayments (in dollars) take the forms accepted by amortize_batch.
+    schedule(index) returns CentsSchedule objects.
+    """
+    principals = np.atleast_1d(np.asarray(principals, dtype=np.int64))
+    interest_rates = np.broadcast_to(np.asarray(interest_rates, dtype=np.float64), principals.shape)
+    loan_terms = np.broadcast_to(np.asarray(loan_terms, dtype=np.int64), principals.shape)
+
+    units = np.rint(interest_rates * RATE_SCALE).astype(np.int64)
+    if not np.allclose(units, interest_rates * RATE_SCALE, rtol=0, atol=1e-6):
+        raise ValueError("Interest rates may have at most four decimal places.")
+    if len(principals) and int(principals.max()) * int(units.max()) >= 2 ** 63:
+        raise ValueError("Balances and rates are too large for int64 interest arithmetic.")
+
+    num_loans = len(principals)
+    total_payments = loan_terms * 12
+    max_months = int(total_payments.max()) if num_loans else 0
+    extras = dollars_to_cents(prepayment_matrix(prepayments, num_loans, max_months).T)
+    columns = {field: np.zeros((max_months, num_loans), dtype=np.int64) for field in SCHEDULE_FIELDS}
+
+    balance = principals.copy()
+    payment = payments_cents(principals, units, total_payments, payment_rounding or rounding)
+
+    for month in range(1, max_months + 1):
+        active = (total_payments >= month) & (balance > 0)
+        if not active.any():
+            break
+        row = month - 1
+
+        extra_payment = np.minimum(np.where(active, extras[row], 0), balance)
+        current_balance = balance - extra_payment
+
+        interest_payment = _round_div(current_balance * units, RATE_DENOMINATOR, rounding)
+        principal_payment = payment - interest_payment
+        # True-up: the final payment clears the balance exactly.
+        final = (principal_payment >= current_balance) | (total_payments == month)
+        principal_payment = np.where(final, current_balance, principal_payment)
+        monthly_payment = np.where(final, current_balance + interest_payment, payment)
+        current_balance = current_balance - principal_payment
+        balance = np.where(active, current_balance, balance)
+
+        columns["month"][row] = np.where(active, month, 0)
+        np.multiply(monthly_payment, active, out=columns["payment"][row])
+        np.multiply(principal_payment, active, out=columns["principal_payment"][row])
+        np.multiply(interest_payment, active, out=columns["interest_payment"][row])
+        np.multiply(extra_payment, active, out=columns["extra_payment"][row])
+        np.multiply(current_balance, active, out=columns["balance"][row])
+
+    num_months = np.count_nonzero(columns["month"], axis=0)
+    columns = {field: column.T for field, column in columns.items()}
+    return BatchSchedule(columns, num_months, CentsSchedule)
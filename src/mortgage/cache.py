@@ -0,0 +1,118 @@
+# src/mortgage/cache.py
+
+import hashlib
+import os
+from collections import OrderedDict
+
+from mortgage.instrumentation import METRICS
+
+
+def plan_key(prepayment_schedule) -> str:
+    """
+    Return a stable digest of a prepayment plan for use in cache keys.
+
+    Months with no extra payment do not change the schedule, so they are ignored, and
+    amounts are normalized to floats so that {12: 5000} and {12: 5000.0} share an entry.
+    """
+    if not prepayment_schedule:
+        return ""
+    if hasattr(prepayment_schedule, "cache_key"):
+        return prepayment_schedule.cache_key()
+    items = sorted((int(month), float(amount)) for month, amount in prepayment_schedule.items() if amount)
+    return hashlib.blake2b(repr(items).encode(), digest_size=16).hexdigest()
+
+
+class ScheduleCache:
+    """
+    Bounded least-recently-used cache of amortization schedules.
+
+    Keys are tuples of loan parameters plus a plan_key digest; values are the
+    AmortizationSchedules built by MortgageCalculator, which hands callers copies so that
+    the cached schedules are never modified. When a path is given, the cache is loaded
+    from it on creation (see load(): trusted files only) and written back by save().
+    """
+
+    def __init__(self, maxsize: int = 128, path: str = None):
+        self.maxsize = maxsize
+        self.path = path
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        if path is not None and os.path.exists(path):
+            self.load(path)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key) -> bool:
+        return key in self._entries
+
+    def get(self, key):
+        """Return the cached schedule for key (marking it most recently used), or None."""
+        schedule = self._entries.get(key)
+        if schedule is None:
+            self.misses += 1
+            if METRICS.enabled:
+                METRICS.increment("cache.misses")
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        if METRICS.enabled:
+            METRICS.increment("cache.hits")
+        return schedule
+
+    def put(self, key, schedule):
+        """Store a schedule, evicting the least recently used entries beyond maxsize."""
+        if self.maxsize <= 0:
+            return
+        self._entries[key] = schedule
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def invalidate(self, predicate=None):
+        """Remove every entry, or only those whose key satisfies predicate(key)."""
+        if predicate is None:
+            self._entries.clear()
+            return
+        for key in [key for key in self._entries if predicate(key)]:
+            del self._entries[key]
+
+    def info(self) -> dict:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+        }
+
+    def save(self, path: str = None):
+        """Persist the cached schedules so that a restarted process can reuse them."""
+        path = path or self.path
+        import pickle
+
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with METRICS.timer("persistence.cache_save_seconds"):
+            # Write to a temporary file first so that a crash never leaves a truncated cache.
+            temp_path = path + ".tmp"
+            with open(temp_path, "wb") as f:
+                pickle.dump(list(self._entries.items()), f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temp_path, path)
+
+    def load(self, path: str = None):
+        """
+        Load persisted schedules, keeping the most recently used ones within maxsize.
+
+        The file is a pickle, and unpickling can run arbitrary code: only load cache files
+        this application wrote itself, never ones from an untrusted source.
+        """
+        import pickle
+
+        path = path or self.path
+        with METRICS.timer("persistence.cache_load_seconds"), open(path, "rb") as f:
+            entries = pickle.load(f)
+        for key, schedule in entries:
+            self.put(key, schedule)
@@ -1,40 +1,100 @@
+from mortgage.annuity import ClosedFormLoan, monthly_payment as amortized_payment
+from mortgage.cache import ScheduleCache, plan_key
+from mortgage.instrumentation import METRICS
+from mortgage.rates import RateSchedule
+from mortgage.schedule import AmortizationSchedule, ScheduleRow, ScheduleSummary, payoff_time
+
+
+def record_simulation(months: int, prepayment_schedule=None):
+    """Count one month-by-month simulation of `months` months (call only if METRICS.enabled)."""
+    METRICS.increment("schedule.simulations")
+    METRICS.increment("schedule.months_simulated", months)
+    if prepayment_schedule:
+        # One plan lookup per simulated month.
+        METRICS.increment("prepayment.lookups", months)
+
+
 class MortgageCalculator:
-    def __init__(self, home_value: float, down_payment: float, loan_term: int, interest_rate: float):
+    # Schedules are shared by every calculator unless one is given its own cache.
+    schedule_cache = ScheduleCache(maxsize=128)
+
+    # Inputs from which the loan parameters are derived.
+    _LOAN_INPUTS = ("home_value", "down_payment", "loan_term", "interest_rate")
+
+    def __init__(self, home_value: float, down_payment: float, loan_term: int, interest_rate: float,
+                 cache: ScheduleCache = None, rate_schedule: RateSchedule = None):
+        if cache is not None:
+            self.schedule_cache = cache
+        # Scheduled rate changes and recasts; interest_rate applies until the first change.
+        self.rate_schedule = rate_schedule or RateSchedule()
         self.home_value = home_value
         self.down_payment = down_payment
         self.loan_term = loan_term
         self.interest_rate = interest_rate
+        self._calculate_loan_parameters()
+
+    def __setattr__(self, name, value):
+        super().__setattr__(name, value)
+        # Keep the derived parameters in sync when an input is changed after construction. Cached
+        # schedules need no eviction: their keys hold every parameter, and other calculators
+        # sharing the cache may still use the old loan's.
+        if name in self._LOAN_INPUTS and "monthly_payment" in self.__dict__:
+            self._calculate_loan_parameters()
 
+    def _calculate_loan_parameters(self):
         # Calculate common loan parameters once.
         self.principal = self.home_value - self.down_payment
         self.monthly_rate = self.interest_rate / 100 / 12
         self.total_payments = self.loan_term * 12
         self.monthly_payment = self._calculate_monthly_payment()
 
+    def _cache_key(self, prepayment_schedule=None) -> tuple:
+        return (self.principal, self.monthly_rate, self.total_payments, self.monthly_payment,
+                self.rate_schedule.cache_key(), plan_key(prepayment_schedule))
+
+    def invalidate_cache(self):
+        """Drop every cached schedule computed for this loan's current parameters."""
+        loan_key = self._cache_key()[:-1]
+        self.schedule_cache.invalidate(lambda key: key[:-1] == loan_key)
+
     def _calculate_monthly_payment(self) -> float:
-        if self.monthly_rate != 0:
-            return self.principal * (self.monthly_rate * (1 + self.monthly_rate) ** self.total_payments) / (
-                    (1 + self.monthly_rate) ** self.total_payments - 1)
-        else:
-            return self.principal / self.total_payments
+        return amortized_payment(self.principal, self.monthly_rate, self.total_payments)
 
-    def get_amortization_schedule(self, prepayment_schedule: dict = None) -> list:
-        schedule = []
-        current_balance = self.principal
-        month = 1
-        # Use a local copy so that self.monthly_payment remains unchanged.
-        monthly_payment = self.monthly_payment
+    def _iter_rows(self, prepayment_schedule: dict = None, resume: tuple = None):
+        """
+        Simulate the loan month by month, yielding each month as a
+        (month, payment, principal, interest, extra, balance) tuple.
+
+        `resume` continues a simulation from the (month, balance, monthly_payment, monthly_rate)
+        state at the start of that month, as returned by _resume_state.
+        """
+        if resume is None:
+            # Use a local copy so that self.monthly_payment remains unchanged.
+            month, current_balance, monthly_payment, monthly_rate = (1, self.principal, self.monthly_payment,
+                                                                     self.monthly_rate)
+        else:
+            month, current_balance, monthly_payment, monthly_rate = resume
+        # Works with plain dicts and PrepaymentPlan objects alike.
+        get_extra_payment = prepayment_schedule.get if prepayment_schedule else None
+        resets = dict(self.rate_schedule.monthly_resets(self.interest_rate))
 
         while month <= self.total_payments and current_balance > 0:
             # Apply extra payment if scheduled for this month.
-            extra_payment = prepayment_schedule.get(month, 0) if prepayment_schedule else 0
+            extra_payment = get_extra_payment(month, 0) if get_extra_payment else 0
             if extra_payment:
                 current_balance -= extra_payment
                 if current_balance < 0:
                     extra_payment += current_balance  # Adjust for overpayment.
                     current_balance = 0
 
-            interest_payment = current_balance * self.monthly_rate
+            if month in resets:
+                # Re-amortize what is left over the remaining term at the new rate.
+                monthly_rate = resets[month]
+                if current_balance > 0:
+                    monthly_payment = amortized_payment(current_balance, monthly_rate,
+                                                        self.total_payments - month + 1)
+
+            interest_payment = current_balance * monthly_rate
             principal_payment = monthly_payment - interest_payment
 
             # Adjust if the remaining balance is less than the computed principal payment.
@@ -46,54 +106,150 @@ class MortgageCalculator:
             if current_balance < 0:
                 current_balance = 0
 
-            schedule.append({
-                "month": month,
-                "payment": monthly_payment,
-                "principal_payment": principal_payment,
-                "interest_payment": interest_payment,
-                "extra_payment": extra_payment,
-                "balance": current_balance
-            })
+            yield month, monthly_payment, principal_payment, interest_payment, extra_payment, current_balance
             month += 1
 
-        return schedule
+    def _resume_state(self, schedule: AmortizationSchedule, month: int) -> tuple:
+        """
+        The simulation state at the start of `month` (at most one past the schedule's end)
+        for resuming a schedule computed by _iter_rows.
+        """
+        if month <= 1:
+            return 1, self.principal, self.monthly_payment, self.monthly_rate
+        monthly_rate = self.monthly_rate
+        for reset_month, rate in self.rate_schedule.monthly_resets(self.interest_rate):
+            if reset_month >= month:
+                break
+            monthly_rate = rate
+        previous = month - 2
+        return month, schedule.balance[previous], schedule.payment[previous], monthly_rate
+
+    def iter_amortization(self, prepayment_schedule: dict = None):
+        """
+        Lazily yield the amortization schedule one ScheduleRow at a time.
+        Months are only simulated as they are consumed, so callers can stop early.
+        """
+        for row in self._iter_rows(prepayment_schedule):
+            yield ScheduleRow(*row)
+
+    def get_amortization_schedule(self, prepayment_schedule: dict = None) -> AmortizationSchedule:
+        """
+        Return the full amortization schedule, reusing a cached copy for identical loan
+        parameters and prepayment plans. Callers get their own copy of the cached schedule,
+        so modifying it never affects other calculators.
+        """
+        key = self._cache_key(prepayment_schedule)
+        schedule = self.schedule_cache.get(key)
+        if schedule is None:
+            with METRICS.timer("schedule.build_seconds"):
+                # Store the rows as contiguous columns rather than one dict per month.
+                schedule = AmortizationSchedule()
+                schedule.extend(self._iter_rows(prepayment_schedule))
+            if METRICS.enabled:
+                METRICS.increment("schedule.built")
+                record_simulation(len(schedule), prepayment_schedule)
+            self.schedule_cache.put(key, schedule)
+        return schedule.copy()
+
+    def _cached_rows(self, prepayment_schedule: dict = None):
+        """Return the rows of a cached schedule if there is one, otherwise None."""
+        schedule = self.schedule_cache.get(self._cache_key(prepayment_schedule))
+        return zip(*schedule.columns()) if schedule is not None else None
+
+    def summarize(self, prepayment_schedule: dict = None, horizon: int = None) -> ScheduleSummary:
+        """
+        Aggregate the amortization schedule without storing it. When a horizon is given,
+        the simulation stops after that month (e.g., to get the balance at month 60).
+        """
+        with METRICS.timer("schedule.summary_seconds"):
+            rows = self._cached_rows(prepayment_schedule)
+            summary = ScheduleSummary()
+            summary.update(rows or self._iter_rows(prepayment_schedule), horizon)
+        if METRICS.enabled and rows is None:
+            record_simulation(summary.final_month, prepayment_schedule)
+        return summary
+
+    def closed_form(self, prepayment_schedule: dict = None) -> ClosedFormLoan:
+        """
+        Return a ClosedFormLoan for answering many balance/interest queries about one plan.
+        Building it costs O(number of prepayments and rate resets); each query is then
+        O(log of that number).
+        """
+        return ClosedFormLoan(self.principal, self.monthly_rate, self.monthly_payment, self.total_payments,
+                              prepayment_schedule, self.rate_schedule.monthly_resets(self.interest_rate))
+
+    def balance_at(self, month: int, prepayment_schedule: dict = None) -> float:
+        """Balance remaining at the end of `month`, computed without simulating months 1..month."""
+        return self.closed_form(prepayment_schedule).balance_at(month)
+
+    def cumulative_interest(self, start: int = 1, end: int = None, prepayment_schedule: dict = None) -> float:
+        """Interest paid in months start..end (inclusive); end defaults to the payoff month."""
+        return self.closed_form(prepayment_schedule).cumulative_interest(start, end)
+
+    def payoff_month(self, prepayment_schedule: dict = None) -> int:
+        """Month of the final payment."""
+        return self.closed_form(prepayment_schedule).payoff_month
+
+    def exact_schedule(self, prepayment_schedule: dict = None, rounding: str = "half_even",
+                       payment_rounding: str = None) -> "CentsSchedule":
+        """
+        Cent-exact schedule in integer cents (see mortgage.cents), with interest rounded by
+        `rounding` and the final payment trued up so the balance ends at exactly zero.
+        """
+        from mortgage.cents import amortize_cents, rate_units, to_cents
+
+        if self.rate_schedule:
+            raise ValueError("Exact schedules do not support rate changes or recasts.")
+        return amortize_cents(to_cents(self.principal), rate_units(self.interest_rate), self.total_payments,
+                              prepayment_schedule, rounding, payment_rounding)
+
+    def print_schedule(self, prepayment_schedule: dict = None, schedule: AmortizationSchedule = None):
+        """Print the schedule of the plan; `schedule` is one already computed for it (see mortgage.session)."""
+        key = self._cache_key(prepayment_schedule)
+        if schedule is None:
+            schedule = self.schedule_cache.get(key)
+        collected = None
+        if schedule is not None:
+            rows = zip(*schedule.columns())
+        else:
+            # Stream the rows so the first line prints before the schedule is complete, keeping
+            # them in compact columns so that a following summary does not recompute them.
+            collected = AmortizationSchedule()
+            rows = self._iter_rows(prepayment_schedule)
+
+        with METRICS.timer("schedule.print_seconds"):
+            print("Month |   Payment   |  Principal  |   Interest  | Extra Payment |   Balance")
+            print("-" * 80)
+            for month, payment, principal_payment, interest_payment, extra_payment, balance in rows:
+                if collected is not None:
+                    collected.append(month, payment, principal_payment, interest_payment, extra_payment, balance)
+                print(f"{month:5d} | {payment:11.2f} | {principal_payment:11.2f} | "
+                      f"{interest_payment:11.2f} | {extra_payment:13.2f} | {balance:11.2f}")
 
-    def print_schedule(self, prepayment_schedule: dict = None):
-        schedule = self.get_amortization_schedule(prepayment_schedule)
-        print("Month |   Payment   |  Principal  |   Interest  | Extra Payment |   Balance")
-        print("-" * 80)
-        for entry in schedule:
-            print(f"{entry['month']:5d} | {entry['payment']:11.2f} | {entry['principal_payment']:11.2f} | "
-                  f"{entry['interest_payment']:11.2f} | {entry['extra_payment']:13.2f} | {entry['balance']:11.2f}")
+        if collected is not None:
+            if METRICS.enabled:
+                record_simulation(len(collected), prepayment_schedule)
+            self.schedule_cache.put(key, collected)
 
-    def print_updated_summary(self, prepayment_schedule: dict = None):
+    def print_updated_summary(self, prepayment_schedule: dict = None, summary: ScheduleSummary = None):
         """
         Compute and print an updated summary based on the amortization schedule
         that factors in any prepayment inputs. This summary now includes the total
         interest paid as a percentage of both the principal and the home value.
+        A summary already computed for the plan can be passed in to skip the computation.
         """
-        schedule = self.get_amortization_schedule(prepayment_schedule)
-        if schedule:
-            total_interest = sum(item['interest_payment'] for item in schedule)
-            final_month = schedule[-1]['month']
-
-            # Convert final_month into years and months.
-            if final_month >= 12:
-                years = final_month // 12
-                months = final_month % 12
-                if months > 0:
-                    payoff_time = f"{years} year(s) and {months} month(s)"
-                else:
-                    payoff_time = f"{years} year(s)"
-            else:
-                payoff_time = f"{final_month} month(s)"
+        if summary is None:
+            summary = self.summarize(prepayment_schedule)
+        if summary.final_month:
+            total_interest = summary.total_interest
+            final_month = summary.final_month
 
             # Calculate interest as a percentage of principal and home value.
             interest_percent_principal = (total_interest / self.principal) * 100
             interest_percent_home_value = (total_interest / self.home_value) * 100
 
             print("\nUpdated Mortgage Summary with Prepayments:")
-            print(f"Loan is paid off in {payoff_time}.")
+            print(f"Loan is paid off in {payoff_time(final_month)}.")
             print(f"Total interest paid: ${total_interest:,.2f}")
             print(f"Interest as percentage of principal: {interest_percent_principal:.2f}%")
             print(f"Interest as percentage of home value: {interest_percent_home_value:.2f}%")
@@ -0,0 +1,182 @@
+# src/mortgage/cents.py
+"""
+Exact fixed-point amortization in integer cents.
+
+Balances, payments and interest are Python ints of cents, so every schedule is exact and
+reproducible: each month's interest is rounded to the cent with the chosen rounding
+convention, and the final payment is trued up so that the loan ends at exactly zero.
+Annual rates are taken in units of 1/10,000 of a percent (6.375% is 63750), which makes
+the monthly rate the exact fraction rate_units / RATE_DENOMINATOR and the interest of a
+month an integer division. Only the monthly payment, computed once per loan, uses
+Decimal arithmetic.
+
+mortgage.batch.amortize_cents_batch is the same engine on int64 NumPy arrays.
+"""
+
+from array import array
+from decimal import (ROUND_DOWN, ROUND_HALF_EVEN, ROUND_HALF_UP, ROUND_UP, Decimal, InvalidOperation,
+                     localcontext)
+
+from mortgage.schedule import AmortizationSchedule, SCHEDULE_FIELDS
+
+# Annual rates are expressed in units of 1/RATE_SCALE percent.
+RATE_SCALE = 10000
+# Monthly interest = balance * rate_units / RATE_DENOMINATOR (percent, months per year, rate scale).
+RATE_DENOMINATOR = 100 * 12 * RATE_SCALE
+
+ROUNDING_MODES = ("half_even", "half_up", "down", "up")
+
+_DECIMAL_ROUNDING = {"half_even": ROUND_HALF_EVEN, "half_up": ROUND_HALF_UP, "down": ROUND_DOWN, "up": ROUND_UP}
+
+
+def _half_even(numerator: int, denominator: int) -> int:
+    quotient, remainder = divmod(numerator, denominator)
+    twice = 2 * remainder
+    return quotient + (twice > denominator or (twice == denominator and quotient & 1))
+
+
+def _half_up(numerator: int, denominator: int) -> int:
+    quotient, remainder = divmod(numerator, denominator)
+    return quotient + (2 * remainder >= denominator)
+
+
+def _down(numerator: int, denominator: int) -> int:
+    return numerator // denominator
+
+
+def _up(numerator: int, denominator: int) -> int:
+    return -(-numerator // denominator)
+
+
+_ROUNDERS = {"half_even": _half_even, "half_up": _half_up, "down": _down, "up": _up}
+
+# For the amortization loop's inlined rounding of a division by RATE_DENOMINATOR: a quotient
+# is rounded up when the remainder exceeds the first value, or equals the second (a tie)
+# and the quotient is odd.
+_HALF = RATE_DENOMINATOR // 2
+_ROUND_UP_THRESHOLDS = {"half_even": (_HALF, _HALF), "half_up": (_HALF - 1, -1),
+                        "down": (RATE_DENOMINATOR, -1), "up": (0, -1)}
+
+
+def check_rounding(rounding: str) -> str:
+    if rounding not in ROUNDING_MODES:
+        raise ValueError(f"Unknown rounding mode {rounding!r}; use one of {', '.join(ROUNDING_MODES)}.")
+    return rounding
+
+
+def _rounder(rounding: str):
+    return _ROUNDERS[check_rounding(rounding)]
+
+
+def round_div(numerator: int, denominator: int, rounding: str = "half_even") -> int:
+    """numerator / denominator rounded to an integer (both non-negative, denominator > 0)."""
+    return _rounder(rounding)(numerator, denominator)
+
+
+def to_cents(dollars) -> int:
+    """A dollar amount (float, str, int or Decimal) as whole cents, rounding half up."""
+    try:
+        return int((Decimal(str(dollars)) * 100).quantize(Decimal(1), ROUND_HALF_UP))
+    except InvalidOperation:
+        raise ValueError(f"Invalid dollar amount: {dollars!r}")
+
+
+def rate_units(interest_rate) -> int:
+    """An annual rate in percent (e.g., 6.375) in units of 1/RATE_SCALE percent."""
+    units = Decimal(str(interest_rate)) * RATE_SCALE
+    if units != units.to_integral_value():
+        raise ValueError(f"Interest rate {interest_rate} has more than four decimal places.")
+    return int(units)
+
+
+def payment_cents(principal: int, units: int, total_payments: int, rounding: str = "half_even") -> int:
+    """
+    The level monthly payment in cents of a loan of `principal` cents at `units` (see
+    rate_units) over total_payments months, rounded to the cent with `rounding`.
+    """
+    check_rounding(rounding)
+    with localcontext() as context:
+        context.prec = 40
+        if units == 0:
+            payment = Decimal(principal) / total_payments
+        else:
+            rate = Decimal(units) / RATE_DENOMINATOR
+            payment = principal * rate / (1 - (1 + rate) ** -total_payments)
+        return int(payment.quantize(Decimal(1), _DECIMAL_ROUNDING[rounding]))
+
+
+class CentsSchedule(AmortizationSchedule):
+    """
+    An AmortizationSchedule whose money columns are array('q') of integer cents.
+    to_dollars() converts it to the usual float schedule.
+    """
+    __slots__ = ()
+
+    def __init__(self):
+        self.month = array('i')
+        self.payment = array('q')
+        self.principal_payment = array('q')
+        self.interest_payment = array('q')
+        self.extra_payment = array('q')
+        self.balance = array('q')
+
+    def to_dollars(self) -> AmortizationSchedule:
+        return AmortizationSchedule.from_columns(
+            self.month, *([cents / 100 for cents in getattr(self, field)] for field in SCHEDULE_FIELDS[1:]))
+
+    def total_interest(self) -> int:
+        return sum(self.interest_payment)
+
+
+def plan_cents(prepayment_schedule, total_payments: int) -> dict:
+    """The extra payments of a plan ({month: dollars} or PrepaymentPlan) as {month: cents}."""
+    if not prepayment_schedule:
+        return {}
+    return {int(month): to_cents(amount) for month, amount in prepayment_schedule.items()
+            if amount and 1 <= int(month) <= total_payments}
+
+
+def amortize_cents(principal: int, units: int, total_payments: int, prepayment_schedule=None,
+                   rounding: str = "half_even", payment_rounding: str = None) -> CentsSchedule:
+    """
+    Amortize a loan of `principal` cents at `units` (see rate_units) over total_payments
+    months, with optional extra payments in dollars, applied before interest as in
+    MortgageCalculator.
+
+    Interest is rounded with `rounding`; the level payment with payment_rounding (by
+    default the same convention). The last payment (at payoff or in the final month of the
+    term) is trued up to the remaining balance plus interest, so the balance ends at 0.
+    """
+    above, tie = _ROUND_UP_THRESHOLDS[check_rounding(rounding)]
+    payment = payment_cents(principal, units, total_payments, payment_rounding or rounding)
+    extras = plan_cents(prepayment_schedule, total_payments)
+    get_extra = extras.get
+
+    schedule = CentsSchedule()
+    rows = []
+    balance = principal
+    month = 1
+    while month <= total_payments and balance > 0:
+        extra_payment = get_extra(month, 0) if extras else 0
+        if extra_payment:
+            if extra_payment > balance:
+                extra_payment = balance
+            balance -= extra_payment
+
+        interest_payment, remainder = divmod(balance * units, RATE_DENOMINATOR)
+        if remainder > above or (remainder == tie and interest_payment & 1):
+            interest_payment += 1
+        principal_payment = payment - interest_payment
+        if principal_payment >= balance or month == total_payments:
+            # True-up: the final payment clears the balance exactly.
+            principal_payment = balance
+            monthly_payment = balance + interest_payment
+        else:
+            monthly_payment = payment
+        balance -= principal_payment
+
+        rows.append((month, monthly_payment, principal_payment, interest_payment, extra_payment, balance))
+        month += 1
+
+    schedule.extend(rows)
+    return schedule
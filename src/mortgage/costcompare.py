@@ -0,0 +1,313 @@
+# src/mortgage/costcompare.py
+"""
+Housing-plus-tuition cost comparison.
+
+A spec describes the homes under consideration (price, seller credit, closing costs and
+the loan), the cases to compare (e.g., worst and best case, each giving every home's
+prepayment plan in the formats accepted by batch mode), the schooling options (which
+home, how many years of private elementary and high school tuition, and optionally how
+the report labels the elementary years) and the household (children, tuition, home
+appreciation). Interest comes from amortizing each home's loan under each case's plan,
+once per spec; every option in every case is then a handful of additions, so
+evaluate_households() prices thousands of household configurations (NumPy arrays of
+children, tuition, appreciation and horizon) in one vectorized pass.
+
+to_markdown() renders the report of scripts/CostCompare.py (see scripts/outputs/output.md).
+"""
+
+import copy
+
+from mortgage.cache import ScheduleCache
+from mortgage.calculator import MortgageCalculator
+from utils.loan_files import parse_prepayment_plan
+
+# Household parameters, which evaluate_households() accepts as arrays.
+HOUSEHOLD_FIELDS = ("num_children", "highest_grade_tuition", "elementary_ratio", "annual_growth_rate", "years")
+
+LOAN_FIELDS = ("down_payment", "interest_rate", "loan_term")
+
+DEFAULT_SPEC = {
+    "household": {
+        "num_children": 1,
+        # Annual tuition of the highest grade, per child.
+        "highest_grade_tuition": 27950,
+        # Average elementary tuition as a share of the highest grade's (roughly 8276 / 14596).
+        "elementary_ratio": 0.57,
+        "annual_growth_rate": 0.035,
+        "years": 15,
+    },
+    "homes": {
+        "modest": {"name": "Modest Home", "description": "Average District", "price": 450000, "credit": 0,
+                   "closing_rate": 0.04, "down_payment": 90000, "interest_rate": 6.625, "loan_term": 30},
+        "upscale": {"name": "Upscale Home", "description": "Wayzata", "price": 700000, "credit": 20000,
+                    "closing_rate": 0.04, "down_payment": 140000, "interest_rate": 6.625, "loan_term": 30},
+    },
+    # Monthly prepayments paying the loans off in about 5.5 and 8 years (worst case), or 2
+    # and 3.7 years (best case).
+    "cases": {
+        "Worst-Case": {"modest": {"prepayment_amount": 4250}, "upscale": {"prepayment_amount": 4000}},
+        "Best-Case": {"modest": {"prepayment_amount": 14000}, "upscale": {"prepayment_amount": 10750}},
+    },
+    "options": [
+        {"key": "1", "label": "Full Private K–12", "home": "modest", "elementary_years": 9, "high_school_years": 4},
+        {"key": "2A", "label": "Hybrid: Private K–5 then Public", "home": "modest", "elementary_years": 6},
+        {"key": "2B", "label": "Hybrid: Private K–8 then Public", "home": "modest", "elementary_years": 9,
+         "elementary_label": "Private Elementary/Middle"},
+        {"key": "3", "label": "Full Public (Wayzata)", "home": "upscale"},
+    ],
+}
+
+
+def tuition_cost(num_children, highest_grade_tuition, elementary_ratio, elementary_years, high_school_years):
+    """Tuition of an option; works on scalars and on broadcastable NumPy arrays alike."""
+    elementary_tuition = highest_grade_tuition * elementary_ratio
+    return (elementary_years * elementary_tuition + high_school_years * highest_grade_tuition) * num_children
+
+
+def future_value(value, annual_growth_rate, years):
+    return value * (1 + annual_growth_rate) ** years
+
+
+def _merge(defaults: dict, overrides: dict) -> dict:
+    merged = copy.deepcopy(defaults)
+    for key, value in (overrides or {}).items():
+        if isinstance(value, dict) and isinstance(merged.get(key), dict) and key != "cases":
+            merged[key] = _merge(merged[key], value)
+        else:
+            merged[key] = copy.deepcopy(value)
+    return merged
+
+
+class CostComparison:
+    """
+    A spec (DEFAULT_SPEC with any top-level sections or household/home fields overridden)
+    and its housing costs. Loans are amortized on first use and reused for every household.
+    """
+
+    def __init__(self, spec: dict = None):
+        self.spec = _merge(DEFAULT_SPEC, spec)
+        self.household = self.spec["household"]
+        self.homes = self.spec["homes"]
+        self.cases = self.spec["cases"]
+        self.options = self.spec["options"]
+        for option in self.options:
+            if option["home"] not in self.homes:
+                raise ValueError(f"Option {option['key']} refers to unknown home {option['home']!r}.")
+            for case, plans in self.cases.items():
+                if option["home"] not in plans:
+                    raise ValueError(f"Case {case!r} has no prepayment plan for home {option['home']!r}.")
+        self._housing = None
+
+    def used_homes(self) -> list:
+        """Keys of the homes some option refers to, in spec order."""
+        used = {option["home"] for option in self.options}
+        return [home for home in self.homes if home in used]
+
+    def effective_price(self, home: str) -> float:
+        """The home's price net of the seller credit, which is also the base of its future value."""
+        return self.homes[home]["price"] - self.homes[home].get("credit", 0)
+
+    def housing(self) -> dict:
+        """
+        {case: {home: costs}} where costs holds the price, effective price (after the credit),
+        closing costs, interest and payoff month of the loan under the case's plan, and the
+        total outlay. Computed once.
+        """
+        if self._housing is None:
+            no_cache = ScheduleCache(maxsize=0)
+            self._housing = {}
+            for case, plans in self.cases.items():
+                costs = self._housing[case] = {}
+                for home in self.used_homes():
+                    spec = self.homes[home]
+                    # A case may also change the loan itself (e.g., a different rate).
+                    loan = {field: plans[home].get(field, spec[field]) for field in LOAN_FIELDS}
+                    calculator = MortgageCalculator(spec["price"], loan["down_payment"], loan["loan_term"],
+                                                    loan["interest_rate"], cache=no_cache)
+                    plan = parse_prepayment_plan(plans[home], calculator.total_payments)
+                    summary = calculator.summarize(plan)
+                    effective_price = self.effective_price(home)
+                    closing_cost = spec["price"] * spec["closing_rate"]
+                    costs[home] = {
+                        "price": spec["price"],
+                        "effective_price": effective_price,
+                        "closing_cost": closing_cost,
+                        "interest": summary.total_interest,
+                        "payoff_month": summary.final_month,
+                        "total": effective_price + closing_cost + summary.total_interest,
+                    }
+        return self._housing
+
+    def evaluate(self, **household) -> dict:
+        """
+        Costs of every option in every case for one household (the spec's, with any of
+        HOUSEHOLD_FIELDS overridden): per-option tuition, each home's future value, and per
+        case the housing costs and each option's housing, tuition and total outlay and net
+        asset (future value minus total outlay).
+        """
+        household = dict(self.household, **household)
+        housing = self.housing()
+        tuition = {}
+        for option in self.options:
+            elementary = tuition_cost(household["num_children"], household["highest_grade_tuition"],
+                                      household["elementary_ratio"], option.get("elementary_years", 0), 0)
+            high_school = tuition_cost(household["num_children"], household["highest_grade_tuition"],
+                                       household["elementary_ratio"], 0, option.get("high_school_years", 0))
+            tuition[option["key"]] = {"elementary": elementary, "high_school": high_school,
+                                      "total": elementary + high_school}
+        future_values = {home: future_value(self.effective_price(home), household["annual_growth_rate"],
+                                            household["years"])
+                         for home in self.used_homes()}
+        cases = {}
+        for case, costs in housing.items():
+            options = cases[case] = {}
+            for option in self.options:
+                housing_outlay = costs[option["home"]]["total"]
+                total = housing_outlay + tuition[option["key"]]["total"]
+                options[option["key"]] = {"housing": housing_outlay, "tuition": tuition[option["key"]]["total"],
+                                          "total": total, "net_asset": future_values[option["home"]] - total}
+        return {"household": household, "tuition": tuition, "future_values": future_values, "housing": housing,
+                "cases": cases}
+
+    def evaluate_households(self, **households) -> dict:
+        """
+        Evaluate many households at once. Each keyword is one of HOUSEHOLD_FIELDS with an
+        array (or scalar) of values; omitted fields take the spec's value. Returns NumPy
+        arrays "tuition" (households x options) and "housing", "total" and "net_asset"
+        (households x cases x options), options and cases in spec order.
+        """
+        import numpy as np
+
+        unknown = set(households) - set(HOUSEHOLD_FIELDS)
+        if unknown:
+            raise ValueError(f"Unknown household fields: {', '.join(sorted(unknown))}")
+        values = {field: np.atleast_1d(np.asarray(households.get(field, self.household[field]), dtype=float))
+                  for field in HOUSEHOLD_FIELDS}
+        size = max(len(column) for column in values.values())
+        values = {field: np.broadcast_to(column, size)[:, None] for field, column in values.items()}
+
+        housing = self.housing()
+        elementary_years = np.array([option.get("elementary_years", 0) for option in self.options], dtype=float)
+        high_school_years = np.array([option.get("high_school_years", 0) for option in self.options], dtype=float)
+        housing_outlay = np.array([[housing[case][option["home"]]["total"] for option in self.options]
+                                   for case in self.cases])
+        home_values = np.array([self.effective_price(option["home"]) for option in self.options], dtype=float)
+
+        tuition = tuition_cost(values["num_children"], values["highest_grade_tuition"], values["elementary_ratio"],
+                               elementary_years, high_school_years)
+        total = housing_outlay[None, :, :] + tuition[:, None, :]
+        future_values = future_value(home_values, values["annual_growth_rate"], values["years"])
+        return {
+            "tuition": tuition,
+            "housing": np.broadcast_to(housing_outlay, total.shape),
+            "total": total,
+            "net_asset": future_values[:, None, :] - total,
+        }
+
+    def to_markdown(self, **household) -> str:
+        """The cost-benefit report for one household, as printed by scripts/CostCompare.py."""
+        result = self.evaluate(**household)
+        household = result["household"]
+        elementary_tuition = household["highest_grade_tuition"] * household["elementary_ratio"]
+        lines = [
+            "",
+            f"## Cost-Benefit Analysis Over {household['years']:g} Years: {' vs. '.join(self.cases)}",
+            "",
+            "### Tuition Inputs:",
+            f"- **Highest Grade Tuition:** \\$**{household['highest_grade_tuition']:,.0f}** per year (per child)",
+            f"- **Inferred Average Elementary Tuition:** \\$**{elementary_tuition:,.0f}** per year (per child)  ",
+            f"  *(Using a multiplier of {household['elementary_ratio']:.2f} applied to highest-grade tuition)*",
+        ]
+        for index, case in enumerate(self.cases):
+            lines += ["", "---", "", f"## {case} Scenario", "### Housing Outlays:"]
+            for home in self.used_homes():
+                lines += self._housing_lines(home, result["housing"][case][home]) + [""]
+            lines.pop()
+            if index == 0:
+                lines += ["", f"### Tuition Costs (for {household['num_children']:g} child(ren)):"]
+                for option in self.options:
+                    lines += self._tuition_lines(option, result["tuition"][option["key"]]) + [""]
+                lines.pop()
+            lines += ["", f"### Combined Total Outlays (Housing + Tuition) - {case}:"]
+            lines += _table(("Housing Outlay", "Tuition Outlay", "**Total Outlay**"),
+                            [(self._row_label(option), *(result["cases"][case][option["key"]][column]
+                                                         for column in ("housing", "tuition", "total")))
+                             for option in self.options])
+            if index == 0:
+                lines += ["", f"### Projected Future Home Values (after {household['years']:g} years):"]
+                lines += [f"- **{self.homes[home]['name']} Future Value:** \\$**{value:,.0f}**"
+                          for home, value in result["future_values"].items()]
+            lines += ["", f"### Net Asset (\"Remaining Equity\") - {case}:"]
+            lines += _table(("Future Value", "Total Outlay", "**Net Asset**"),
+                            [(self._row_label(option), result["future_values"][option["home"]],
+                              result["cases"][case][option["key"]]["total"],
+                              result["cases"][case][option["key"]]["net_asset"])
+                             for option in self.options])
+        lines += [
+            "", "---", "",
+            "### Note:",
+            f"- The projected future home values assume a {household['years']:g}-year horizon with an annual "
+            f"appreciation rate of {household['annual_growth_rate'] * 100:.1f}%.",
+            "- “Net Asset” here is a rudimentary measure: it’s the projected future sale value minus your total "
+            "cash outlays (housing plus tuition).",
+            "- Interest is the total paid on each home's loan until it is paid off under the scenario's "
+            "prepayment plan.",
+            "- You can adjust the loans, prepayment plans, growth rate or tuition multiplier in the spec to better "
+            "reflect your situation.",
+            "",
+        ]
+        return "\n".join(lines)
+
+    def _housing_lines(self, home: str, costs: dict) -> list:
+        spec = self.homes[home]
+        lines = [f"- **{spec['name']} ({spec['description']}):**  " if spec.get("description")
+                 else f"- **{spec['name']}:**  "]
+        closing_percent = f"{spec['closing_rate'] * 100:g}%"
+        if spec.get("credit"):
+            lines += [f"  - Effective Purchase Price: \\$**{costs['effective_price']:,.0f}**  ",
+                      f"  - Closing Costs ({closing_percent} of \\${costs['price'] / 1000:,.0f}K): "
+                      f"\\$**{costs['closing_cost']:,.0f}**  "]
+        else:
+            lines += [f"  - Purchase Price: \\${costs['price']:,.0f}  ",
+                      f"  - Closing Costs ({closing_percent}): \\$**{costs['closing_cost']:,.0f}**  "]
+        lines += [f"  - Interest (over {_years(costs['payoff_month'])}): \\$**{costs['interest']:,.0f}**  ",
+                  f"  - **Total Outlay:** \\$**{costs['total']:,.0f}**"]
+        return lines
+
+    @staticmethod
+    def _tuition_lines(option: dict, tuition: dict) -> list:
+        lines = [f"- **Option {option['key']}: {option['label'].replace(': ', ' – ', 1)}:**  "]
+        elementary_years = option.get("elementary_years", 0)
+        high_school_years = option.get("high_school_years", 0)
+        if elementary_years:
+            label = option.get("elementary_label") or ("Elementary" if high_school_years else "Private Elementary")
+            lines.append(f"  - {label} "
+                         f"(K–{elementary_years - 1} for {elementary_years} yrs): \\$**{tuition['elementary']:,.0f}**  ")
+        if high_school_years:
+            lines.append(f"  - High School (9–{8 + high_school_years} for {high_school_years} yrs): "
+                         f"\\$**{tuition['high_school']:,.0f}**  ")
+        if high_school_years or not elementary_years:
+            lines.append(f"  - **Total Tuition:** \\${'**' if tuition['total'] else ''}{tuition['total']:,.0f}"
+                         f"{'**' if tuition['total'] else ''}")
+        return lines
+
+    @staticmethod
+    def _row_label(option: dict) -> str:
+        return f"**{option['key']}. {option['label']}**"
+
+
+def _years(months: int) -> str:
+    years, months = divmod(months, 12)
+    if not months:
+        return f"{years} yrs"
+    return f"{years}–{years + 1} yrs" if years else f"{months} mos"
+
+
+def _table(headers: tuple, rows: list) -> list:
+    """A Markdown table with the option label column and three dollar columns."""
+    lines = [f"| {'Option':<39} | " + " | ".join(f"{header:<20}" for header in headers) + " |",
+             "|" + "-" * 41 + ("|" + "-" * 22) * len(headers) + "|"]
+    for label, *values in rows:
+        cells = ["\\$" + format(value, ",.0f") for value in values]
+        lines.append(f"| {label:<39} | " + " | ".join(f"{cell:<20}" for cell in cells) + " |")
+    return lines
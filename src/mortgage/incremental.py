@@ -0,0 +1,79 @@
+# src/mortgage/incremental.py
+
+from mortgage.schedule import AmortizationSchedule, ScheduleSummary
+
+
+class IncrementalSchedule:
+    """
+    An amortization schedule that is kept up to date as its prepayment plan is edited.
+
+    A change to month m's extra payment cannot affect months before m, so an edit keeps the
+    rows before the earliest changed month and re-simulates only the rest, resuming from the
+    balance, payment and rate at that point. Every row is computed by the same arithmetic as
+    MortgageCalculator.get_amortization_schedule, so the result is bit-identical to
+    recomputing the edited plan from month 1.
+    """
+
+    def __init__(self, calculator, prepayment_schedule=None):
+        self.calculator = calculator
+        # A private {month: amount} copy of the plan; edits never touch the caller's plan.
+        self.prepayments = {int(month): amount for month, amount in (prepayment_schedule or {}).items() if amount}
+        self.schedule = AmortizationSchedule()
+        self.recomputed_months = 0
+        self._recompute_from(1)
+
+    def _recompute_from(self, month: int):
+        loan_key = self.calculator._cache_key()
+        if month > 1 and loan_key != self._loan_key:
+            # The loan itself changed since the last computation, so nothing can be reused.
+            month = 1
+        self._loan_key = loan_key
+
+        # Months past the end of the schedule resume from its (paid-off) final state.
+        month = min(month, len(self.schedule) + 1)
+        self.schedule.truncate(month - 1)
+        before = len(self.schedule)
+        resume = self.calculator._resume_state(self.schedule, month)
+        self.schedule.extend(self.calculator._iter_rows(self.prepayments, resume))
+        self.recomputed_months = len(self.schedule) - before
+
+    def update(self, changes: dict):
+        """
+        Apply several edits at once, as a {month: amount} dict; an amount of 0 or None removes
+        that month's prepayment. The schedule is recomputed once, from the earliest month
+        whose amount actually changed.
+        """
+        changed = []
+        for month, amount in changes.items():
+            month = int(month)
+            if (amount or 0) == self.prepayments.get(month, 0):
+                continue
+            if amount:
+                self.prepayments[month] = amount
+            else:
+                del self.prepayments[month]
+            changed.append(month)
+        if changed:
+            self._recompute_from(min(changed))
+        else:
+            self.recomputed_months = 0
+        return self.schedule
+
+    def set_prepayment(self, month: int, amount: float):
+        """Add a prepayment, or replace the amount of an existing one."""
+        return self.update({month: amount})
+
+    def add_prepayment(self, month: int, amount: float):
+        """Add `amount` to whatever is already prepaid in `month`."""
+        return self.update({month: self.prepayments.get(month, 0) + amount})
+
+    def remove_prepayment(self, month: int):
+        return self.update({month: 0})
+
+    def refresh(self):
+        """Recompute from month 1, e.g., after the calculator's loan parameters changed."""
+        self._recompute_from(1)
+        return self.schedule
+
+    def summarize(self, horizon: int = None) -> ScheduleSummary:
+        return ScheduleSummary().update(zip(*self.schedule.columns()), horizon)
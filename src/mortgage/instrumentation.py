@@ -0,0 +1,241 @@
+# src/mortgage/instrumentation.py
+"""
+Opt-in counters, timing histograms and profiling for the calculator's hot paths.
+
+Instrumented code checks METRICS.enabled once per schedule, solver call or file operation
+(never per month), so with instrumentation off, the default, the overhead is one attribute
+lookup per call. Typical use:
+
+    from mortgage.instrumentation import METRICS, profiling
+
+    METRICS.enable()
+    with profiling("profile.out"):
+        ...  # run the workload
+    print(METRICS.to_prometheus())
+
+Metric names are dotted ("schedule.months_simulated"); the Prometheus export turns them
+into mortgage_schedule_months_simulated.
+"""
+
+import bisect
+import math
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+
+# Upper bounds (seconds) of the timing histogram buckets; the last one is open-ended.
+DEFAULT_BUCKETS = (1e-5, 1e-4, 5e-4, 1e-3, 5e-3, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 10.0, math.inf)
+
+_NULL_TIMER = nullcontext()
+
+
+class Histogram:
+    """Counts of observed durations per bucket, with their count and sum."""
+
+    def __init__(self, buckets: tuple = DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def to_dict(self) -> dict:
+        return {
+            "count": self.count,
+            "sum": self.sum,
+            "buckets": {("+Inf" if bound == math.inf else repr(bound)): count
+                        for bound, count in zip(self.buckets, self.counts)},
+        }
+
+
+class _Timer:
+    __slots__ = ("metrics", "name", "started")
+
+    def __init__(self, metrics, name: str):
+        self.metrics = metrics
+        self.name = name
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.metrics.observe(self.name, time.perf_counter() - self.started)
+
+
+class Metrics:
+    """
+    A registry of counters and timing histograms. Recording methods do nothing while the
+    registry is disabled; hot paths should still test `enabled` before calling them.
+    """
+
+    def __init__(self, enabled: bool = False):
+        self.enabled = enabled
+        self.counters = {}
+        self.histograms = {}
+        self._lock = threading.Lock()
+
+    def enable(self):
+        self.enabled = True
+
+    def disable(self):
+        self.enabled = False
+
+    def reset(self):
+        with self._lock:
+            self.counters.clear()
+            self.histograms.clear()
+
+    def increment(self, name: str, amount: float = 1):
+        if self.enabled:
+            with self._lock:
+                self.counters[name] = self.counters.get(name, 0) + amount
+
+    def observe(self, name: str, seconds: float):
+        if self.enabled:
+            with self._lock:
+                histogram = self.histograms.get(name)
+                if histogram is None:
+                    histogram = self.histograms[name] = Histogram()
+                histogram.observe(seconds)
+
+    def timer(self, name: str):
+        """Context manager recording the duration of its block in the `name` histogram."""
+        return _Timer(self, name) if self.enabled else _NULL_TIMER
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "counters": dict(self.counters),
+                "histograms": {name: histogram.to_dict() for name, histogram in self.histograms.items()},
+            }
+
+    def to_json(self) -> str:
+        import json
+
+        return json.dumps(self.snapshot(), indent=2, sort_keys=True)
+
+    def to_prometheus(self, prefix: str = "mortgage") -> str:
+        """The metrics in the Prometheus text exposition format."""
+        snapshot = self.snapshot()
+        lines = []
+        for name, value in sorted(snapshot["counters"].items()):
+            metric = _prometheus_name(prefix, name) + "_total"
+            lines += [f"# TYPE {metric} counter", f"{metric} {value}"]
+        for name, histogram in sorted(snapshot["histograms"].items()):
+            metric = _prometheus_name(prefix, name)
+            lines.append(f"# TYPE {metric} histogram")
+            cumulative = 0
+            for bound, count in histogram["buckets"].items():
+                cumulative += count
+                lines.append(f'{metric}_bucket{{le="{bound}"}} {cumulative}')
+            lines += [f"{metric}_sum {histogram['sum']}", f"{metric}_count {histogram['count']}"]
+        return "\n".join(lines) + "\n"
+
+    def save(self, path: str):
+        """Write the metrics to path, in the Prometheus format for .prom/.txt files, else JSON."""
+        with open(path, "w") as f:
+            f.write(self.to_prometheus() if path.endswith((".prom", ".txt")) else self.to_json() + "\n")
+
+
+def _prometheus_name(prefix: str, name: str) -> str:
+    return "_".join((prefix, *name.replace("-", "_").split(".")))
+
+
+# The process-wide registry used by the calculator, solver and persistence functions.
+METRICS = Metrics()
+
+
+class Profiler:
+    """cProfile and (optionally) tracemalloc around a block of code."""
+
+    def __init__(self, memory: bool = True):
+        # The profilers are imported on first use, keeping them out of every program's startup.
+        import cProfile
+
+        self.memory = memory
+        self.profile = cProfile.Profile()
+        self.memory_snapshot = None
+
+    def start(self):
+        if self.memory:
+            import tracemalloc
+
+            tracemalloc.start()
+        self.profile.enable()
+
+    def stop(self):
+        self.profile.disable()
+        if self.memory:
+            import tracemalloc
+
+            self.memory_snapshot = tracemalloc.take_snapshot()
+            tracemalloc.stop()
+
+    def report(self, limit: int = 20) -> str:
+        """The most expensive functions by cumulative time, and the top allocation sites."""
+        import io
+        import pstats
+
+        out = io.StringIO()
+        pstats.Stats(self.profile, stream=out).sort_stats("cumulative").print_stats(limit)
+        if self.memory_snapshot is not None:
+            out.write("Top allocations:\n")
+            for statistic in self.memory_snapshot.statistics("lineno")[:limit]:
+                out.write(f"  {statistic}\n")
+        return out.getvalue()
+
+    def save(self, path: str):
+        """Dump the cProfile statistics, for pstats or snakeviz."""
+        self.profile.dump_stats(path)
+
+
+@contextmanager
+def profiling(path: str = None, memory: bool = True, enabled: bool = True):
+    """Profile the block, dumping the cProfile statistics to path if one is given."""
+    if not enabled:
+        yield None
+        return
+    profiler = Profiler(memory)
+    profiler.start()
+    try:
+        yield profiler
+    finally:
+        profiler.stop()
+        if path is not None:
+            profiler.save(path)
+
+
+def serve_metrics(port: int = 9100, host: str = "127.0.0.1", metrics: Metrics = METRICS):
+    """
+    Serve GET /metrics (Prometheus text) and /metrics.json from a daemon thread, for
+    scraping a long-running batch job. Call shutdown() on the returned server to stop it.
+    """
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path == "/metrics":
+                body, content_type = metrics.to_prometheus(), "text/plain; version=0.0.4"
+            elif self.path == "/metrics.json":
+                body, content_type = metrics.to_json(), "application/json"
+            else:
+                self.send_error(404)
+                return
+            data = body.encode()
+            self.send_response(200)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
@@ -0,0 +1,251 @@
+# src/mortgage/montecarlo.py
+"""
+Monte Carlo simulation of mortgage costs under stochastic rates, prepayments and home prices.
+
+Each path draws correlated monthly shocks for the rate index (adjustable-rate resets), the
+borrower's extra payments and home appreciation, and amortizes the loan over the horizon with
+the same monthly recurrence as MortgageCalculator, vectorized across paths with NumPy.
+
+Paths are split into fixed-size chunks, and chunk i always draws from the i-th child of
+SeedSequence(seed), so results depend only on the seed, the number of paths and the chunk
+size, not on how many worker processes run the chunks.
+
+Usage: python -m mortgage.montecarlo [--paths 20000] [--seed 0] [--workers N]
+"""
+
+import argparse
+import math
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from mortgage.batch import monthly_payments
+from mortgage.schedule import PAID_OFF_TOLERANCE
+
+PERCENTILES = (5, 25, 50, 75, 95)
+
+# Bytes of simulation state per path (about a dozen float64 vectors plus the per-path outputs).
+_BYTES_PER_PATH = 8 * 24
+
+
+class MonteCarloConfig:
+    """
+    Inputs of a Monte Carlo run. Rates are annual percentages as in MortgageCalculator; growth
+    rates and volatilities are annual fractions as in scripts/CostCompare.py.
+    """
+
+    def __init__(self, home_value: float = 450000, down_payment: float = 90000, loan_term: int = 30,
+                 interest_rate: float = 6.625, closing_cost_rate: float = 0.04, credit: float = 0.0,
+                 horizon_years: int = 15,
+                 # Adjustable-rate terms: the initial rate is fixed for fixed_period_months, then resets
+                 # every reset_interval_months to index + margin, limited by the caps.
+                 fixed_period_months: int = None, reset_interval_months: int = 12, margin: float = 2.75,
+                 initial_index: float = 4.0, index_mean: float = 4.0, index_reversion: float = 0.2,
+                 index_volatility: float = 1.0, periodic_cap: float = 2.0, lifetime_cap: float = 5.0,
+                 rate_floor: float = None,
+                 # Extra payment made every month, with lognormal variation between paths and months.
+                 monthly_prepayment: float = 0.0, prepayment_volatility: float = 0.0,
+                 # Home appreciation, as the annual_growth_rate of scripts/CostCompare.py.
+                 annual_growth_rate: float = 0.035, appreciation_volatility: float = 0.0,
+                 # Annual tuition paid during the first tuition_years, growing at tuition_inflation.
+                 annual_tuition: float = 0.0, tuition_years: int = 0, tuition_inflation: float = 0.0,
+                 # Correlations of the rate shocks with prepayment and appreciation shocks.
+                 rate_prepayment_correlation: float = -0.3, rate_appreciation_correlation: float = -0.2):
+        self.home_value = home_value
+        self.down_payment = down_payment
+        self.loan_term = loan_term
+        self.interest_rate = interest_rate
+        self.closing_cost_rate = closing_cost_rate
+        self.credit = credit
+        self.horizon_years = horizon_years
+        self.fixed_period_months = fixed_period_months
+        self.reset_interval_months = reset_interval_months
+        self.margin = margin
+        self.initial_index = initial_index
+        self.index_mean = index_mean
+        self.index_reversion = index_reversion
+        self.index_volatility = index_volatility
+        self.periodic_cap = periodic_cap
+        self.lifetime_cap = lifetime_cap
+        self.rate_floor = margin if rate_floor is None else rate_floor
+        self.monthly_prepayment = monthly_prepayment
+        self.prepayment_volatility = prepayment_volatility
+        self.annual_growth_rate = annual_growth_rate
+        self.appreciation_volatility = appreciation_volatility
+        self.annual_tuition = annual_tuition
+        self.tuition_years = tuition_years
+        self.tuition_inflation = tuition_inflation
+        self.rate_prepayment_correlation = rate_prepayment_correlation
+        self.rate_appreciation_correlation = rate_appreciation_correlation
+
+    @property
+    def is_adjustable(self) -> bool:
+        return self.fixed_period_months is not None and self.fixed_period_months < self.loan_term * 12
+
+    def correlation_factor(self) -> np.ndarray:
+        """Cholesky factor of the (rate, prepayment, appreciation) shock correlation matrix."""
+        correlation = np.array([
+            [1.0, self.rate_prepayment_correlation, self.rate_appreciation_correlation],
+            [self.rate_prepayment_correlation, 1.0, 0.0],
+            [self.rate_appreciation_correlation, 0.0, 1.0],
+        ])
+        return np.linalg.cholesky(correlation)
+
+    def tuition_total(self) -> float:
+        years = min(self.tuition_years, self.horizon_years)
+        return sum(self.annual_tuition * (1 + self.tuition_inflation) ** year for year in range(years))
+
+
+def simulate_chunk(config: MonteCarloConfig, num_paths: int, seed_sequence) -> dict:
+    """Simulate num_paths paths with a generator seeded from seed_sequence."""
+    rng = np.random.default_rng(seed_sequence)
+    factor = config.correlation_factor()
+    principal = config.home_value - config.down_payment
+    total_payments = config.loan_term * 12
+    horizon = min(config.horizon_years * 12, total_payments)
+    dt = 1 / 12
+
+    annual_rate = np.full(num_paths, float(config.interest_rate))
+    monthly_rate = annual_rate / 100 / 12
+    balance = np.full(num_paths, float(principal))
+    payment = monthly_payments(balance, monthly_rate, np.full(num_paths, total_payments))
+    index = np.full(num_paths, float(config.initial_index))
+    log_home_value = np.full(num_paths, math.log(config.home_value))
+    home_drift = (math.log1p(config.annual_growth_rate) - 0.5 * config.appreciation_volatility ** 2) * dt
+    total_interest = np.zeros(num_paths)
+    total_extra = np.zeros(num_paths)
+    payoff_month = np.zeros(num_paths, dtype=np.int64)
+    max_rate = config.interest_rate + config.lifetime_cap
+
+    for month in range(1, horizon + 1):
+        shocks = factor @ rng.standard_normal((3, num_paths))
+
+        # Rate index: mean-reverting random walk, observed at each reset.
+        index += (config.index_reversion * (config.index_mean - index) * dt
+                  + config.index_volatility * math.sqrt(dt) * shocks[0])
+        if config.is_adjustable and month > config.fixed_period_months and (
+                (month - config.fixed_period_months - 1) % config.reset_interval_months == 0):
+            target = np.clip(index + config.margin, config.rate_floor, max_rate)
+            annual_rate = np.clip(target, annual_rate - config.periodic_cap, annual_rate + config.periodic_cap)
+            monthly_rate = annual_rate / 100 / 12
+            # Re-amortize the remaining balance over the remaining term at the new rate.
+            payment = np.where(balance > 0, monthly_payments(balance, monthly_rate,
+                                                             np.full(num_paths, total_payments - month + 1)), 0.0)
+
+        # Paths still owing at the start of the month; one pays off this month when its balance
+        # reaches zero, whether through the extra payment or the scheduled one.
+        outstanding = balance > 0
+
+        # Extra payment, capped at the outstanding balance, before the month's interest accrues.
+        if config.monthly_prepayment:
+            volatility = config.prepayment_volatility
+            extra = config.monthly_prepayment * np.exp(volatility * shocks[1] - 0.5 * volatility ** 2)
+            extra = np.minimum(extra, balance)
+            balance -= extra
+            total_extra += extra
+
+        interest = balance * monthly_rate
+        principal_payment = np.minimum(payment - interest, balance)
+        balance -= principal_payment
+        total_interest += interest
+        payoff_month[outstanding & (balance <= PAID_OFF_TOLERANCE) & (payoff_month == 0)] = month
+
+        log_home_value += home_drift + config.appreciation_volatility * math.sqrt(dt) * shocks[2]
+
+    home_value = np.exp(log_home_value)
+    outlay = (config.home_value - config.credit + config.home_value * config.closing_cost_rate + total_interest
+              + config.tuition_total())
+    return {
+        "total_interest": total_interest,
+        "total_extra": total_extra,
+        "ending_balance": balance,
+        "ending_rate": annual_rate,
+        "payoff_month": payoff_month,
+        "home_value": home_value,
+        # As in scripts/CostCompare.py: the projected sale value minus total outlays.
+        "net_equity": home_value - outlay,
+    }
+
+
+class MonteCarloResult:
+    """Per-path outputs of a Monte Carlo run, with percentile summaries."""
+
+    def __init__(self, outputs: dict, seed: int):
+        self.outputs = outputs
+        self.seed = seed
+
+    def __len__(self) -> int:
+        return len(self.outputs["total_interest"])
+
+    def percentiles(self, field: str, percentiles=PERCENTILES) -> dict:
+        values = np.percentile(self.outputs[field], percentiles)
+        return dict(zip(percentiles, values.tolist()))
+
+    def paid_off_share(self) -> float:
+        """Share of paths that paid the loan off within the horizon."""
+        return float(np.mean(self.outputs["payoff_month"] > 0))
+
+    def to_markdown(self) -> str:
+        header = "| Metric | " + " | ".join(f"P{p}" for p in PERCENTILES) + " |"
+        lines = [header, "|" + "---|" * (len(PERCENTILES) + 1)]
+        for field, label in (("total_interest", "Interest paid"), ("net_equity", "Net equity"),
+                             ("home_value", "Home value"), ("ending_balance", "Remaining balance")):
+            values = self.percentiles(field)
+            lines.append(f"| {label} | " + " | ".join(f"${values[p]:,.0f}" for p in PERCENTILES) + " |")
+        return "\n".join(lines)
+
+
+def chunk_sizes(paths: int, chunk_size: int) -> list:
+    return [min(chunk_size, paths - start) for start in range(0, paths, chunk_size)]
+
+
+def run_monte_carlo(config: MonteCarloConfig, paths: int = 20000, seed: int = 0, workers: int = 1,
+                    chunk_size: int = 5000, memory_budget_mb: float = 256) -> MonteCarloResult:
+    """
+    Simulate `paths` paths in chunks, in parallel when workers > 1.
+
+    chunk_size is lowered if needed so that one chunk fits in memory_budget_mb, and fewer
+    workers run if their chunks in flight would not fit together. Chunking decides which
+    random stream each path uses, so it depends only on chunk_size and the budget, never on
+    workers: pass the same chunk_size and budget to reproduce a run.
+    """
+    budget_paths = max(int(memory_budget_mb * 2 ** 20 / _BYTES_PER_PATH), 1)
+    chunk_size = min(chunk_size, budget_paths)
+    workers = max(min(workers, budget_paths // chunk_size), 1)
+    sizes = chunk_sizes(paths, chunk_size)
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            chunks = list(executor.map(simulate_chunk, [config] * len(sizes), sizes, seeds))
+    else:
+        chunks = [simulate_chunk(config, size, chunk_seed) for size, chunk_seed in zip(sizes, seeds)]
+
+    outputs = {field: np.concatenate([chunk[field] for chunk in chunks]) for field in chunks[0]}
+    return MonteCarloResult(outputs, seed)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Monte Carlo distribution of mortgage interest and net equity.")
+    parser.add_argument("--paths", type=int, default=20000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--home-value", type=float, default=450000)
+    parser.add_argument("--down-payment", type=float, default=90000)
+    parser.add_argument("--interest-rate", type=float, default=6.625)
+    parser.add_argument("--arm", type=int, metavar="MONTHS", help="Fixed period of an adjustable-rate loan.")
+    parser.add_argument("--prepayment", type=float, default=0.0, help="Average extra payment per month.")
+    args = parser.parse_args()
+
+    config = MonteCarloConfig(home_value=args.home_value, down_payment=args.down_payment,
+                              interest_rate=args.interest_rate, fixed_period_months=args.arm,
+                              monthly_prepayment=args.prepayment, prepayment_volatility=0.5 if args.prepayment else 0,
+                              appreciation_volatility=0.1)
+    result = run_monte_carlo(config, args.paths, args.seed, args.workers)
+    print(f"{len(result):,d} paths, seed {result.seed}; paid off within "
+          f"{config.horizon_years} years: {result.paid_off_share():.1%}\n")
+    print(result.to_markdown())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,237 @@
+# src/mortgage/plan.py
+
+import hashlib
+import heapq
+import json
+import math
+from collections.abc import Mapping
+
+from mortgage.instrumentation import METRICS
+
+# Runs shorter than this are kept as one-off overrides when compressing a month -> amount dict.
+MIN_RULE_LENGTH = 3
+
+
+def _json_month(value) -> int:
+    """A month read from a saved plan: a positive integer, or its string form for dict keys."""
+    try:
+        month = int(value)
+    except (TypeError, ValueError):
+        month = None
+    if month is None or month < 1 or isinstance(value, bool) or (isinstance(value, float) and value != month):
+        raise ValueError(f"Invalid prepayment month {value!r}; months are whole numbers from 1.")
+    return month
+
+
+def _json_amount(value) -> float:
+    """An amount read from a saved plan: a finite, non-negative number."""
+    if isinstance(value, bool) or not isinstance(value, (int, float)) or not math.isfinite(value) or value < 0:
+        raise ValueError(f"Invalid prepayment amount {value!r}; amounts are non-negative numbers.")
+    return value
+
+
+class PrepaymentRule:
+    """
+    A recurring extra payment: `amount` every `frequency_months` months starting at
+    `start_month`, either `count` times or indefinitely (count=None) until the loan is paid off.
+    """
+    __slots__ = ("start_month", "frequency_months", "count", "amount")
+
+    def __init__(self, start_month: int, frequency_months: int, count: int = None, amount: float = 0.0):
+        if start_month < 1 or frequency_months < 1:
+            raise ValueError("start_month and frequency_months must be at least 1.")
+        self.start_month = start_month
+        self.frequency_months = frequency_months
+        self.count = count
+        self.amount = amount
+
+    def last_month(self, horizon: int = None):
+        """Last month the rule applies to, or None if it is indefinite and no horizon is given."""
+        if self.count is not None:
+            last = self.start_month + (self.count - 1) * self.frequency_months
+            return min(last, horizon) if horizon is not None else last
+        return horizon
+
+    def months(self, horizon: int = None) -> range:
+        last = self.last_month(horizon)
+        if last is None:
+            raise ValueError("An indefinite prepayment rule needs a horizon to be expanded.")
+        return range(self.start_month, last + 1, self.frequency_months)
+
+    def applies_to(self, month: int) -> bool:
+        offset = month - self.start_month
+        if offset < 0 or offset % self.frequency_months:
+            return False
+        return self.count is None or offset // self.frequency_months < self.count
+
+    def to_dict(self) -> dict:
+        return {
+            "start_month": self.start_month,
+            "frequency_months": self.frequency_months,
+            "count": self.count,
+            "amount": self.amount,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict):
+        """Load a rule saved by to_dict; raises ValueError if it is malformed."""
+        if not isinstance(data, Mapping):
+            raise ValueError(f"Invalid prepayment rule {data!r}; rules are JSON objects.")
+        try:
+            count = data.get("count")
+            return cls(_json_month(data["start_month"]), _json_month(data["frequency_months"]),
+                       _json_month(count) if count is not None else None, _json_amount(data["amount"]))
+        except KeyError as error:
+            raise ValueError(f"Prepayment rule {dict(data)!r} is missing {error}.")
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, PrepaymentRule):
+            return NotImplemented
+        return self.to_dict() == other.to_dict()
+
+    def __repr__(self) -> str:
+        count = "indefinitely" if self.count is None else f"{self.count} time(s)"
+        return (f"PrepaymentRule(${self.amount:,.2f} every {self.frequency_months} month(s) "
+                f"from month {self.start_month}, {count})")
+
+
+class PrepaymentPlan(Mapping):
+    """
+    A prepayment plan made of recurring rules plus one-off overrides.
+
+    The plan behaves like the old {month: amount} dictionaries (plan[month], plan.get(month, 0),
+    len(plan), iteration in month order), but months are only expanded when iterated, so
+    "$4000 every month, indefinitely" is stored as a single rule. Amounts of overlapping rules
+    add up; an override replaces whatever the rules give for its month (0 skips the month).
+    Indefinite rules end at `horizon` (normally the total number of payments), which a plan
+    with indefinite rules must therefore have.
+    """
+
+    def __init__(self, rules=(), overrides: dict = None, horizon: int = None):
+        self.rules = list(rules)
+        self.overrides = {int(month): amount for month, amount in (overrides or {}).items()}
+        self.horizon = horizon
+        if horizon is None and any(rule.count is None for rule in self.rules):
+            raise ValueError("A plan with indefinite rules needs a horizon (normally the total number of payments).")
+
+    def get(self, month: int, default=None):
+        if month in self.overrides:
+            return self.overrides[month] or default
+        amount = 0
+        for rule in self.rules:
+            if rule.applies_to(month) and (self.horizon is None or month <= self.horizon):
+                amount += rule.amount
+        return amount or default
+
+    def __getitem__(self, month: int):
+        amount = self.get(month)
+        if amount is None:
+            raise KeyError(month)
+        return amount
+
+    def _iter_items(self):
+        # Merge the (sorted) months of every rule and override, skipping duplicates and zeros.
+        sources = [rule.months(self.horizon) for rule in self.rules] + [sorted(self.overrides)]
+        if len(sources) == 2 and not self.overrides:
+            # A single rule needs no merging or per-month lookups.
+            amount = self.rules[0].amount
+            if amount:
+                for month in sources[0]:
+                    yield month, amount
+            return
+        previous = None
+        for month in heapq.merge(*sources):
+            if month != previous:
+                amount = self.get(month)
+                if amount:
+                    yield month, amount
+            previous = month
+
+    def __iter__(self):
+        for month, _ in self._iter_items():
+            yield month
+
+    def items(self) -> list:
+        """Return the (month, amount) pairs in month order, expanding each month only once."""
+        return list(self._iter_items())
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def __bool__(self) -> bool:
+        return any(rule.amount for rule in self.rules) or any(self.overrides.values())
+
+    def __repr__(self) -> str:
+        return f"PrepaymentPlan(rules={self.rules}, overrides={self.overrides}, horizon={self.horizon})"
+
+    def to_dict(self) -> dict:
+        """Expand the plan into an explicit {month: amount} dictionary."""
+        return {month: self[month] for month in self}
+
+    def cache_key(self) -> str:
+        """Stable digest of the plan's definition, used by the schedule cache."""
+        return hashlib.blake2b(json.dumps(self.to_json()).encode(), digest_size=16).hexdigest()
+
+    @classmethod
+    def from_dict(cls, schedule: dict, horizon: int = None):
+        """
+        Compress an explicit {month: amount} dictionary into rules: runs of at least
+        MIN_RULE_LENGTH equal amounts at a constant spacing become rules, the rest overrides.
+        """
+        items = sorted((int(month), amount) for month, amount in schedule.items() if amount)
+        rules, overrides = [], {}
+        index = 0
+        while index < len(items):
+            start_month, amount = items[index]
+            end = index + 1
+            if end < len(items) and items[end][1] == amount:
+                frequency = items[end][0] - start_month
+                while (end < len(items) and items[end][1] == amount
+                       and items[end][0] - items[end - 1][0] == frequency):
+                    end += 1
+            if end - index >= MIN_RULE_LENGTH:
+                rules.append(PrepaymentRule(start_month, items[index + 1][0] - start_month, end - index, amount))
+            else:
+                overrides.update(items[index:end])
+            index = end
+        return cls(rules, overrides, horizon)
+
+    def to_json(self) -> dict:
+        return {
+            "rules": [rule.to_dict() for rule in self.rules],
+            "overrides": {str(month): amount for month, amount in sorted(self.overrides.items())},
+            "horizon": self.horizon,
+        }
+
+    @classmethod
+    def from_json(cls, data: dict, horizon: int = None):
+        """
+        Load a plan saved by to_json, or an old-style {"month": amount} dictionary, ending
+        indefinite rules at `horizon` if one is given and else at the saved horizon. Raises
+        ValueError unless months are whole numbers from 1 and amounts non-negative numbers.
+        """
+        if not isinstance(data, Mapping):
+            raise ValueError("A prepayment plan must be a JSON object.")
+        if "rules" not in data:
+            return cls.from_dict(cls._json_months(data), horizon)
+        if not isinstance(data["rules"], list):
+            raise ValueError("The rules of a prepayment plan must be a list.")
+        rules = [PrepaymentRule.from_dict(rule) for rule in data["rules"]]
+        # The caller's horizon (the loan at hand) wins over the one the plan was saved with.
+        return cls(rules, cls._json_months(data.get("overrides") or {}),
+                   horizon if horizon is not None else data.get("horizon"))
+
+    @staticmethod
+    def _json_months(data) -> dict:
+        if not isinstance(data, Mapping):
+            raise ValueError("Prepayment overrides must be a JSON object of month: amount pairs.")
+        return {_json_month(month): _json_amount(amount) for month, amount in data.items()}
+
+    def save(self, filename: str):
+        with METRICS.timer("persistence.plan_save_seconds"), open(filename, "w") as f:
+            json.dump(self.to_json(), f)
+
+    @classmethod
+    def load(cls, filename: str, horizon: int = None):
+        with METRICS.timer("persistence.plan_load_seconds"), open(filename, "r") as f:
+            return cls.from_json(json.load(f), horizon)
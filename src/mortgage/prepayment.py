@@ -1,20 +1,23 @@
 # src/mortgage/prepayment.py
 
 import os
-import json
+import math
+import time
+
+from mortgage import annuity
+from mortgage.instrumentation import METRICS
+from mortgage.plan import PrepaymentPlan, PrepaymentRule
+from utils.paths import data_path, project_root
 
 
 def get_project_root() -> str:
     """
-    Returns the absolute path of the project root directory.
-    Assumes this file is located at project_root/src/mortgage/prepayment.py.
+    Returns the absolute path of the project root directory (cached by utils.paths).
     """
-    current_dir = os.path.dirname(os.path.abspath(__file__))
-    project_root = os.path.abspath(os.path.join(current_dir, "..", ".."))
-    return project_root
+    return project_root()
 
 
-def get_prepayment_schedule(total_payments: int = None, filename: str = None) -> dict:
+def get_prepayment_schedule(total_payments: int = None, filename: str = None) -> PrepaymentPlan:
     """
     Check if saved prepayment details exist in the data directory at the project root.
     If found, ask the user if they want to reuse them.
@@ -26,27 +29,22 @@ def get_prepayment_schedule(total_payments: int = None, filename: str = None) ->
       - The frequency (in months),
       - The number of intervals, or an option to prepay indefinitely.
 
-    When 'indefinitely' is chosen and total_payments is provided, the number of intervals is calculated as:
-      num_intervals = ((total_payments - start_month) // frequency_months) + 1
+    When 'indefinitely' is chosen and total_payments is provided, equal prepayments are stored as an
+    open-ended rule (count=None) that runs until the loan is paid off; custom amounts are asked for
+    each of the num_intervals = ((total_payments - start_month) // frequency_months) + 1 intervals.
 
     Returns:
-      A dictionary mapping month numbers (as integers) to prepayment amounts.
+      A PrepaymentPlan, which maps month numbers (as integers) to prepayment amounts like a dictionary.
     """
     if filename is None:
-        project_root = get_project_root()
-        filename = os.path.join(project_root, "data", "prepayment_details.json")
-
-    # Ensure the data directory exists.
-    os.makedirs(os.path.dirname(filename), exist_ok=True)
+        filename = data_path(os.path.join("data", "prepayment_details.json"))
 
     # Check for existing prepayment details.
     if os.path.exists(filename):
         reuse = input("Found saved prepayment details. Do you want to use them? (y/yes to reuse): ").strip().lower()
         if reuse in ['y', 'yes']:
-            with open(filename, "r") as f:
-                saved_details = json.load(f)
-            # Convert keys back to integers.
-            saved_details = {int(k): v for k, v in saved_details.items()}
+            # Older files hold an expanded {"month": amount} dict; they are compressed on load.
+            saved_details = PrepaymentPlan.load(filename, horizon=total_payments)
             print("Using saved prepayment details:")
             print(saved_details)
             return saved_details
@@ -60,35 +58,139 @@ def get_prepayment_schedule(total_payments: int = None, filename: str = None) ->
         "Enter the number of prepayment intervals (or type 'i' for indefinitely until loan is paid off): "
     ).strip()
 
-    if num_intervals_input.lower() in ['i', 'indefinitely']:
+    indefinite = num_intervals_input.lower() in ['i', 'indefinitely']
+    if indefinite:
         if total_payments is not None:
             num_intervals = ((total_payments - start_month) // frequency_months) + 1
             print(f"Prepayments will be applied indefinitely for a total of {num_intervals} intervals.")
         else:
             print("Total payments not provided; please enter a number of intervals.")
             num_intervals = int(input("Enter the number of prepayment intervals: "))
+            indefinite = False
     else:
         num_intervals = int(num_intervals_input)
 
-    prepayment_schedule = {}
     if equal_choice in ['y', 'yes']:
         lump_sum = float(input("Enter the lump sum prepayment amount for each interval: "))
-        for i in range(num_intervals):
-            month = start_month + i * frequency_months
-            prepayment_schedule[month] = lump_sum
+        # Equal prepayments are stored as a single rule rather than one entry per month; an
+        # indefinite rule has no count and runs until the loan is paid off.
+        rule = PrepaymentRule(start_month, frequency_months, None if indefinite else num_intervals, lump_sum)
+        prepayment_schedule = PrepaymentPlan([rule], horizon=total_payments)
     else:
+        overrides = {}
         for i in range(num_intervals):
             month = start_month + i * frequency_months
-            amount = float(input(f"Enter the prepayment amount for month {month}: "))
-            prepayment_schedule[month] = amount
+            overrides[month] = float(input(f"Enter the prepayment amount for month {month}: "))
+        prepayment_schedule = PrepaymentPlan(overrides=overrides, horizon=total_payments)
 
-    # Save the new prepayment details to the file.
-    with open(filename, "w") as f:
-        json.dump(prepayment_schedule, f)
+    # Save the new prepayment details to the file, creating the data directory if needed.
+    os.makedirs(os.path.dirname(os.path.abspath(filename)), exist_ok=True)
+    prepayment_schedule.save(filename)
 
     return prepayment_schedule
 
 
+def _simulate_final_balance(principal: float, monthly_rate: float, monthly_payment: float,
+                            target_months: int, prepayment_months: set, extra_payment: float) -> float:
+    """
+    Simulate the amortization schedule applying an extra payment at each of the prepayment months,
+    and return the final balance after target_months (negative if the loan is overpaid).
+    """
+    balance = principal
+    month = 1
+    while month <= target_months and balance > 0:
+        # If this is a prepayment month, apply the extra payment.
+        if month in prepayment_months:
+            balance -= extra_payment
+            if balance <= 0:
+                return balance
+        interest_payment = balance * monthly_rate
+        principal_payment = monthly_payment - interest_payment
+        if principal_payment > balance:
+            principal_payment = balance
+        balance -= principal_payment
+        month += 1
+    return balance
+
+
+def solve_prepayment_amount(mortgage_details: dict, target_months: int, frequency_months: int = 1,
+                            start_month: int = 1, prepayment_months=None, verify: bool = False,
+                            tolerance: float = 1e-2):
+    """
+    Non-interactive solver for the equal extra payment that pays the loan off in target_months.
+
+    Prepayments are made every frequency_months starting at start_month, or at the explicit
+    (possibly irregular) prepayment_months when given (any iterable of months, including the
+    months of an existing PrepaymentPlan). Because the balance is linear in the
+    extra payment, the required amount is the remaining balance without prepayments divided
+    by the compounded weight of the prepayment months (a geometric series for a regular plan).
+    This is exact while the balance stays positive, so no simulation is needed. With verify=True
+    the result is checked with a single simulation and, if it misses by more than tolerance
+    dollars, refined with secant steps. The amount is rounded up to the next cent.
+
+    Returns:
+      A tuple (extra_payment, prepayment_schedule), as returned by get_prepayment_amount, where
+      prepayment_schedule is a PrepaymentPlan.
+    """
+    started = time.perf_counter() if METRICS.enabled else None
+    principal = mortgage_details['home_value'] - mortgage_details['down_payment']
+    monthly_rate = mortgage_details['interest_rate'] / 100 / 12
+    total_payments = mortgage_details['loan_term'] * 12
+    payment = annuity.monthly_payment(principal, monthly_rate, total_payments)
+    simulations = 0
+
+    if prepayment_months is None:
+        num_intervals = ((target_months - start_month) // frequency_months) + 1 if target_months >= start_month else 0
+        months = [start_month + i * frequency_months for i in range(num_intervals)]
+        weight = annuity.periodic_prepayment_weight(monthly_rate, start_month, frequency_months,
+                                                    num_intervals, target_months)
+    else:
+        months = sorted(month for month in prepayment_months if month <= target_months)
+        weight = sum(annuity.prepayment_weight(monthly_rate, month, target_months) for month in months)
+
+    remaining = annuity.balance_after(principal, monthly_rate, payment, target_months)
+    if not months or remaining <= 0:
+        # Either no prepayment falls within the target or no extra payment is needed.
+        extra_payment = 0.0
+    else:
+        extra_payment = remaining / weight
+
+    if verify and extra_payment:
+        month_set = set(months)
+
+        def final_balance(extra: float) -> float:
+            return _simulate_final_balance(principal, monthly_rate, payment, target_months, month_set, extra)
+
+        # Secant refinement, only needed if the closed form misses (e.g., capped payments).
+        previous, previous_balance = 0.0, remaining
+        current_balance = final_balance(extra_payment)
+        simulations = 1
+        for _ in range(50):
+            if abs(current_balance) < tolerance or current_balance == previous_balance:
+                break
+            step = current_balance * (extra_payment - previous) / (current_balance - previous_balance)
+            previous, previous_balance = extra_payment, current_balance
+            extra_payment = max(extra_payment - step, 0.0)
+            current_balance = final_balance(extra_payment)
+            simulations += 1
+
+    # Round up to the next cent so that the loan is fully paid off within target_months.
+    extra_payment = math.ceil(extra_payment * 100) / 100
+
+    if prepayment_months is None:
+        rules = [PrepaymentRule(start_month, frequency_months, len(months), extra_payment)] if months else []
+        prepayment_schedule = PrepaymentPlan(rules, horizon=total_payments)
+    else:
+        prepayment_schedule = PrepaymentPlan(overrides={month: extra_payment for month in months},
+                                             horizon=total_payments)
+    if started is not None:
+        METRICS.increment("solver.calls")
+        # Verification simulations and secant refinements; the closed form itself needs none.
+        METRICS.increment("solver.iterations", simulations)
+        METRICS.observe("solver.seconds", time.perf_counter() - started)
+    return extra_payment, prepayment_schedule
+
+
 def get_prepayment_amount(mortgage_details: dict):
     """
     Determines the required extra prepayment amount (assumed equal at every interval)
@@ -99,81 +201,20 @@ def get_prepayment_amount(mortgage_details: dict):
       - Prepayment frequency (in months).
       - The start month for prepayments.
 
-    It then simulates the loan's amortization schedule with an extra payment X at the scheduled intervals,
-    and uses a binary search to compute the extra payment amount required to achieve a zero or near-zero balance
-    by the target payoff time.
+    The extra payment is then computed in closed form by solve_prepayment_amount.
 
     Returns:
       A tuple (extra_payment, prepayment_schedule), where extra_payment is the required extra payment per interval,
-      and prepayment_schedule is a dictionary mapping the scheduled month numbers to that extra payment amount.
+      and prepayment_schedule is a PrepaymentPlan mapping the scheduled month numbers to that extra payment amount.
     """
-    # Unpack mortgage details.
-    home_value = mortgage_details['home_value']
-    down_payment = mortgage_details['down_payment']
-    principal = home_value - down_payment
-    loan_term = mortgage_details['loan_term']
-    annual_interest_rate = mortgage_details['interest_rate']
-    monthly_rate = annual_interest_rate / 100 / 12
-    total_payments = loan_term * 12
-
-    # Calculate the standard monthly payment.
-    if monthly_rate != 0:
-        monthly_payment = principal * (monthly_rate * (1 + monthly_rate) ** total_payments) / (
-                (1 + monthly_rate) ** total_payments - 1)
-    else:
-        monthly_payment = principal / total_payments
-
     # Get desired payoff time and prepayment schedule parameters.
     desired_payoff_years = float(input("Enter the desired payoff time with prepayments (in years): "))
     target_months = int(desired_payoff_years * 12)
     frequency_months = int(input("Enter the frequency (in months) for prepayments (e.g., 12 for yearly): "))
     start_month = int(input("Enter the month number when prepayments should begin (e.g., 1 for the first month): "))
 
-    def simulate_with_extra(X: float) -> float:
-        """
-        Simulate the amortization schedule applying an extra payment X at the scheduled intervals,
-        and return the final balance after target_months.
-        """
-        balance = principal
-        month = 1
-        while month <= target_months and balance > 0:
-            # If this is a prepayment month, apply the extra payment.
-            if month >= start_month and ((month - start_month) % frequency_months == 0):
-                balance -= X
-                if balance <= 0:
-                    return balance
-            interest_payment = balance * monthly_rate
-            principal_payment = monthly_payment - interest_payment
-            if principal_payment > balance:
-                principal_payment = balance
-            balance -= principal_payment
-            month += 1
-        return balance
-
-    # Use binary search to determine the required extra payment X.
-    low = 0.0
-    high = principal  # Upper bound for extra payment.
-    tolerance = 1e-2  # Acceptable tolerance in dollars.
-    extra_payment = 0.0
-
-    while low <= high:
-        mid = (low + high) / 2
-        final_balance = simulate_with_extra(mid)
-        if abs(final_balance) < tolerance:
-            extra_payment = mid
-            break
-        elif final_balance > 0:
-            # Loan is not paid off; need a higher extra payment.
-            low = mid + tolerance
-        else:
-            high = mid - tolerance
-
-    # Build the prepayment schedule using the computed extra payment.
-    num_intervals = ((target_months - start_month) // frequency_months) + 1 if target_months >= start_month else 0
-    prepayment_schedule = {}
-    for i in range(num_intervals):
-        month = start_month + i * frequency_months
-        prepayment_schedule[month] = extra_payment
+    extra_payment, prepayment_schedule = solve_prepayment_amount(
+        mortgage_details, target_months, frequency_months, start_month)
 
     print(
         f"\nTo pay off the loan in {desired_payoff_years} years, you need to prepay ${extra_payment:,.2f} every {frequency_months} month(s) starting at month {start_month}.")
@@ -0,0 +1,108 @@
+# src/mortgage/rates.py
+
+import hashlib
+import json
+
+
+class RateSchedule:
+    """
+    Changes to a loan's interest rate over its life: adjustable-rate resets, temporary
+    buydowns, and recasts that re-amortize the payment at the current rate (typically right
+    after a large prepayment).
+
+    `changes` maps the month a new annual rate (in percent, like interest_rate) takes effect
+    to that rate; `recasts` lists months where only the payment is recomputed. At every change
+    or recast the balance left after that month's extra payment is re-amortized over the
+    remaining term, and the new payment applies from that month on.
+    """
+
+    def __init__(self, changes: dict = None, recasts=()):
+        self.changes = {int(month): float(rate) for month, rate in (changes or {}).items()}
+        self.recasts = sorted({int(month) for month in recasts})
+
+    def __bool__(self) -> bool:
+        return bool(self.changes or self.recasts)
+
+    def __repr__(self) -> str:
+        return f"RateSchedule(changes={self.changes}, recasts={self.recasts})"
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, RateSchedule):
+            return NotImplemented
+        return self.to_json() == other.to_json()
+
+    def rate_at(self, month: int, initial_rate: float) -> float:
+        """Annual rate in effect in `month`."""
+        rate = initial_rate
+        for change_month in sorted(self.changes):
+            if change_month > month:
+                break
+            rate = self.changes[change_month]
+        return rate
+
+    def resets(self, initial_rate: float) -> list:
+        """
+        Months at which the payment is re-amortized, in order, with the annual rate in effect
+        from that month, as (month, annual_rate) pairs.
+        """
+        rate = initial_rate
+        resets = []
+        for month in sorted(set(self.changes) | set(self.recasts)):
+            rate = self.changes.get(month, rate)
+            resets.append((month, rate))
+        return resets
+
+    def monthly_resets(self, initial_rate: float) -> list:
+        """resets() with monthly rates as fractions, as used by MortgageCalculator.monthly_rate."""
+        return [(month, rate / 100 / 12) for month, rate in self.resets(initial_rate)]
+
+    def cache_key(self) -> str:
+        """Stable digest of the schedule, used by the schedule cache."""
+        if not self:
+            return ""
+        return hashlib.blake2b(json.dumps(self.to_json()).encode(), digest_size=16).hexdigest()
+
+    def to_json(self) -> dict:
+        return {
+            "changes": {str(month): rate for month, rate in sorted(self.changes.items())},
+            "recasts": self.recasts,
+        }
+
+    @classmethod
+    def from_json(cls, data: dict):
+        return cls(data.get("changes"), data.get("recasts", ()))
+
+    @classmethod
+    def arm(cls, initial_rate: float, indexed_rates, fixed_period_months: int = 60, reset_interval_months: int = 12,
+            initial_cap: float = None, periodic_cap: float = 2.0, lifetime_cap: float = 5.0, floor: float = None,
+            total_payments: int = 360):
+        """
+        Resets of an adjustable-rate loan, e.g., a 5/1 ARM with the defaults.
+
+        indexed_rates holds the fully indexed rate (index + margin) projected for each reset,
+        or a single rate used for every reset; each is limited by the first-adjustment cap
+        (initial_cap, defaulting to periodic_cap), the periodic cap, the lifetime cap above
+        initial_rate and the floor (defaulting to no lower bound).
+        """
+        months = range(fixed_period_months + 1, total_payments + 1, reset_interval_months)
+        if isinstance(indexed_rates, (int, float)):
+            indexed_rates = [indexed_rates] * len(months)
+        changes = {}
+        rate = initial_rate
+        for number, (month, indexed) in enumerate(zip(months, indexed_rates)):
+            cap = periodic_cap if number or initial_cap is None else initial_cap
+            new_rate = min(max(indexed, rate - cap), rate + cap, initial_rate + lifetime_cap)
+            if floor is not None:
+                new_rate = max(new_rate, floor)
+            changes[month] = rate = new_rate
+        return cls(changes)
+
+    @classmethod
+    def buydown(cls, note_rate: float, steps=(2.0, 1.0)):
+        """
+        A temporary buydown: the rate is note_rate minus steps[0] in year 1, minus steps[1] in
+        year 2, and so on (a 2-1 buydown with the defaults), then note_rate.
+        """
+        changes = {1 + 12 * year: note_rate - step for year, step in enumerate(steps)}
+        changes[1 + 12 * len(steps)] = note_rate
+        return cls(changes)
@@ -0,0 +1,211 @@
+# src/mortgage/schedule.py
+
+from array import array
+from collections.abc import Sequence
+
+# Per-month fields of an amortization schedule, in display order.
+SCHEDULE_FIELDS = ("month", "payment", "principal_payment", "interest_payment", "extra_payment", "balance")
+
+# Balances below half a cent are floating-point residue and count as paid off.
+PAID_OFF_TOLERANCE = 0.005
+
+
+class ScheduleRow:
+    """
+    A single month of an amortization schedule.
+
+    Fields are available as attributes and, for code written against the old
+    list-of-dicts schedules, by key (row["balance"]).
+    """
+    __slots__ = SCHEDULE_FIELDS
+
+    def __init__(self, month: int, payment: float, principal_payment: float, interest_payment: float,
+                 extra_payment: float, balance: float):
+        self.month = month
+        self.payment = payment
+        self.principal_payment = principal_payment
+        self.interest_payment = interest_payment
+        self.extra_payment = extra_payment
+        self.balance = balance
+
+    def __getitem__(self, key: str):
+        if key not in SCHEDULE_FIELDS:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def keys(self) -> tuple:
+        return SCHEDULE_FIELDS
+
+    def as_dict(self) -> dict:
+        return {field: getattr(self, field) for field in SCHEDULE_FIELDS}
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, ScheduleRow):
+            other = other.as_dict()
+        return self.as_dict() == other
+
+    def __repr__(self) -> str:
+        return f"ScheduleRow({self.as_dict()})"
+
+
+class AmortizationSchedule(Sequence):
+    """
+    An amortization schedule stored as one contiguous column per field.
+
+    The month column is an array('i') and every money column an array('d'), which takes
+    44 bytes per month instead of a six-key dict with six boxed floats. Indexing returns a
+    ScheduleRow built on demand, so existing callers can keep iterating rows.
+    """
+    __slots__ = SCHEDULE_FIELDS
+
+    def __init__(self):
+        self.month = array('i')
+        self.payment = array('d')
+        self.principal_payment = array('d')
+        self.interest_payment = array('d')
+        self.extra_payment = array('d')
+        self.balance = array('d')
+
+    @classmethod
+    def from_columns(cls, month, payment, principal_payment, interest_payment, extra_payment, balance):
+        """Build a schedule from any iterables of column values (lists, arrays, NumPy arrays)."""
+        schedule = cls()
+        schedule.month.extend(int(value) for value in month)
+        schedule.payment.extend(payment)
+        schedule.principal_payment.extend(principal_payment)
+        schedule.interest_payment.extend(interest_payment)
+        schedule.extra_payment.extend(extra_payment)
+        schedule.balance.extend(balance)
+        return schedule
+
+    def copy(self) -> "AmortizationSchedule":
+        """An independent copy of the schedule (each column is copied in one block)."""
+        schedule = type(self).__new__(type(self))
+        for field in SCHEDULE_FIELDS:
+            setattr(schedule, field, getattr(self, field)[:])
+        return schedule
+
+    def append(self, month: int, payment: float, principal_payment: float, interest_payment: float,
+               extra_payment: float, balance: float):
+        self.month.append(month)
+        self.payment.append(payment)
+        self.principal_payment.append(principal_payment)
+        self.interest_payment.append(interest_payment)
+        self.extra_payment.append(extra_payment)
+        self.balance.append(balance)
+
+    def extend(self, rows):
+        """Append rows given as (month, payment, principal, interest, extra, balance) tuples."""
+        append_month, append_payment = self.month.append, self.payment.append
+        append_principal, append_interest = self.principal_payment.append, self.interest_payment.append
+        append_extra, append_balance = self.extra_payment.append, self.balance.append
+        for month, payment, principal_payment, interest_payment, extra_payment, balance in rows:
+            append_month(month)
+            append_payment(payment)
+            append_principal(principal_payment)
+            append_interest(interest_payment)
+            append_extra(extra_payment)
+            append_balance(balance)
+
+    def truncate(self, length: int):
+        """Drop every row after the first `length` rows."""
+        for column in self.columns():
+            del column[length:]
+
+    def __len__(self) -> int:
+        return len(self.month)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return AmortizationSchedule.from_columns(*(getattr(self, field)[index] for field in SCHEDULE_FIELDS))
+        return ScheduleRow(*(getattr(self, field)[index] for field in SCHEDULE_FIELDS))
+
+    def __iter__(self):
+        for values in zip(*self.columns()):
+            yield ScheduleRow(*values)
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, AmortizationSchedule):
+            return all(getattr(self, field) == getattr(other, field) for field in SCHEDULE_FIELDS)
+        return NotImplemented
+
+    def columns(self) -> tuple:
+        """Return the columns in SCHEDULE_FIELDS order."""
+        return tuple(getattr(self, field) for field in SCHEDULE_FIELDS)
+
+    def to_dicts(self) -> list:
+        """Return the schedule in the old list-of-dicts form."""
+        return [dict(zip(SCHEDULE_FIELDS, values)) for values in zip(*self.columns())]
+
+    def to_numpy(self) -> dict:
+        """Return zero-copy NumPy views of the columns, keyed by field name."""
+        import numpy as np
+
+        return {field: np.frombuffer(getattr(self, field), dtype=getattr(self, field).typecode)
+                for field in SCHEDULE_FIELDS}
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes used by the column data."""
+        return sum(column.itemsize * len(column) for column in self.columns())
+
+    @property
+    def final_month(self) -> int:
+        return self.month[-1] if self.month else 0
+
+    def total_interest(self) -> float:
+        return sum(self.interest_payment)
+
+
+class ScheduleSummary:
+    """
+    Streaming aggregate of an amortization schedule.
+
+    Rows are folded in one at a time, so totals, the payoff month and the balance at a
+    horizon can be computed without ever holding the schedule in memory.
+    """
+    __slots__ = ("final_month", "total_payment", "total_principal", "total_interest", "total_extra", "balance")
+
+    def __init__(self):
+        self.final_month = 0
+        self.total_payment = 0.0
+        self.total_principal = 0.0
+        self.total_interest = 0.0
+        self.total_extra = 0.0
+        self.balance = None
+
+    def update(self, rows, horizon: int = None):
+        """
+        Fold (month, payment, principal, interest, extra, balance) tuples into the summary,
+        stopping after month `horizon` if one is given.
+        """
+        for month, payment, principal_payment, interest_payment, extra_payment, balance in rows:
+            self.total_payment += payment
+            self.total_principal += principal_payment
+            self.total_interest += interest_payment
+            self.total_extra += extra_payment
+            self.final_month = month
+            self.balance = balance
+            if horizon is not None and month >= horizon:
+                break
+        return self
+
+    @property
+    def payoff_month(self):
+        """Month in which the loan was paid off, or None if it was not paid off (yet)."""
+        if self.balance is not None and self.balance < PAID_OFF_TOLERANCE:
+            return self.final_month
+        return None
+
+    @property
+    def principal_repaid(self) -> float:
+        """Cumulative principal repaid, including extra payments."""
+        return self.total_principal + self.total_extra
+
+
+def payoff_time(final_month: int) -> str:
+    """A payoff month as printed in summaries, e.g. "29 year(s) and 4 month(s)" or "7 month(s)"."""
+    if final_month < 12:
+        return f"{final_month} month(s)"
+    years, months = divmod(final_month, 12)
+    return f"{years} year(s) and {months} month(s)" if months else f"{years} year(s)"
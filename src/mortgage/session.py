@@ -0,0 +1,275 @@
+# src/mortgage/session.py
+"""
+Interactive session model: a loan's inputs, its prepayment plan and everything derived
+from them, kept as a dependency graph that is evaluated lazily.
+
+Each derived value (the principal, the monthly payment, the schedule, the summaries, ...)
+is a node that is computed the first time it is read and then kept until one of its inputs
+changes. Changing an input invalidates only the nodes downstream of it: a new interest
+rate invalidates the rate, the payment and what depends on them, while the principal,
+the term and the normalized plan stay valid; an edited plan leaves the payment and the
+no-prepayment summary alone, and its schedule is updated by mortgage.incremental from the
+earliest changed month instead of being recomputed from month 1.
+
+    session = LoanSession(500000, 100000, 30, 6.375, {37: 20000})
+    session.savings                  # evaluates savings and the nodes it depends on
+    session.interest_rate = 5.875    # invalidates monthly_rate, monthly_payment, calculator,
+                                     # base_summary, savings, schedule and summary
+    session.apply("extra 120 5000")  # invalidates plan, schedule, summary and savings; the
+                                     # schedule is re-simulated from month 120 when next read
+"""
+
+import math
+from functools import partial
+
+from mortgage.annuity import monthly_payment as amortized_payment
+from mortgage.cache import plan_key
+from mortgage.calculator import MortgageCalculator
+from mortgage.incremental import IncrementalSchedule
+from mortgage.schedule import ScheduleSummary
+
+INPUTS = ("home_value", "down_payment", "loan_term", "interest_rate", "prepayments")
+
+# Short names accepted by apply(), for a REPL or prompt loop.
+COMMAND_INPUTS = {"home": "home_value", "down": "down_payment", "term": "loan_term", "rate": "interest_rate"}
+
+
+class _Node:
+    __slots__ = ("name", "compute", "inputs", "dependents", "value", "valid")
+
+    def __init__(self, name: str, compute=None, inputs: tuple = ()):
+        self.name = name
+        self.compute = compute
+        self.inputs = inputs
+        self.dependents = []
+        self.value = None
+        # Inputs are always valid; derived nodes start out unevaluated.
+        self.valid = compute is None
+
+
+class LoanSession:
+    """
+    A loan, its prepayment plan and their derived values as a lazily evaluated graph.
+
+    Inputs (INPUTS) and derived values are read as attributes; inputs are changed by
+    assigning them or with set(). `evaluations` counts how often each derived node has
+    been computed. cache is the ScheduleCache of the session's calculators (by default
+    MortgageCalculator's shared cache).
+    """
+
+    def __init__(self, home_value: float, down_payment: float, loan_term: int, interest_rate: float,
+                 prepayments=None, cache=None):
+        object.__setattr__(self, "_nodes", {})
+        self.cache = cache
+        self.evaluations = {}
+        self._incremental = None
+        inputs = dict(zip(INPUTS, (home_value, down_payment, loan_term, interest_rate, prepayments)))
+        self._check_inputs(inputs)
+        for name, value in inputs.items():
+            self._nodes[name] = _Node(name)
+            self._nodes[name].value = value
+
+        self._define("principal", self._principal, "home_value", "down_payment")
+        self._define("total_payments", self._total_payments, "loan_term")
+        self._define("monthly_rate", self._monthly_rate, "interest_rate")
+        self._define("monthly_payment", amortized_payment, "principal", "monthly_rate", "total_payments")
+        self._define("plan", self._plan, "prepayments", "total_payments")
+        self._define("calculator", self._calculator, "home_value", "down_payment", "loan_term", "interest_rate")
+        self._define("base_summary", self._base_summary, "calculator")
+        self._define("schedule", self._schedule, "calculator", "plan")
+        self._define("summary", self._summary, "schedule")
+        self._define("savings", self._savings, "base_summary", "summary")
+
+    def _define(self, name: str, compute, *inputs):
+        node = _Node(name, compute, inputs)
+        for input_name in inputs:
+            self._nodes[input_name].dependents.append(node)
+        self._nodes[name] = node
+
+    # Node computations.
+
+    @staticmethod
+    def _principal(home_value, down_payment):
+        return home_value - down_payment
+
+    @staticmethod
+    def _total_payments(loan_term):
+        return loan_term * 12
+
+    @staticmethod
+    def _monthly_rate(interest_rate):
+        return interest_rate / 100 / 12
+
+    @staticmethod
+    def _plan(prepayments, total_payments) -> dict:
+        """The plan as a {month: amount} dict of the nonzero prepayments within the term."""
+        if not prepayments:
+            return {}
+        if hasattr(prepayments, "to_dict"):
+            prepayments = prepayments.to_dict()
+        return {int(month): amount for month, amount in prepayments.items()
+                if amount and int(month) <= total_payments}
+
+    def _calculator(self, home_value, down_payment, loan_term, interest_rate) -> MortgageCalculator:
+        return MortgageCalculator(home_value, down_payment, loan_term, interest_rate, cache=self.cache)
+
+    @staticmethod
+    def _base_summary(calculator):
+        return calculator.summarize()
+
+    def _schedule(self, calculator, plan):
+        # The schedule is updated in place: a plan edit on the same loan resumes from the
+        # earliest changed month, and a new loan starts over.
+        incremental = self._incremental
+        if incremental is None or incremental.calculator is not calculator:
+            self._incremental = IncrementalSchedule(calculator, plan)
+        else:
+            changes = {month: amount for month, amount in plan.items() if incremental.prepayments.get(month) != amount}
+            changes.update((month, 0) for month in incremental.prepayments if month not in plan)
+            incremental.update(changes)
+        return self._incremental.schedule
+
+    @staticmethod
+    def _summary(schedule):
+        return ScheduleSummary().update(zip(*schedule.columns()))
+
+    @staticmethod
+    def _savings(base_summary, summary) -> dict:
+        return {"months_saved": base_summary.final_month - summary.final_month,
+                "interest_saved": base_summary.total_interest - summary.total_interest}
+
+    # Graph access.
+
+    def __getattr__(self, name):
+        nodes = self.__dict__.get("_nodes")
+        if nodes is None or name not in nodes:
+            raise AttributeError(f"{type(self).__name__!r} object has no attribute {name!r}")
+        return self.get(name)
+
+    def __setattr__(self, name, value):
+        if name in INPUTS:
+            self.set(**{name: value})
+        elif name in self._nodes:
+            raise AttributeError(f"{name} is derived from the session's inputs and cannot be set.")
+        else:
+            object.__setattr__(self, name, value)
+
+    def get(self, name: str):
+        """The value of a node, computing it and any stale nodes it depends on first."""
+        node = self._nodes[name]
+        if not node.valid:
+            node.value = node.compute(*(self.get(input_name) for input_name in node.inputs))
+            node.valid = True
+            self.evaluations[name] = self.evaluations.get(name, 0) + 1
+        return node.value
+
+    def set(self, **changes) -> list:
+        """
+        Change inputs; returns the names of the nodes invalidated by the change. Raises
+        ValueError, leaving every input unchanged, if the loan could not be amortized with
+        the new inputs.
+        """
+        for name in changes:
+            if name not in INPUTS:
+                raise ValueError(f"Unknown input {name!r}; use one of {', '.join(INPUTS)}.")
+        self._check_inputs({name: changes.get(name, self._nodes[name].value) for name in INPUTS})
+        invalidated = []
+        for name, value in changes.items():
+            node = self._nodes[name]
+            if self._same(name, node.value, value):
+                continue
+            node.value = value
+            self._invalidate(node, invalidated)
+        return invalidated
+
+    @staticmethod
+    def _check_inputs(inputs: dict):
+        numbers = [inputs[name] for name in ("home_value", "down_payment", "interest_rate")]
+        if not all(math.isfinite(value) for value in numbers):
+            raise ValueError("The home value, down payment and interest rate must be finite numbers.")
+        if inputs["home_value"] - inputs["down_payment"] < 0:
+            raise ValueError("The down payment cannot exceed the home value.")
+        if inputs["loan_term"] < 1:
+            raise ValueError("The loan term must be at least 1 year.")
+        if inputs["interest_rate"] <= -1200:
+            raise ValueError("The interest rate must be greater than -1200%.")
+        prepayments = inputs["prepayments"]
+        if isinstance(prepayments, dict):
+            for month, amount in prepayments.items():
+                if int(month) < 1 or not math.isfinite(amount) or amount < 0:
+                    raise ValueError(f"Invalid prepayment of {amount} in month {month}; months start at 1 "
+                                     f"and amounts cannot be negative.")
+
+    @staticmethod
+    def _same(name: str, old, new) -> bool:
+        if name == "prepayments" and not (isinstance(old, dict) and isinstance(new, dict)):
+            # Compare other plan forms (PrepaymentPlan, None) by their cache digests.
+            return plan_key(old) == plan_key(new)
+        return old == new
+
+    def _invalidate(self, node: _Node, invalidated: list):
+        for dependent in node.dependents:
+            # A node that is already stale has no valid dependents either.
+            if dependent.valid:
+                dependent.valid = False
+                invalidated.append(dependent.name)
+                self._invalidate(dependent, invalidated)
+
+    def stale(self) -> list:
+        """Names of the derived nodes that will be recomputed when next read."""
+        return [name for name, node in self._nodes.items() if not node.valid]
+
+    @property
+    def recomputed_months(self) -> int:
+        """Months simulated by the last schedule update."""
+        return self._incremental.recomputed_months if self._incremental is not None else 0
+
+    def set_prepayment(self, month: int, amount: float) -> list:
+        """Set one month's prepayment (0 removes it), keeping the rest of the plan."""
+        if not 1 <= month <= self.total_payments:
+            raise ValueError(f"Month {month} is outside the loan's {self.total_payments} months.")
+        if not math.isfinite(amount) or amount < 0:
+            raise ValueError(f"Invalid prepayment amount {amount}; it cannot be negative.")
+        plan = dict(self.plan)
+        if amount:
+            plan[month] = amount
+        else:
+            plan.pop(month, None)
+        return self.set(prepayments=plan)
+
+    def apply(self, command: str) -> list:
+        """
+        Apply a change written as "rate 5.5", "term 15", "home 550000", "down 120000" or
+        "extra MONTH AMOUNT"; returns the invalidated nodes. Raises ValueError for anything
+        else and for changes the loan cannot take (see set()).
+        """
+        words = command.split()
+        change = None
+        try:
+            if len(words) == 3 and words[0] == "extra":
+                change = partial(self.set_prepayment, int(words[1]), float(words[2]))
+            elif len(words) == 2 and words[0] in COMMAND_INPUTS:
+                name = COMMAND_INPUTS[words[0]]
+                change = partial(self.set, **{name: int(words[1]) if name == "loan_term" else float(words[1])})
+        except ValueError:
+            pass
+        if change is not None:
+            # Applied outside the try, so that a rejected value keeps its own message.
+            return change()
+        raise ValueError(f"Unrecognized change {command!r}; try 'rate 5.5', 'term 15', 'home 550000', "
+                         f"'down 120000' or 'extra 24 10000'.")
+
+    def __repr__(self) -> str:
+        inputs = ", ".join(f"{name}={self._nodes[name].value!r}" for name in INPUTS[:-1])
+        return f"LoanSession({inputs}, prepayments={len(self.plan)} months, stale={self.stale()})"
+
+    # Reports of the interactive flow.
+
+    def print_summary(self):
+        self.calculator.print_summary()
+
+    def print_schedule(self):
+        self.calculator.print_schedule(self.plan, schedule=self.schedule)
+
+    def print_updated_summary(self):
+        self.calculator.print_updated_summary(self.plan, summary=self.summary)
@@ -0,0 +1,277 @@
+# src/mortgage/sweep.py
+"""
+Scenario sweeps over grids of loan parameters.
+
+A grid spec maps each axis to a list of values or to an inclusive {"start", "stop", "step"}
+range, e.g.:
+
+    {
+        "home_value": [500000],
+        "down_payment": [100000],
+        "interest_rate": {"start": 5.0, "stop": 8.0, "step": 0.125},
+        "loan_term": [10, 15, 30],
+        "prepayment": {"start": 0, "stop": 5000, "step": 250},
+        "prepayment_frequency_months": [1],
+        "prepayment_start_month": [1]
+    }
+
+Every combination of axis values is a scenario, numbered in row-major order of GRID_AXES.
+Scenarios are split into chunks that worker processes evaluate and write to their own
+part file (part-00000.csv, ...) in the output directory. A part file only appears once its
+chunk is complete, so an interrupted sweep resumes by skipping the chunks already written.
+The directory's manifest.json records the spec, chunk size and format that produced the
+parts, and a sweep refuses to resume into a directory written with different ones.
+
+Usage: python -m mortgage.sweep spec.json output_dir [--workers N] [--chunk-size N] [--format csv|parquet]
+"""
+
+import argparse
+import csv
+import glob
+import hashlib
+import json
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+from mortgage.calculator import MortgageCalculator
+from mortgage.cache import ScheduleCache
+from mortgage.plan import PrepaymentPlan, PrepaymentRule
+
+GRID_AXES = ("home_value", "down_payment", "interest_rate", "loan_term", "prepayment",
+             "prepayment_frequency_months", "prepayment_start_month")
+
+# Axes that may be left out of a spec, and their default values.
+AXIS_DEFAULTS = {"prepayment": [0.0], "prepayment_frequency_months": [1], "prepayment_start_month": [1]}
+
+RESULT_FIELDS = ("scenario",) + GRID_AXES + ("monthly_payment", "payoff_month", "total_interest",
+                                              "interest_percent_principal", "interest_percent_home_value")
+
+
+def axis_values(value) -> list:
+    """Expand an axis given as a list, a single value or an inclusive start/stop/step range."""
+    if isinstance(value, dict):
+        start, stop, step = value["start"], value["stop"], value["step"]
+        count = int(round((stop - start) / step)) + 1
+        # Round to avoid accumulating float error across many steps (e.g., 1/8% rate steps).
+        return [round(start + i * step, 10) for i in range(count)]
+    if isinstance(value, (list, tuple)):
+        return list(value)
+    return [value]
+
+
+class ScenarioGrid:
+    """The cartesian product of a grid spec's axes, addressable by scenario number."""
+
+    def __init__(self, spec: dict):
+        missing = [axis for axis in GRID_AXES if axis not in spec and axis not in AXIS_DEFAULTS]
+        if missing:
+            raise ValueError(f"Grid spec is missing axes: {', '.join(missing)}")
+        self.spec = spec
+        self.axes = [axis_values(spec.get(axis, AXIS_DEFAULTS.get(axis))) for axis in GRID_AXES]
+
+    def __len__(self) -> int:
+        size = 1
+        for values in self.axes:
+            size *= len(values)
+        return size
+
+    def scenario(self, index: int) -> dict:
+        """Return the axis values of scenario `index` (mixed-radix decoding of the index)."""
+        values = {}
+        for axis, axis_list in zip(reversed(GRID_AXES), reversed(self.axes)):
+            index, position = divmod(index, len(axis_list))
+            values[axis] = axis_list[position]
+        return {axis: values[axis] for axis in GRID_AXES}
+
+    def chunks(self, chunk_size: int) -> list:
+        """Return (chunk_id, start, stop) scenario ranges."""
+        return [(chunk_id, start, min(start + chunk_size, len(self)))
+                for chunk_id, start in enumerate(range(0, len(self), chunk_size))]
+
+
+def evaluate_scenario(scenario: dict) -> dict:
+    """
+    Compute the figures reported by MortgageCalculator.print_updated_summary for one scenario,
+    using the closed-form loan queries rather than a month-by-month simulation.
+    """
+    # Sweeps never repeat a scenario, so a disabled cache avoids filling the shared one.
+    calculator = MortgageCalculator(scenario["home_value"], scenario["down_payment"], scenario["loan_term"],
+                                    scenario["interest_rate"], cache=ScheduleCache(maxsize=0))
+    plan = PrepaymentPlan(horizon=calculator.total_payments)
+    if scenario["prepayment"]:
+        plan.rules.append(PrepaymentRule(scenario["prepayment_start_month"], scenario["prepayment_frequency_months"],
+                                         None, scenario["prepayment"]))
+    loan = calculator.closed_form(plan)
+    total_interest = loan.cumulative_interest()
+    return dict(
+        scenario,
+        monthly_payment=calculator.monthly_payment,
+        payoff_month=loan.payoff_month,
+        total_interest=total_interest,
+        interest_percent_principal=(total_interest / calculator.principal) * 100,
+        interest_percent_home_value=(total_interest / calculator.home_value) * 100,
+    )
+
+
+MANIFEST = "manifest.json"
+
+FILE_FORMATS = ("csv", "parquet")
+
+
+def sweep_manifest(spec: dict, chunk_size: int, file_format: str) -> dict:
+    """What a sweep's part files depend on: a digest of the spec, the chunk size and the format."""
+    digest = hashlib.sha256(json.dumps(spec, sort_keys=True).encode()).hexdigest()
+    return {"spec_sha256": digest, "chunk_size": chunk_size, "format": file_format}
+
+
+def _check_manifest(output_dir: str, manifest: dict):
+    """Write the manifest of a new sweep, or make sure a resumed one matches it."""
+    path = os.path.join(output_dir, MANIFEST)
+    if os.path.exists(path):
+        with open(path, "r") as f:
+            existing = json.load(f)
+        if existing != manifest:
+            changed = ", ".join(key for key in manifest if existing.get(key) != manifest[key])
+            raise ValueError(f"{output_dir} holds a sweep with a different {changed}; "
+                             f"use a new output directory to run this one.")
+        return
+    if glob.glob(os.path.join(output_dir, "part-*")):
+        raise ValueError(f"{output_dir} holds part files without a {MANIFEST}; "
+                         f"use a new output directory to run this sweep.")
+    temp_path = path + ".tmp"
+    with open(temp_path, "w") as f:
+        json.dump(manifest, f)
+    os.replace(temp_path, path)
+
+
+def _part_path(output_dir: str, chunk_id: int, file_format: str) -> str:
+    return os.path.join(output_dir, f"part-{chunk_id:05d}.{file_format}")
+
+
+def _write_part(rows: list, path: str, file_format: str):
+    # Write under a temporary name and rename, so a part file only exists once complete.
+    temp_path = path + ".tmp"
+    if file_format == "parquet":
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        table = pa.Table.from_pylist(rows)
+        pq.write_table(table, temp_path)
+    else:
+        with open(temp_path, "w", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=RESULT_FIELDS)
+            writer.writeheader()
+            writer.writerows(rows)
+    os.replace(temp_path, path)
+
+
+def run_chunk(spec: dict, chunk_id: int, start: int, stop: int, output_dir: str, file_format: str = "csv") -> int:
+    """Evaluate scenarios start..stop-1 and write them to the chunk's part file."""
+    grid = ScenarioGrid(spec)
+    rows = []
+    for index in range(start, stop):
+        row = evaluate_scenario(grid.scenario(index))
+        row["scenario"] = index
+        rows.append(row)
+    _write_part(rows, _part_path(output_dir, chunk_id, file_format), file_format)
+    return stop - start
+
+
+def run_sweep(spec: dict, output_dir: str, workers: int = None, chunk_size: int = 1000,
+              file_format: str = "csv", progress=None) -> dict:
+    """
+    Evaluate every scenario of the grid across a process pool, skipping chunks whose part
+    file already exists (resume). Resuming requires the same spec, chunk_size and
+    file_format as the run that wrote the directory (ValueError otherwise). progress, if
+    given, is called with (scenarios_done, total) as chunks complete. Returns counts of
+    scenarios computed and skipped and the throughput.
+    """
+    if file_format not in FILE_FORMATS:
+        raise ValueError("file_format must be 'csv' or 'parquet'.")
+    grid = ScenarioGrid(spec)
+    os.makedirs(output_dir, exist_ok=True)
+    _check_manifest(output_dir, sweep_manifest(spec, chunk_size, file_format))
+    chunks = grid.chunks(chunk_size)
+    pending = [chunk for chunk in chunks if not os.path.exists(_part_path(output_dir, chunk[0], file_format))]
+    skipped = sum(stop - start for _, start, stop in chunks) - sum(stop - start for _, start, stop in pending)
+
+    workers = workers or os.cpu_count() or 1
+    # Keep a bounded number of chunks in flight so huge grids do not queue every task up front.
+    max_in_flight = 2 * workers
+    started = time.perf_counter()
+    done = skipped
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        remaining = iter(pending)
+        in_flight = set()
+        while True:
+            for chunk_id, start, stop in remaining:
+                in_flight.add(executor.submit(run_chunk, spec, chunk_id, start, stop, output_dir, file_format))
+                if len(in_flight) >= max_in_flight:
+                    break
+            if not in_flight:
+                break
+            finished, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in finished:
+                done += future.result()
+                if progress is not None:
+                    progress(done, len(grid))
+
+    elapsed = time.perf_counter() - started
+    computed = done - skipped
+    return {
+        "scenarios": len(grid),
+        "computed": computed,
+        "skipped": skipped,
+        "seconds": elapsed,
+        "scenarios_per_second": computed / elapsed if elapsed else 0.0,
+    }
+
+
+def merge_parts(output_dir: str, filename: str):
+    """
+    Concatenate the part files of a sweep into a single file of the same format (CSV, or
+    Parquet with pyarrow), in scenario order.
+    """
+    with open(os.path.join(output_dir, MANIFEST), "r") as f:
+        file_format = json.load(f)["format"]
+    if os.path.splitext(filename)[1].lower() != f".{file_format}":
+        raise ValueError(f"The sweep's parts are {file_format}; merge them into a .{file_format} file.")
+    parts = sorted(glob.glob(os.path.join(output_dir, f"part-*.{file_format}")))
+    if file_format == "parquet":
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        pq.write_table(pa.concat_tables([pq.read_table(part) for part in parts]), filename)
+        return
+    with open(filename, "w", newline="") as out:
+        out.write(",".join(RESULT_FIELDS) + "\n")
+        for part in parts:
+            with open(part, "r", newline="") as f:
+                next(f)  # Skip the part's header.
+                for line in f:
+                    out.write(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run a mortgage scenario sweep over a parameter grid.")
+    parser.add_argument("spec", help="JSON file with the grid spec.")
+    parser.add_argument("output_dir", help="Directory for the part files (reused to resume a sweep).")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count).")
+    parser.add_argument("--chunk-size", type=int, default=1000, help="Scenarios per chunk.")
+    parser.add_argument("--format", choices=FILE_FORMATS, default="csv", help="Part file format.")
+    args = parser.parse_args()
+
+    with open(args.spec, "r") as f:
+        spec = json.load(f)
+
+    def report(done, total):
+        print(f"\r{done:,d} / {total:,d} scenarios", end="", flush=True)
+
+    stats = run_sweep(spec, args.output_dir, args.workers, args.chunk_size, args.format, progress=report)
+    print(f"\nComputed {stats['computed']:,d} scenarios ({stats['skipped']:,d} resumed) in "
+          f"{stats['seconds']:.2f}s ({stats['scenarios_per_second']:,.0f} scenarios/s).")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+# src/mortgage/whatif.py
+"""
+What-if comparison of many prepayment plans on one loan.
+
+compare_plans() evaluates every plan, plus the no-prepayment baseline, for one
+MortgageCalculator's loan and ranks them. With NumPy the plans are evaluated together by
+mortgage.batch.summarize_plans: the loan's payment, growth factors and no-prepayment
+balances are computed once and shared, and each plan is a few array operations over its
+months. Without NumPy, or for loans with a rate schedule, each plan is simulated in turn.
+
+Usage: python -m mortgage.whatif plans.json [--sort-by interest_saved] (run from src/; the
+loan comes from data/mortgage_details.json, and plans.json maps plan names to plans in the
+formats accepted by batch mode)
+"""
+
+import argparse
+import json
+
+from mortgage.plan import PrepaymentPlan
+
+try:
+    from mortgage.batch import summarize_plans
+except ImportError:  # NumPy is optional; plans are then simulated one at a time.
+    summarize_plans = None
+
+COMPARISON_FIELDS = ("rank", "plan", "payoff_month", "months_saved", "total_interest", "interest_saved",
+                     "total_extra", "efficiency")
+
+# Sort orders of the ranking: the key, and whether larger values rank first.
+SORT_KEYS = {
+    "interest_saved": ("interest_saved", True),
+    "total_interest": ("total_interest", False),
+    "payoff_month": ("payoff_month", False),
+    "efficiency": ("efficiency", True),
+    "total_extra": ("total_extra", False),
+}
+
+
+def _summaries(calculator, plans: list) -> list:
+    """(payoff month, total interest, total extra) of each plan."""
+    if summarize_plans is not None and not calculator.rate_schedule:
+        columns = summarize_plans(calculator.principal, calculator.monthly_rate, calculator.monthly_payment,
+                                  calculator.total_payments, plans)
+        return list(zip(*(column.tolist() for column in columns)))
+    summaries = [calculator.summarize(plan) for plan in plans]
+    return [(summary.final_month, summary.total_interest, summary.total_extra) for summary in summaries]
+
+
+def compare_plans(calculator, plans, sort_by: str = "interest_saved") -> list:
+    """
+    Evaluate prepayment plans ({name: plan}, or a list of plans named "Plan 1", ...; each
+    a PrepaymentPlan or {month: amount} dict) on the calculator's loan. Returns one dict of
+    COMPARISON_FIELDS per plan, ranked by sort_by (see SORT_KEYS):
+
+        payoff_month / months_saved       month of the final payment, and months saved
+        total_interest / interest_saved   interest paid, and saved against no prepayments
+        total_extra                       extra payments actually made (capped at the balance)
+        efficiency                        interest saved per dollar of extra payments
+    """
+    if sort_by not in SORT_KEYS:
+        raise ValueError(f"Unknown sort key {sort_by!r}; use one of {', '.join(SORT_KEYS)}.")
+    if not isinstance(plans, dict):
+        plans = {f"Plan {number}": plan for number, plan in enumerate(plans, 1)}
+    names = list(plans)
+    normalized = [plan if isinstance(plan, PrepaymentPlan) or not plan
+                  else PrepaymentPlan.from_dict(plan, horizon=calculator.total_payments)
+                  for plan in plans.values()]
+
+    # The baseline goes through the same engine, so that savings are not skewed by rounding.
+    (base_month, base_interest, _), *summaries = _summaries(calculator, [None] + normalized)
+    rows = []
+    for name, (payoff_month, total_interest, total_extra) in zip(names, summaries):
+        interest_saved = base_interest - total_interest
+        rows.append({
+            "plan": name,
+            "payoff_month": payoff_month,
+            "months_saved": base_month - payoff_month,
+            "total_interest": total_interest,
+            "interest_saved": interest_saved,
+            "total_extra": total_extra,
+            "efficiency": interest_saved / total_extra if total_extra else 0.0,
+        })
+
+    key, descending = SORT_KEYS[sort_by]
+    rows.sort(key=lambda row: -row[key] if descending else row[key])
+    for rank, row in enumerate(rows, 1):
+        row["rank"] = rank
+    return [{field: row[field] for field in COMPARISON_FIELDS} for row in rows]
+
+
+def format_comparison(rows: list) -> str:
+    """The ranked comparison as a plain-text table."""
+    width = max([len("Plan")] + [len(row["plan"]) for row in rows])
+    lines = [f"{'Rank':>4}  {'Plan':<{width}}  {'Payoff':>8}  {'Saved':>6}  {'Total Interest':>16}  "
+             f"{'Interest Saved':>16}  {'Extra Paid':>16}  {'Saved/$':>7}"]
+    for row in rows:
+        lines.append(f"{row['rank']:>4}  {row['plan']:<{width}}  {row['payoff_month']:>8}  "
+                     f"{row['months_saved']:>6}  {row['total_interest']:>16,.2f}  {row['interest_saved']:>16,.2f}  "
+                     f"{row['total_extra']:>16,.2f}  {row['efficiency']:>7.3f}")
+    return "\n".join(lines)
+
+
+def main():
+    from mortgage.calculator import MortgageCalculator
+    from utils.loan_files import parse_prepayment_plan
+    from utils.mortgage_details import get_mortgage_details
+
+    parser = argparse.ArgumentParser(description="Compare prepayment plans on the saved loan.")
+    parser.add_argument("plans", help="JSON file mapping plan names to plans.")
+    parser.add_argument("--sort-by", choices=tuple(SORT_KEYS), default="interest_saved")
+    args = parser.parse_args()
+
+    details = get_mortgage_details()
+    calculator = MortgageCalculator(details['home_value'], details['down_payment'], details['loan_term'],
+                                    details['interest_rate'])
+    with open(args.plans, "r") as f:
+        records = json.load(f)
+    # Each plan is a prepayment_details.json-style plan or a record with flat prepayment_* fields.
+    plans = {name: parse_prepayment_plan(record if "prepayment_amount" in record else {"prepayments": record},
+                                         calculator.total_payments)
+             for name, record in records.items()}
+    print(format_comparison(compare_plans(calculator, plans, args.sort_by)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,5 @@
+# src/service/__main__.py
+
+from service.server import main
+
+main()
@@ -0,0 +1,95 @@
+# src/service/batching.py
+
+import asyncio
+
+
+class Batcher:
+    """
+    Coalesce concurrent requests into batched calls.
+
+    submit() queues one item and waits for its result. The queue is flushed as one call to
+    `function(items) -> results` once max_batch items are waiting or max_delay seconds after
+    the first one arrived, in `executor` (e.g., a process pool) if one is given, so that many
+    small requests share one vectorized computation. If a batch of several items fails, its
+    items are retried one at a time, so that a bad item fails only its own request.
+
+    At most max_in_flight batches run at a time (normally one per worker process); requests
+    arriving meanwhile wait and go out together as soon as a batch finishes, so batches grow
+    with the load instead of the workers being kept busy with many tiny ones.
+    """
+
+    def __init__(self, function, max_batch: int = 256, max_delay: float = 0.002, executor=None,
+                 max_in_flight: int = 1):
+        self.function = function
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self.executor = executor
+        self.max_in_flight = max_in_flight
+        self.batches = 0
+        self.items = 0
+        self._pending = []
+        self._timer = None
+        self._in_flight = 0
+
+    async def submit(self, item):
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((item, future))
+        if len(self._pending) >= self.max_batch:
+            self._flush()
+        elif self._timer is None and self._in_flight < self.max_in_flight:
+            self._timer = loop.call_later(self.max_delay, self._flush)
+        return await future
+
+    def _flush(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        while self._pending and self._in_flight < self.max_in_flight:
+            pending, self._pending = self._pending[:self.max_batch], self._pending[self.max_batch:]
+            self._in_flight += 1
+            asyncio.ensure_future(self._run(pending))
+
+    async def _run(self, pending):
+        items = [item for item, _ in pending]
+        self.batches += 1
+        self.items += len(items)
+        try:
+            try:
+                results = await self._call(items)
+            except Exception as error:
+                if len(pending) == 1:
+                    self._settle(pending[0][1], error=error)
+                else:
+                    # Find the culprit(s): each item is computed on its own.
+                    for item, future in pending:
+                        await self._run_one(item, future)
+            else:
+                for (_, future), result in zip(pending, results):
+                    self._settle(future, result)
+        finally:
+            self._in_flight -= 1
+            # Whatever queued up while this batch ran goes out right away.
+            self._flush()
+
+    async def _call(self, items: list) -> list:
+        if self.executor is None:
+            return self.function(items)
+        return await asyncio.get_running_loop().run_in_executor(self.executor, self.function, items)
+
+    async def _run_one(self, item, future):
+        try:
+            result = (await self._call([item]))[0]
+        except Exception as error:
+            self._settle(future, error=error)
+        else:
+            self._settle(future, result)
+
+    @staticmethod
+    def _settle(future, result=None, error: Exception = None):
+        if future.done():
+            return
+        if error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result(result)
@@ -0,0 +1,117 @@
+# src/service/protocol.py
+"""
+Minimal HTTP/1.1 on asyncio streams: enough for a local JSON service (keep-alive,
+Content-Length bodies and chunked streaming responses) without third-party dependencies.
+"""
+
+import json
+from http import HTTPStatus
+from urllib.parse import parse_qsl, urlsplit
+
+MAX_BODY_BYTES = 1 << 20
+
+
+class HTTPError(Exception):
+    """An error reported to the client as a JSON {"error": message} response."""
+
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+class Request:
+    def __init__(self, method: str, target: str, version: str, headers: dict, body: bytes):
+        self.method = method
+        url = urlsplit(target)
+        self.path = url.path
+        self.query = dict(parse_qsl(url.query))
+        self.version = version
+        self.headers = headers
+        self.body = body
+
+    @property
+    def keep_alive(self) -> bool:
+        connection = self.headers.get("connection", "").lower()
+        if self.version == "HTTP/1.0":
+            return connection == "keep-alive"
+        return connection != "close"
+
+    def json(self) -> dict:
+        if not self.body:
+            return {}
+        try:
+            data = json.loads(self.body)
+        except ValueError as error:
+            raise HTTPError(400, f"Invalid JSON body: {error}")
+        if not isinstance(data, dict):
+            raise HTTPError(400, "The JSON body must be an object.")
+        return data
+
+
+async def read_request(reader):
+    """Read one request from the stream, or return None when the client has closed it."""
+    line = await reader.readline()
+    if not line.strip():
+        return None
+    try:
+        method, target, version = line.decode("latin-1").split()
+    except ValueError:
+        raise HTTPError(400, "Malformed request line.")
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+    try:
+        length = int(headers.get("content-length") or 0)
+    except ValueError:
+        raise HTTPError(400, "Malformed Content-Length.")
+    if length < 0:
+        raise HTTPError(400, "Malformed Content-Length.")
+    if length > MAX_BODY_BYTES:
+        raise HTTPError(413, "Request body too large.")
+    body = await reader.readexactly(length) if length else b""
+    return Request(method, target, version, headers, body)
+
+
+def _head(status: int, headers: dict) -> bytes:
+    lines = [f"HTTP/1.1 {status} {HTTPStatus(status).phrase}"]
+    lines.extend(f"{name}: {value}" for name, value in headers.items())
+    return ("\r\n".join(lines) + "\r\n\r\n").encode("latin-1")
+
+
+def write_json(writer, status: int, data, keep_alive: bool = True):
+    write_body(writer, status, json.dumps(data).encode(), "application/json", keep_alive)
+
+
+def write_body(writer, status: int, body: bytes, content_type: str, keep_alive: bool = True):
+    writer.write(_head(status, {
+        "Content-Type": content_type,
+        "Content-Length": len(body),
+        "Connection": "keep-alive" if keep_alive else "close",
+    }) + body)
+
+
+class ChunkedResponse:
+    """A response streamed with chunked transfer encoding; call write() per chunk, then end()."""
+
+    def __init__(self, writer, status: int, content_type: str, keep_alive: bool = True):
+        self._writer = writer
+        writer.write(_head(status, {
+            "Content-Type": content_type,
+            "Transfer-Encoding": "chunked",
+            "Connection": "keep-alive" if keep_alive else "close",
+        }))
+
+    async def write(self, data: bytes):
+        if data:
+            self._writer.write(b"%x\r\n%s\r\n" % (len(data), data))
+            # Wait for the client to keep up, so a slow reader does not buffer the whole schedule.
+            await self._writer.drain()
+
+    async def end(self):
+        self._writer.write(b"0\r\n\r\n")
+        await self._writer.drain()
@@ -0,0 +1,280 @@
+# src/service/server.py
+"""
+Local HTTP/JSON pricing service around MortgageCalculator.
+
+Endpoints (POST, with a JSON loan as in data/mortgage_details.json plus optional prepayments
+in the formats accepted by batch mode):
+
+    /payment         monthly payment and principal
+    /summary         payoff month and total interest, as in the updated summary
+    /schedule        full amortization schedule, streamed in chunks (?format=jsonl|csv)
+    /target-payoff   extra payment needed to pay the loan off in target_months
+    /health          (GET) liveness and batching counters
+    /metrics         (GET) instrumentation counters and timings, in the Prometheus text
+                     format (?format=json for JSON); collected with --metrics
+
+Concurrent payment and summary requests are coalesced into batched calls; summaries and
+schedules are computed in a process pool so the event loop stays responsive. Metrics cover
+the work done in the service's own process, i.e. everything when --workers 0 is given.
+
+Usage: python -m service [--host 127.0.0.1] [--port 8080] [--workers N] [--metrics]
+"""
+
+import argparse
+import asyncio
+import multiprocessing
+import os
+import signal
+from concurrent.futures import ProcessPoolExecutor
+
+from mortgage import annuity
+from mortgage.cache import ScheduleCache
+from mortgage.calculator import MortgageCalculator
+from mortgage.instrumentation import METRICS
+from mortgage.prepayment import solve_prepayment_amount
+from mortgage.schedule import SCHEDULE_FIELDS
+from service.batching import Batcher
+from service.protocol import ChunkedResponse, HTTPError, read_request, write_body, write_json
+from utils.batch_runner import summarize_loan
+from utils.loan_files import parse_loan_details, parse_prepayment_plan
+
+try:
+    from mortgage.batch import AnnuityFactorTable, amortize_batch
+except ImportError:  # NumPy is optional; batches then fall back to per-loan loops.
+    AnnuityFactorTable = amortize_batch = None
+
+# Every request is a different loan, so schedules are not cached.
+_NO_CACHE = ScheduleCache(maxsize=0)
+
+# Payments of loans on the rate sheet's grid are a table lookup and a multiply.
+_RATE_SHEET = AnnuityFactorTable() if AnnuityFactorTable is not None else None
+
+SCHEDULE_CHUNK_MONTHS = 120
+
+# Below this many loans, a per-loan loop beats amortize_batch's fixed per-month overhead.
+VECTORIZE_MIN_BATCH = 32
+
+
+def payment_batch(loans: list) -> list:
+    """Monthly payments of many loans (mortgage details dicts) in one vectorized call."""
+    principals = [loan['home_value'] - loan['down_payment'] for loan in loans]
+    total_payments = [loan['loan_term'] * 12 for loan in loans]
+    if _RATE_SHEET is not None:
+        payments = _RATE_SHEET.payments(principals, [loan['interest_rate'] for loan in loans],
+                                        [loan['loan_term'] for loan in loans]).tolist()
+    else:
+        payments = [annuity.monthly_payment(principal, loan['interest_rate'] / 100 / 12, months)
+                    for principal, loan, months in zip(principals, loans, total_payments)]
+    return [{"principal": principal, "monthly_payment": payment, "total_payments": months}
+            for principal, payment, months in zip(principals, payments, total_payments)]
+
+
+def summary_batch(items: list) -> list:
+    """Payoff month and total interest of many (details, prepayment plan) pairs."""
+    if amortize_batch is None or len(items) < VECTORIZE_MIN_BATCH:
+        return [_summary_fields(summarize_loan(None, details, plan)) for details, plan in items]
+    batch = amortize_batch([details['home_value'] - details['down_payment'] for details, _ in items],
+                           [details['interest_rate'] for details, _ in items],
+                           [details['loan_term'] for details, _ in items],
+                           [plan for _, plan in items])
+    total_interest = batch.total_interest().tolist()
+    payments = payment_batch([details for details, _ in items])
+    summaries = []
+    for i, (details, _) in enumerate(items):
+        principal = details['home_value'] - details['down_payment']
+        summaries.append({
+            "principal": principal,
+            "monthly_payment": payments[i]["monthly_payment"],
+            "payoff_month": int(batch.num_months[i]),
+            "total_interest": total_interest[i],
+            "interest_percent_principal": total_interest[i] / principal * 100,
+            "interest_percent_home_value": total_interest[i] / details['home_value'] * 100,
+        })
+    return summaries
+
+
+def _summary_fields(summary: dict) -> dict:
+    return {field: summary[field] for field in ("principal", "monthly_payment", "payoff_month", "total_interest",
+                                                "interest_percent_principal", "interest_percent_home_value")}
+
+
+def compute_schedule(details: dict, plan):
+    calculator = MortgageCalculator(details['home_value'], details['down_payment'], details['loan_term'],
+                                    details['interest_rate'], cache=_NO_CACHE)
+    return calculator.get_amortization_schedule(plan)
+
+
+def _format_rows(rows, file_format: str) -> bytes:
+    if file_format == "csv":
+        return "".join(f"{month},{payment:.2f},{principal:.2f},{interest:.2f},{extra:.2f},{balance:.2f}\n"
+                       for month, payment, principal, interest, extra, balance in rows).encode()
+    # Formatted directly rather than with json.dumps per row; float reprs are valid JSON numbers.
+    return "".join(f'{{"month": {month}, "payment": {payment!r}, "principal_payment": {principal!r}, '
+                   f'"interest_payment": {interest!r}, "extra_payment": {extra!r}, "balance": {balance!r}}}\n'
+                   for month, payment, principal, interest, extra, balance in rows).encode()
+
+
+def _parse_loan(data: dict):
+    """Mortgage details and prepayment plan of a request, or a 400 error."""
+    try:
+        # parse_loan_details rejects loans that cannot be amortized (no principal, a term
+        # under a year, ...), so they are reported here instead of failing inside a batch.
+        details = parse_loan_details(data)
+        return details, parse_prepayment_plan(data, details['loan_term'] * 12)
+    except (ValueError, KeyError, TypeError) as error:
+        raise HTTPError(400, f"Invalid loan: {error}")
+
+
+class PricingService:
+    def __init__(self, workers: int = None, max_batch: int = 256, max_delay: float = 0.002):
+        # workers=0 computes everything in the event loop's process (useful for tests). Workers
+        # come from a fork server so that they never inherit the listening socket.
+        self.executor = None
+        workers = os.cpu_count() if workers is None else workers
+        if workers:
+            self.executor = ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context("forkserver"))
+        self.payments = Batcher(payment_batch, max_batch, max_delay)
+        self.summaries = Batcher(summary_batch, max_batch, max_delay, self.executor, max_in_flight=max(workers, 1))
+        self.routes = {
+            ("POST", "/payment"): self.payment,
+            ("POST", "/summary"): self.summary,
+            ("POST", "/schedule"): self.schedule,
+            ("POST", "/target-payoff"): self.target_payoff,
+            ("GET", "/health"): self.health,
+            ("GET", "/metrics"): self.metrics,
+        }
+
+    async def payment(self, request, writer):
+        details, _ = _parse_loan(request.json())
+        return await self.payments.submit(details)
+
+    async def summary(self, request, writer):
+        return await self.summaries.submit(_parse_loan(request.json()))
+
+    async def schedule(self, request, writer):
+        details, plan = _parse_loan(request.json())
+        file_format = request.query.get("format", "jsonl")
+        if file_format not in ("jsonl", "csv"):
+            raise HTTPError(400, "format must be jsonl or csv")
+        try:
+            chunk_months = max(int(request.query.get("chunk_months", SCHEDULE_CHUNK_MONTHS)), 1)
+        except ValueError:
+            raise HTTPError(400, "chunk_months must be an integer")
+        if self.executor is None:
+            schedule = compute_schedule(details, plan)
+        else:
+            schedule = await asyncio.get_running_loop().run_in_executor(self.executor, compute_schedule,
+                                                                       details, plan)
+
+        response = ChunkedResponse(writer, 200, "text/csv" if file_format == "csv" else "application/x-ndjson",
+                                   request.keep_alive)
+        if file_format == "csv":
+            await response.write((",".join(SCHEDULE_FIELDS) + "\n").encode())
+        columns = schedule.columns()
+        for start in range(0, len(schedule), chunk_months):
+            rows = zip(*(column[start:start + chunk_months] for column in columns))
+            await response.write(_format_rows(rows, file_format))
+        await response.end()
+        return None
+
+    async def target_payoff(self, request, writer):
+        data = request.json()
+        details, _ = _parse_loan(data)
+        try:
+            target_months = int(data.get("target_months") or round(float(data["target_years"]) * 12))
+            frequency_months = int(data.get("frequency_months", 1))
+            start_month = int(data.get("start_month", 1))
+        except (KeyError, TypeError, ValueError):
+            raise HTTPError(400, "target_months (or target_years) is required")
+        if target_months < 1 or frequency_months < 1 or start_month < 1:
+            raise HTTPError(400, "target_months, frequency_months and start_month must be at least 1")
+        extra_payment, plan = solve_prepayment_amount(details, target_months, frequency_months, start_month)
+        return {"extra_payment": extra_payment, "prepayments": plan.to_json()}
+
+    async def health(self, request, writer):
+        return {
+            "status": "ok",
+            "payment_batches": self.payments.batches,
+            "payment_requests": self.payments.items,
+            "summary_batches": self.summaries.batches,
+            "summary_requests": self.summaries.items,
+        }
+
+    async def metrics(self, request, writer):
+        if request.query.get("format") == "json":
+            return METRICS.snapshot()
+        write_body(writer, 200, METRICS.to_prometheus().encode(), "text/plain; version=0.0.4", request.keep_alive)
+        return None
+
+    async def handle_connection(self, reader, writer):
+        try:
+            while True:
+                # A request that cannot be read leaves the stream out of step; close it after the error.
+                keep_alive = False
+                try:
+                    request = await read_request(reader)
+                    if request is None:
+                        break
+                    keep_alive = request.keep_alive
+                    handler = self.routes.get((request.method, request.path))
+                    if handler is None:
+                        raise HTTPError(404 if request.path not in {path for _, path in self.routes} else 405,
+                                        f"No route for {request.method} {request.path}")
+                    result = await handler(request, writer)
+                    if result is not None:
+                        write_json(writer, 200, result, keep_alive)
+                except HTTPError as error:
+                    write_json(writer, error.status, {"error": error.message}, keep_alive)
+                except (ConnectionError, asyncio.IncompleteReadError):
+                    raise
+                except Exception as error:
+                    write_json(writer, 500, {"error": f"{type(error).__name__}: {error}"}, keep_alive=False)
+                    keep_alive = False
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def start(self, host: str = "127.0.0.1", port: int = 8080):
+        return await asyncio.start_server(self.handle_connection, host, port, limit=1 << 16)
+
+    def close(self):
+        if self.executor is not None:
+            self.executor.shutdown()
+
+
+async def serve(host: str, port: int, workers: int = None, max_batch: int = 256, max_delay: float = 0.002):
+    service = PricingService(workers, max_batch, max_delay)
+    server = await service.start(host, port)
+    print(f"Serving on http://{host}:{server.sockets[0].getsockname()[1]}", flush=True)
+    # Stop cleanly on SIGTERM too, so that the worker processes are shut down.
+    loop = asyncio.get_running_loop()
+    loop.add_signal_handler(signal.SIGTERM, server.close)
+    try:
+        async with server:
+            await server.serve_forever()
+    except asyncio.CancelledError:
+        pass
+    finally:
+        service.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Local HTTP/JSON mortgage pricing service.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--workers", type=int, help="Worker processes (default: one per CPU).")
+    parser.add_argument("--max-batch", type=int, default=256, help="Most requests coalesced into one batch.")
+    parser.add_argument("--max-delay-ms", type=float, default=2.0,
+                        help="How long the first request of a batch waits for others.")
+    parser.add_argument("--metrics", action="store_true", help="Collect counters and timings for GET /metrics.")
+    args = parser.parse_args(argv)
+    if args.metrics:
+        METRICS.enable()
+    try:
+        asyncio.run(serve(args.host, args.port, args.workers, args.max_batch, args.max_delay_ms / 1000))
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,95 @@
+# src/utils/batch_runner.py
+
+import sys
+import time
+
+from mortgage.cache import ScheduleCache
+from mortgage.calculator import MortgageCalculator, record_simulation
+from mortgage.instrumentation import METRICS
+from mortgage.schedule import SCHEDULE_FIELDS, ScheduleSummary
+from utils.loan_files import ChunkedWriter, iter_raw_records, parse_loan_details, parse_prepayment_plan, parse_record
+
+SUMMARY_FIELDS = ("loan_id", "home_value", "down_payment", "loan_term", "interest_rate", "principal",
+                  "monthly_payment", "payoff_month", "total_interest", "interest_percent_principal",
+                  "interest_percent_home_value")
+
+# Every loan in a batch is different, so caching schedules would only hold memory.
+_NO_CACHE = ScheduleCache(maxsize=0)
+
+
+def summarize_loan(loan_id, details: dict, prepayment_plan, schedule_writer: ChunkedWriter = None) -> dict:
+    """
+    Compute the figures of MortgageCalculator.print_updated_summary for one loan, streaming its
+    schedule rows to schedule_writer (if given) without keeping them in memory.
+    """
+    calculator = MortgageCalculator(details['home_value'], details['down_payment'], details['loan_term'],
+                                    details['interest_rate'], cache=_NO_CACHE)
+    rows = calculator._iter_rows(prepayment_plan)
+    if schedule_writer is not None:
+        rows = _tee_rows(loan_id, rows, schedule_writer)
+    with METRICS.timer("batch.loan_seconds"):
+        summary = ScheduleSummary().update(rows)
+    if METRICS.enabled:
+        record_simulation(summary.final_month, prepayment_plan)
+    return {
+        "loan_id": loan_id,
+        **details,
+        "principal": calculator.principal,
+        "monthly_payment": calculator.monthly_payment,
+        "payoff_month": summary.final_month,
+        "total_interest": summary.total_interest,
+        "interest_percent_principal": (summary.total_interest / calculator.principal) * 100,
+        "interest_percent_home_value": (summary.total_interest / calculator.home_value) * 100,
+    }
+
+
+def _tee_rows(loan_id, rows, schedule_writer: ChunkedWriter):
+    for row in rows:
+        schedule_writer.write({"loan_id": loan_id, **dict(zip(SCHEDULE_FIELDS, row))})
+        yield row
+
+
+def run_batch(input_path: str, output_path: str, schedules_path: str = None, chunk_size: int = 10000,
+              report_every: int = 100000, log=sys.stderr) -> dict:
+    """
+    Process every loan in input_path (CSV or JSONL) without prompts, writing one summary row per
+    loan to output_path and, optionally, every schedule month to schedules_path.
+
+    Input is streamed and output written a chunk at a time, so memory stays bounded regardless
+    of the file size. Invalid records are reported on `log` and skipped. Returns counts and
+    the overall throughput.
+    """
+    processed = skipped = 0
+    started = time.perf_counter()
+    schedule_writer = None
+    with ChunkedWriter(output_path, SUMMARY_FIELDS, chunk_size) as summary_writer:
+        if schedules_path:
+            schedule_writer = ChunkedWriter(schedules_path, ("loan_id",) + SCHEDULE_FIELDS, chunk_size)
+        try:
+            for line_number, raw in iter_raw_records(input_path):
+                try:
+                    record = parse_record(raw)
+                    details = parse_loan_details(record)
+                    plan = parse_prepayment_plan(record, details['loan_term'] * 12)
+                except (ValueError, KeyError, TypeError) as error:
+                    skipped += 1
+                    print(f"Skipping {input_path}:{line_number}: {error}", file=log)
+                    continue
+
+                loan_id = record.get("loan_id") or line_number
+                summary_writer.write(summarize_loan(loan_id, details, plan, schedule_writer))
+                processed += 1
+                if report_every and processed % report_every == 0:
+                    elapsed = time.perf_counter() - started
+                    print(f"{processed:,d} loans processed ({processed / elapsed:,.0f} loans/s)", file=log)
+        finally:
+            if schedule_writer is not None:
+                schedule_writer.close()
+
+    elapsed = time.perf_counter() - started
+    return {
+        "processed": processed,
+        "skipped": skipped,
+        "seconds": elapsed,
+        "loans_per_second": processed / elapsed if elapsed else 0.0,
+    }
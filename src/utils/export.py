@@ -0,0 +1,199 @@
+# src/utils/export.py
+"""
+Bulk export of amortization schedules.
+
+Binary schedule files hold fixed-width little-endian records, one per schedule month:
+
+    header  MAGIC, version, record size, number of loans, index offset   ('<8sHHQQ')
+    records month (int32), 4 padding bytes, payment, principal_payment,
+            interest_payment, extra_payment, balance (float64 each)      ('<i4x5d')
+    index   first record number (uint64), loan id offset (uint64), months (uint32),
+            loan id length (uint32), loan id kind (uint8: 0 int, 1 str) per loan
+    ids     the loan ids as UTF-8 text, one after another, right after the index
+
+Loan ids may be integers or strings (e.g., the ids of batch mode); integer ids read back as
+integers.
+
+ScheduleReader memory-maps the file, so any month range of any loan is read without parsing
+the rest of the file. The CSV and Markdown writers format schedules for people, buffering
+output into large writes instead of printing row by row.
+"""
+
+import mmap
+import struct
+
+from mortgage.schedule import SCHEDULE_FIELDS, AmortizationSchedule
+
+MAGIC = b"MORTSCH\x00"
+VERSION = 2
+HEADER = struct.Struct("<8sHHQQ")
+RECORD = struct.Struct("<i4x5d")
+INDEX_ENTRY = struct.Struct("<QQIIB7x")
+
+# Loan id kinds in the index.
+_INT_ID, _STR_ID = 0, 1
+
+# Structured dtype matching RECORD, for NumPy views of a loan's records.
+NUMPY_RECORD_FIELDS = [("month", "<i4"), ("_pad", "V4")] + [(field, "<f8") for field in SCHEDULE_FIELDS[1:]]
+
+# Rows formatted per write by the text writers.
+TEXT_CHUNK_ROWS = 4096
+
+
+class ScheduleWriter:
+    """
+    Append schedules to a binary schedule file. The index is written when the writer is closed.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = open(path, "wb")
+        self._file.write(HEADER.pack(MAGIC, VERSION, RECORD.size, 0, 0))
+        self._index = []
+        self._records = 0
+
+    def write(self, schedule: AmortizationSchedule, loan_id=None) -> int:
+        """Append one loan's schedule (loan_id: an int or str, default its position) and return its position."""
+        pack = RECORD.pack
+        self._file.write(b"".join(pack(*row) for row in zip(*schedule.columns())))
+        position = len(self._index)
+        self._index.append((position if loan_id is None else loan_id, self._records, len(schedule)))
+        self._records += len(schedule)
+        return position
+
+    def close(self):
+        if self._file.closed:
+            return
+        index_offset = self._file.tell()
+        entries, ids, id_offset = [], [], 0
+        for loan_id, first, months in self._index:
+            encoded = str(loan_id).encode("utf-8")
+            kind = _INT_ID if isinstance(loan_id, int) and not isinstance(loan_id, bool) else _STR_ID
+            entries.append(INDEX_ENTRY.pack(first, id_offset, months, len(encoded), kind))
+            ids.append(encoded)
+            id_offset += len(encoded)
+        self._file.write(b"".join(entries))
+        self._file.write(b"".join(ids))
+        # Patch the header now that the number of loans and the index location are known.
+        self._file.seek(0)
+        self._file.write(HEADER.pack(MAGIC, VERSION, RECORD.size, len(self._index), index_offset))
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class ScheduleReader:
+    """
+    Memory-mapped, random-access reader for files written by ScheduleWriter.
+    """
+
+    def __init__(self, path: str):
+        self._file = open(path, "rb")
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, record_size, num_loans, index_offset = HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC or version != VERSION or record_size != RECORD.size:
+            self.close()
+            raise ValueError(f"{path} is not a version {VERSION} schedule file.")
+        # (loan id, first record number, months) per loan.
+        ids_offset = index_offset + num_loans * INDEX_ENTRY.size
+        self._index = []
+        for i in range(num_loans):
+            first, id_offset, months, id_length, kind = INDEX_ENTRY.unpack_from(
+                self._map, index_offset + i * INDEX_ENTRY.size)
+            start = ids_offset + id_offset
+            loan_id = self._map[start:start + id_length].decode("utf-8")
+            self._index.append((int(loan_id) if kind == _INT_ID else loan_id, first, months))
+        self._positions = {entry[0]: position for position, entry in enumerate(self._index)}
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def loan_ids(self) -> list:
+        return [entry[0] for entry in self._index]
+
+    def position(self, loan_id) -> int:
+        """Position in the file of the loan with the given id."""
+        return self._positions[loan_id]
+
+    def num_months(self, position: int) -> int:
+        return self._index[position][2]
+
+    def _span(self, position: int, start_month: int, end_month: int):
+        """Byte offset and record count of months start_month..end_month (inclusive) of a loan."""
+        _, first, months = self._index[position]
+        start = max(start_month, 1) - 1
+        stop = months if end_month is None else min(end_month, months)
+        count = max(stop - start, 0)
+        return HEADER.size + (first + start) * RECORD.size, count
+
+    def schedule(self, position: int, start_month: int = 1, end_month: int = None) -> AmortizationSchedule:
+        """Read months start_month..end_month (inclusive, default: to payoff) of a loan."""
+        offset, count = self._span(position, start_month, end_month)
+        schedule = AmortizationSchedule()
+        schedule.extend(RECORD.iter_unpack(self._map[offset:offset + count * RECORD.size]))
+        return schedule
+
+    def to_numpy(self, position: int, start_month: int = 1, end_month: int = None):
+        """
+        Zero-copy NumPy structured array over a loan's records. The array reads the file's
+        memory map, which stays open (even after close()) until the last such array is gone.
+        """
+        import numpy as np
+
+        offset, count = self._span(position, start_month, end_month)
+        return np.frombuffer(self._map, dtype=np.dtype(NUMPY_RECORD_FIELDS), count=count, offset=offset)
+
+    def close(self):
+        """Close the file; a map still exported to to_numpy arrays is released with the last of them."""
+        try:
+            self._map.close()
+        except BufferError:
+            pass
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def _write_lines(f, lines):
+    """Write formatted lines in chunks of TEXT_CHUNK_ROWS."""
+    buffer = []
+    for line in lines:
+        buffer.append(line)
+        if len(buffer) >= TEXT_CHUNK_ROWS:
+            f.write("".join(buffer))
+            buffer = []
+    if buffer:
+        f.write("".join(buffer))
+
+
+def _csv_field(value: str) -> str:
+    """Quote a CSV field as csv.writer does (QUOTE_MINIMAL)."""
+    if any(character in value for character in ',"\r\n'):
+        return '"' + value.replace('"', '""') + '"'
+    return value
+
+
+def write_csv(schedule: AmortizationSchedule, f, loan_id=None, header: bool = True):
+    """Write a schedule as CSV (with a leading loan_id column when loan_id is given)."""
+    prefix = "" if loan_id is None else _csv_field(str(loan_id)) + ","
+    if header:
+        f.write(("loan_id," if loan_id is not None else "") + ",".join(SCHEDULE_FIELDS) + "\n")
+    _write_lines(f, (f"{prefix}{month},{payment:.2f},{principal:.2f},{interest:.2f},{extra:.2f},{balance:.2f}\n"
+                     for month, payment, principal, interest, extra, balance in zip(*schedule.columns())))
+
+
+def write_markdown(schedule: AmortizationSchedule, f):
+    """Write a schedule as a Markdown table with the same columns as print_schedule."""
+    f.write("| Month | Payment | Principal | Interest | Extra Payment | Balance |\n")
+    f.write("|------:|--------:|----------:|---------:|--------------:|--------:|\n")
+    _write_lines(f, (f"| {month} | {payment:,.2f} | {principal:,.2f} | {interest:,.2f} | {extra:,.2f} | "
+                     f"{balance:,.2f} |\n"
+                     for month, payment, principal, interest, extra, balance in zip(*schedule.columns())))
@@ -0,0 +1,167 @@
+# src/utils/loan_files.py
+
+import csv
+import json
+import math
+import os
+import sys
+
+from mortgage.plan import PrepaymentPlan, PrepaymentRule
+
+# Fields of data/mortgage_details.json, required for every loan record.
+LOAN_FIELDS = ("home_value", "down_payment", "loan_term", "interest_rate")
+
+
+def _file_format(path: str) -> str:
+    extension = os.path.splitext(path)[1].lower()
+    if extension in (".jsonl", ".ndjson"):
+        return "jsonl"
+    if extension == ".csv":
+        return "csv"
+    raise ValueError(f"Unsupported file type for {path}; use .csv or .jsonl")
+
+
+def iter_raw_records(path: str):
+    """
+    Stream the records of a CSV or JSONL file one at a time, never loading the whole file.
+
+    Yields (line_number, raw) pairs, where raw is a dict of field values for CSV and the
+    unparsed line for JSONL; parse_record turns either into a record, so that a caller can
+    skip a malformed line instead of stopping at it.
+    """
+    file_format = _file_format(path)
+    with open(path, "r", newline="") as f:
+        if file_format == "csv":
+            for line_number, record in enumerate(csv.DictReader(f), start=2):
+                yield line_number, record
+        else:
+            for line_number, line in enumerate(f, start=1):
+                if line.strip():
+                    yield line_number, line
+
+
+def parse_record(raw) -> dict:
+    """The record of a raw CSV row or JSONL line from iter_raw_records (ValueError if malformed)."""
+    if isinstance(raw, str):
+        raw = json.loads(raw)
+        if not isinstance(raw, dict):
+            raise ValueError("a JSONL record must be an object")
+    return raw
+
+
+def iter_loan_records(path: str):
+    """
+    Stream loan records from a CSV or JSONL file one at a time, never loading the whole file.
+
+    Yields (line_number, record) pairs, where record is a dict of the raw field values.
+    """
+    for line_number, raw in iter_raw_records(path):
+        yield line_number, parse_record(raw)
+
+
+def _whole_years(value) -> int:
+    years = float(value)
+    if not years.is_integer():
+        raise ValueError(f"loan_term must be a whole number of years, not {value!r}")
+    return int(years)
+
+
+def parse_loan_details(record: dict) -> dict:
+    """
+    Convert a raw record into the mortgage details dict used by get_mortgage_details.
+    Raises ValueError for missing fields and for loans that cannot be amortized.
+    """
+    missing = [field for field in LOAN_FIELDS if record.get(field) in (None, "")]
+    if missing:
+        raise ValueError(f"missing field(s): {', '.join(missing)}")
+    details = {
+        'home_value': float(record['home_value']),
+        'down_payment': float(record['down_payment']),
+        'loan_term': _whole_years(record['loan_term']),
+        'interest_rate': float(record['interest_rate']),
+    }
+    if not all(math.isfinite(details[field]) for field in ('home_value', 'down_payment', 'interest_rate')):
+        raise ValueError("home_value, down_payment and interest_rate must be finite numbers")
+    if details['home_value'] <= 0:
+        raise ValueError("home_value must be positive")
+    if details['home_value'] - details['down_payment'] <= 0:
+        raise ValueError("down_payment must be less than home_value")
+    if details['loan_term'] < 1:
+        raise ValueError("loan_term must be at least 1 year")
+    if details['interest_rate'] <= -1200:
+        raise ValueError("interest_rate must be greater than -1200%")
+    return details
+
+
+def parse_prepayment_plan(record: dict, total_payments: int) -> PrepaymentPlan:
+    """
+    Build the loan's prepayment plan from a record.
+
+    A "prepayments" field may hold the contents of data/prepayment_details.json (old
+    {"month": amount} dicts or the rules format), as JSON text in CSV files. Alternatively,
+    flat prepayment_amount / prepayment_start_month / prepayment_frequency_months /
+    prepayment_count columns describe one rule (no count means indefinitely).
+    """
+    prepayments = record.get("prepayments")
+    if prepayments not in (None, ""):
+        if isinstance(prepayments, str):
+            prepayments = json.loads(prepayments)
+        return PrepaymentPlan.from_json(prepayments, horizon=total_payments)
+
+    amount = record.get("prepayment_amount")
+    if amount in (None, "") or not float(amount):
+        return PrepaymentPlan(horizon=total_payments)
+    count = record.get("prepayment_count")
+    rule = PrepaymentRule(
+        start_month=int(record.get("prepayment_start_month") or 1),
+        frequency_months=int(record.get("prepayment_frequency_months") or 1),
+        count=int(count) if count not in (None, "") else None,
+        amount=float(amount),
+    )
+    return PrepaymentPlan([rule], horizon=total_payments)
+
+
+class ChunkedWriter:
+    """
+    Write dict rows to a CSV or JSONL file, buffering them and flushing a chunk at a time.
+    Use "-" as the path to write CSV to standard output.
+    """
+
+    def __init__(self, path: str, fieldnames, chunk_size: int = 10000):
+        self.fieldnames = list(fieldnames)
+        self.chunk_size = chunk_size
+        self.rows_written = 0
+        self._buffer = []
+        if path == "-":
+            self._file, self._format = sys.stdout, "csv"
+        else:
+            self._format = _file_format(path)
+            self._file = open(path, "w", newline="")
+        if self._format == "csv":
+            self._writer = csv.DictWriter(self._file, fieldnames=self.fieldnames)
+            self._writer.writeheader()
+
+    def write(self, row: dict):
+        self._buffer.append(row)
+        if len(self._buffer) >= self.chunk_size:
+            self.flush()
+
+    def flush(self):
+        if self._format == "csv":
+            self._writer.writerows(self._buffer)
+        else:
+            self._file.write("".join(json.dumps(row) + "\n" for row in self._buffer))
+        self.rows_written += len(self._buffer)
+        self._buffer = []
+        self._file.flush()
+
+    def close(self):
+        self.flush()
+        if self._file is not sys.stdout:
+            self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
@@ -0,0 +1,228 @@
+# src/utils/loan_index.py
+"""
+Persisted payoff and interest index over the loan book of a ScenarioStore.
+
+For every scenario the index holds the payoff month and total interest under its
+prepayment plan, and checkpoints at every yearly mark (months 12, 24, ...) before the
+payoff: the balance, the interest paid so far and the interest still to be paid. It is
+kept in the store's database, next to the scenarios, and refresh() brings it up to date
+incrementally: only scenarios that are new or whose loan or plan changed since they were
+indexed are re-amortized (deleted scenarios drop out of the index with their rows).
+
+Queries such as "loans paying off by month 120" or "top 1,000 loans by interest remaining
+at month 60" are then answered from SQLite indexes without simulating any loan.
+"""
+
+import hashlib
+import json
+
+from mortgage.cache import ScheduleCache
+from mortgage.calculator import MortgageCalculator
+from mortgage.plan import PrepaymentPlan
+
+try:
+    import numpy as np
+    from mortgage.batch import amortize_batch
+except ImportError:  # NumPy is optional; loans are then indexed one at a time in closed form.
+    amortize_batch = None
+
+# Months between checkpoints.
+CHECKPOINT_INTERVAL = 12
+
+# Per-loan and per-checkpoint fields that top() can rank by.
+LOAN_FIELDS = ("payoff_month", "total_interest")
+CHECKPOINT_FIELDS = ("balance", "cumulative_interest", "remaining_interest")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS loan_index (
+    scenario_id INTEGER PRIMARY KEY REFERENCES scenarios (id) ON DELETE CASCADE,
+    fingerprint TEXT NOT NULL,
+    payoff_month INTEGER NOT NULL,
+    total_interest REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS loan_index_payoff_month ON loan_index (payoff_month);
+CREATE INDEX IF NOT EXISTS loan_index_total_interest ON loan_index (total_interest);
+CREATE TABLE IF NOT EXISTS loan_checkpoints (
+    scenario_id INTEGER NOT NULL REFERENCES scenarios (id) ON DELETE CASCADE,
+    month INTEGER NOT NULL,
+    balance REAL NOT NULL,
+    cumulative_interest REAL NOT NULL,
+    remaining_interest REAL NOT NULL,
+    PRIMARY KEY (scenario_id, month)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS loan_checkpoints_balance ON loan_checkpoints (month, balance);
+CREATE INDEX IF NOT EXISTS loan_checkpoints_cumulative_interest ON loan_checkpoints (month, cumulative_interest);
+CREATE INDEX IF NOT EXISTS loan_checkpoints_remaining_interest ON loan_checkpoints (month, remaining_interest);
+"""
+
+
+def _fingerprint(home_value, down_payment, loan_term, interest_rate, plan) -> str:
+    """Digest of everything an index entry depends on (the plan is the store's JSON text)."""
+    return hashlib.blake2b(repr((home_value, down_payment, loan_term, interest_rate, plan)).encode(),
+                           digest_size=16).hexdigest()
+
+
+def _loan_plan(loan_term: int, plan: str):
+    return PrepaymentPlan.from_json(json.loads(plan), horizon=loan_term * 12) if plan else None
+
+
+def _entries_closed_form(loans: list) -> list:
+    """(payoff month, total interest, [(month, balance, cumulative interest), ...]) per loan."""
+    no_cache = ScheduleCache(maxsize=0)
+    entries = []
+    for home_value, down_payment, loan_term, interest_rate, plan in loans:
+        calculator = MortgageCalculator(home_value, down_payment, loan_term, interest_rate, cache=no_cache)
+        loan = calculator.closed_form(_loan_plan(loan_term, plan))
+        checkpoints = [(month, loan.balance_at(month), loan.cumulative_interest(1, month))
+                       for month in range(CHECKPOINT_INTERVAL, loan.payoff_month, CHECKPOINT_INTERVAL)]
+        entries.append((loan.payoff_month, loan.cumulative_interest(), checkpoints))
+    return entries
+
+
+def _entries_batch(loans: list) -> list:
+    """As _entries_closed_form, amortizing the loans together with the NumPy batch engine."""
+    home_values, down_payments, loan_terms, interest_rates, plans = zip(*loans)
+    batch = amortize_batch(np.subtract(home_values, down_payments), interest_rates, loan_terms,
+                           [_loan_plan(term, plan) for term, plan in zip(loan_terms, plans)])
+    cumulative = np.cumsum(batch.interest_payment, axis=1)
+    payoff_months = batch.num_months
+    total_interest = cumulative[np.arange(len(loans)), np.maximum(payoff_months - 1, 0)]
+
+    marks = np.arange(CHECKPOINT_INTERVAL, cumulative.shape[1], CHECKPOINT_INTERVAL)
+    loan_rows, mark_columns = np.nonzero(marks[None, :] < payoff_months[:, None])
+    months = marks[mark_columns]
+    balances = batch.balance[loan_rows, months - 1].tolist()
+    interest_paid = cumulative[loan_rows, months - 1].tolist()
+
+    entries = [(payoff_month, interest, []) for payoff_month, interest in
+               zip(payoff_months.tolist(), total_interest.tolist())]
+    for loan, month, balance, paid in zip(loan_rows.tolist(), months.tolist(), balances, interest_paid):
+        entries[loan][2].append((month, balance, paid))
+    return entries
+
+
+class LoanBookIndex:
+    """
+    The payoff and interest index of a ScenarioStore's scenarios, stored in its database.
+    Call refresh() after changing the store; queries reflect the last refresh.
+    """
+
+    def __init__(self, store, chunk_size: int = 2000):
+        self.store = store
+        self.chunk_size = chunk_size
+        self._connection = store.connection
+        self._connection.executescript(_SCHEMA)
+
+    def __len__(self) -> int:
+        return self._connection.execute("SELECT COUNT(*) FROM loan_index").fetchone()[0]
+
+    def stale(self) -> list:
+        """(scenario id, fingerprint, loan) of every scenario missing from the index or changed since."""
+        rows = self._connection.execute(
+            "SELECT s.id, s.home_value, s.down_payment, s.loan_term, s.interest_rate, s.plan, i.fingerprint "
+            "FROM scenarios s LEFT JOIN loan_index i ON i.scenario_id = s.id")
+        stale = []
+        for scenario_id, *loan, indexed in rows:
+            fingerprint = _fingerprint(*loan)
+            if fingerprint != indexed:
+                stale.append((scenario_id, fingerprint, loan))
+        return stale
+
+    def refresh(self) -> int:
+        """Index the new and changed scenarios, chunk_size loans per transaction; returns how many."""
+        stale = self.stale()
+        compute = _entries_batch if amortize_batch is not None else _entries_closed_form
+        for start in range(0, len(stale), self.chunk_size):
+            chunk = stale[start:start + self.chunk_size]
+            entries = compute([loan for _, _, loan in chunk])
+            with self._connection:
+                self._connection.executemany("DELETE FROM loan_checkpoints WHERE scenario_id = ?",
+                                             ((scenario_id,) for scenario_id, _, _ in chunk))
+                self._connection.executemany(
+                    "INSERT OR REPLACE INTO loan_index (scenario_id, fingerprint, payoff_month, total_interest) "
+                    "VALUES (?, ?, ?, ?)",
+                    ((scenario_id, fingerprint, payoff_month, total_interest)
+                     for (scenario_id, fingerprint, _), (payoff_month, total_interest, _) in zip(chunk, entries)))
+                self._connection.executemany(
+                    "INSERT INTO loan_checkpoints (scenario_id, month, balance, cumulative_interest, "
+                    "remaining_interest) VALUES (?, ?, ?, ?, ?)",
+                    ((scenario_id, month, balance, paid, total_interest - paid)
+                     for (scenario_id, _, _), (_, total_interest, checkpoints) in zip(chunk, entries)
+                     for month, balance, paid in checkpoints))
+        return len(stale)
+
+    def get(self, name: str):
+        """{"payoff_month", "total_interest", "checkpoints": {month: (balance, cumulative, remaining)}}, or None."""
+        row = self._connection.execute(
+            "SELECT i.scenario_id, i.payoff_month, i.total_interest FROM loan_index i "
+            "JOIN scenarios s ON s.id = i.scenario_id WHERE s.name = ?", (name,)).fetchone()
+        if row is None:
+            return None
+        checkpoints = self._connection.execute(
+            "SELECT month, balance, cumulative_interest, remaining_interest FROM loan_checkpoints "
+            "WHERE scenario_id = ? ORDER BY month", (row[0],))
+        return {"payoff_month": row[1], "total_interest": row[2],
+                "checkpoints": {month: tuple(values) for month, *values in checkpoints}}
+
+    def payoff_range(self, first: int = None, last: int = None, limit: int = None) -> list:
+        """(name, payoff month) of the loans paying off in months first..last, earliest first."""
+        conditions, parameters = self._range("i.payoff_month", first, last)
+        query = ("SELECT s.name, i.payoff_month FROM loan_index i JOIN scenarios s ON s.id = i.scenario_id"
+                 + conditions + " ORDER BY i.payoff_month, s.name")
+        return self._fetch(query, parameters, limit)
+
+    def balance_range(self, month: int, low: float = None, high: float = None, limit: int = None) -> list:
+        """
+        (name, balance) of the loans whose balance at the end of `month` (a checkpoint) is in
+        low..high, smallest first. Loans paid off by then have a balance of 0.
+        """
+        self._check_month(month)
+        conditions, parameters = self._range("c.balance", low, high)
+        query = ("SELECT s.name, c.balance FROM loan_checkpoints c JOIN scenarios s ON s.id = c.scenario_id "
+                 "WHERE c.month = ?" + conditions.replace(" WHERE", " AND"))
+        parameters = [month] + parameters
+        if (low is None or low <= 0) and (high is None or high >= 0):
+            query += (" UNION ALL SELECT s.name, 0.0 FROM loan_index i JOIN scenarios s ON s.id = i.scenario_id "
+                      "WHERE i.payoff_month <= ?")
+            parameters.append(month)
+        return self._fetch(f"SELECT * FROM ({query}) ORDER BY 2, 1", parameters, limit)
+
+    def top(self, k: int, by: str = "remaining_interest", month: int = None, largest: bool = True) -> list:
+        """
+        (name, value) of the k loans with the largest (or smallest) value of `by`: a field of
+        LOAN_FIELDS, or of CHECKPOINT_FIELDS at checkpoint `month` among the loans still
+        outstanding then.
+        """
+        order = "DESC" if largest else "ASC"
+        if by in LOAN_FIELDS:
+            if month is not None:
+                raise ValueError(f"{by} does not depend on the month.")
+            return self._fetch(f"SELECT s.name, i.{by} FROM loan_index i JOIN scenarios s ON s.id = i.scenario_id "
+                               f"ORDER BY i.{by} {order}, s.name", [], k)
+        if by not in CHECKPOINT_FIELDS:
+            raise ValueError(f"Unknown field {by!r}; use one of {', '.join(LOAN_FIELDS + CHECKPOINT_FIELDS)}.")
+        self._check_month(month)
+        return self._fetch(f"SELECT s.name, c.{by} FROM loan_checkpoints c JOIN scenarios s ON s.id = c.scenario_id "
+                           f"WHERE c.month = ? ORDER BY c.{by} {order}, s.name", [month], k)
+
+    @staticmethod
+    def _check_month(month):
+        if month is None or month < CHECKPOINT_INTERVAL or month % CHECKPOINT_INTERVAL:
+            raise ValueError(f"Checkpoints are kept every {CHECKPOINT_INTERVAL} months; got month {month}.")
+
+    @staticmethod
+    def _range(column: str, low, high) -> tuple:
+        conditions, parameters = [], []
+        if low is not None:
+            conditions.append(f"{column} >= ?")
+            parameters.append(low)
+        if high is not None:
+            conditions.append(f"{column} <= ?")
+            parameters.append(high)
+        return (" WHERE " + " AND ".join(conditions) if conditions else ""), parameters
+
+    def _fetch(self, query: str, parameters: list, limit: int = None) -> list:
+        if limit is not None:
+            query += " LIMIT ?"
+            parameters = list(parameters) + [limit]
+        return [tuple(row) for row in self._connection.execute(query, parameters)]
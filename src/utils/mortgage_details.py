@@ -1,28 +1,23 @@
 import json
 import os
 
+from mortgage.instrumentation import METRICS
+from utils.paths import data_path
+
 
 def get_mortgage_details(filename="data/mortgage_details.json"):
     """
     Load mortgage details from the specified file if available;
     otherwise prompt for details and save them.
     """
-    # Determine the current file's directory (this is in src/utils/)
-    current_dir = os.path.dirname(os.path.abspath(__file__))
-    # Assuming the project structure:
-    # project_root/
-    #   data/
-    #   src/
-    #     utils/
-    # We need to go up two levels to reach the project root.
-    project_root = os.path.abspath(os.path.join(current_dir, "..", ".."))
-    file_path = os.path.join(project_root, filename)
+    # Relative filenames are resolved against the project root (cached after the first call).
+    file_path = data_path(filename)
 
     if os.path.exists(file_path):
         use_saved = input(
             "Found saved mortgage details. Would you like to use them? (y/yes to use saved details): ").strip().lower()
         if use_saved in ['y', 'yes']:
-            with open(file_path, "r") as file:
+            with METRICS.timer("persistence.details_load_seconds"), open(file_path, "r") as file:
                 details = json.load(file)
             print("Using saved mortgage details:")
             print(details)
@@ -57,7 +52,7 @@ def get_mortgage_details(filename="data/mortgage_details.json"):
     # Ensure the data directory exists before saving.
     os.makedirs(os.path.dirname(file_path), exist_ok=True)
 
-    with open(file_path, "w") as file:
+    with METRICS.timer("persistence.details_save_seconds"), open(file_path, "w") as file:
         json.dump(details, file)
 
     print("Mortgage details saved.")
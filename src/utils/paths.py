@@ -0,0 +1,19 @@
+# src/utils/paths.py
+
+import os
+from functools import lru_cache
+
+
+@lru_cache(maxsize=None)
+def project_root() -> str:
+    """
+    Returns the absolute path of the project root directory, resolved once per process.
+    Assumes this file is located at project_root/src/utils/paths.py.
+    """
+    return os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
+
+
+@lru_cache(maxsize=None)
+def data_path(filename: str) -> str:
+    """Absolute path of a file given relative to the project root (e.g., data/mortgage_details.json)."""
+    return os.path.join(project_root(), filename)
@@ -0,0 +1,229 @@
+# src/utils/scenario_store.py
+"""
+SQLite store of named loan scenarios, as an alternative to the single-scenario
+data/mortgage_details.json and data/prepayment_details.json files.
+
+Each scenario holds a loan (the fields of data/mortgage_details.json), an optional
+borrower and an optional prepayment plan, kept in its compact rule form (PrepaymentPlan.to_json)
+rather than as an expanded {month: amount} dict. Scenarios are indexed by name, by
+borrower and by loan parameters, and their computed summaries are cached in the store
+until the scenario changes. Writes are transactional, and save_many inserts a whole batch
+in one transaction.
+"""
+
+import json
+import sqlite3
+from contextlib import contextmanager
+
+from mortgage.plan import PrepaymentPlan
+from utils.paths import data_path
+
+DEFAULT_STORE = "data/scenarios.db"
+
+LOAN_FIELDS = ("home_value", "down_payment", "loan_term", "interest_rate")
+
+# Columns of the cached summaries.
+SUMMARY_FIELDS = ("monthly_payment", "payoff_month", "total_interest")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS scenarios (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE,
+    borrower TEXT,
+    home_value REAL NOT NULL,
+    down_payment REAL NOT NULL,
+    loan_term INTEGER NOT NULL,
+    interest_rate REAL NOT NULL,
+    plan TEXT
+);
+CREATE INDEX IF NOT EXISTS scenarios_borrower ON scenarios (borrower);
+CREATE INDEX IF NOT EXISTS scenarios_parameters ON scenarios (interest_rate, loan_term, home_value);
+CREATE TABLE IF NOT EXISTS summaries (
+    scenario_id INTEGER PRIMARY KEY REFERENCES scenarios (id) ON DELETE CASCADE,
+    monthly_payment REAL NOT NULL,
+    payoff_month INTEGER NOT NULL,
+    total_interest REAL NOT NULL
+);
+"""
+
+
+class Scenario:
+    """A named loan with an optional borrower and prepayment plan."""
+    __slots__ = ("name", "details", "plan", "borrower")
+
+    def __init__(self, name: str, details: dict, plan: PrepaymentPlan = None, borrower: str = None):
+        self.name = name
+        self.details = details
+        self.plan = plan
+        self.borrower = borrower
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, Scenario):
+            return NotImplemented
+        return (self.name, self.details, self.borrower) == (other.name, other.details, other.borrower) and (
+            (self.plan.to_json() if self.plan else None) == (other.plan.to_json() if other.plan else None))
+
+    def __repr__(self) -> str:
+        return f"Scenario({self.name!r}, {self.details}, borrower={self.borrower!r}, plan={self.plan})"
+
+
+def _plan_json(plan):
+    if not plan:
+        return None
+    if not isinstance(plan, PrepaymentPlan):
+        plan = PrepaymentPlan.from_dict(plan)
+    return json.dumps(plan.to_json())
+
+
+class ScenarioStore:
+    """
+    Scenarios in an SQLite database (by default data/scenarios.db; ":memory:" for a
+    temporary store). Use as a context manager, or call close().
+    """
+
+    def __init__(self, path: str = None):
+        self.path = data_path(DEFAULT_STORE) if path is None else path
+        self._connection = sqlite3.connect(self.path)
+        self._connection.execute("PRAGMA foreign_keys = ON")
+        self._connection.executescript(_SCHEMA)
+
+    @property
+    def connection(self) -> sqlite3.Connection:
+        """The database connection, for indexes kept in the same database (see utils.loan_index)."""
+        return self._connection
+
+    def close(self):
+        self._connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    @contextmanager
+    def transaction(self):
+        """Group several writes so that they are committed together or not at all."""
+        with self._connection:
+            yield self
+
+    def __len__(self) -> int:
+        return self._connection.execute("SELECT COUNT(*) FROM scenarios").fetchone()[0]
+
+    def __contains__(self, name: str) -> bool:
+        return self._connection.execute("SELECT 1 FROM scenarios WHERE name = ?", (name,)).fetchone() is not None
+
+    def names(self) -> list:
+        return [row[0] for row in self._connection.execute("SELECT name FROM scenarios ORDER BY name")]
+
+    def save(self, name: str, details: dict, plan=None, borrower: str = None):
+        """Insert or replace a scenario; plan is a PrepaymentPlan or {month: amount} dict."""
+        self.save_many([Scenario(name, details, plan, borrower)])
+
+    def save_many(self, scenarios):
+        """Insert or replace many Scenario objects in one transaction."""
+        rows = [(scenario.name, scenario.borrower, *(scenario.details[field] for field in LOAN_FIELDS),
+                 _plan_json(scenario.plan)) for scenario in scenarios]
+        with self._connection:
+            # Cached summaries of replaced scenarios are stale.
+            self._connection.executemany(
+                "DELETE FROM summaries WHERE scenario_id = (SELECT id FROM scenarios WHERE name = ?)",
+                ((row[0],) for row in rows))
+            self._connection.executemany(
+                "INSERT INTO scenarios (name, borrower, home_value, down_payment, loan_term, interest_rate, plan) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?) ON CONFLICT (name) DO UPDATE SET borrower = excluded.borrower, "
+                "home_value = excluded.home_value, down_payment = excluded.down_payment, "
+                "loan_term = excluded.loan_term, interest_rate = excluded.interest_rate, plan = excluded.plan", rows)
+
+    def delete(self, name: str):
+        with self._connection:
+            self._connection.execute("DELETE FROM scenarios WHERE name = ?", (name,))
+
+    _COLUMNS = "name, borrower, home_value, down_payment, loan_term, interest_rate, plan"
+
+    @staticmethod
+    def _scenario(row) -> Scenario:
+        name, borrower, home_value, down_payment, loan_term, interest_rate, plan = row
+        details = {"home_value": home_value, "down_payment": down_payment, "loan_term": loan_term,
+                   "interest_rate": interest_rate}
+        plan = PrepaymentPlan.from_json(json.loads(plan), horizon=loan_term * 12) if plan else None
+        return Scenario(name, details, plan, borrower)
+
+    def get(self, name: str):
+        """The named scenario, or None."""
+        row = self._connection.execute(f"SELECT {self._COLUMNS} FROM scenarios WHERE name = ?", (name,)).fetchone()
+        return self._scenario(row) if row is not None else None
+
+    def find(self, borrower: str = None, loan_term: int = None, min_rate: float = None, max_rate: float = None,
+             limit: int = None) -> list:
+        """Scenarios matching every given filter, ordered by name; all of them by default."""
+        conditions, parameters = [], []
+        for condition, value in (("borrower = ?", borrower), ("loan_term = ?", loan_term),
+                                 ("interest_rate >= ?", min_rate), ("interest_rate <= ?", max_rate)):
+            if value is not None:
+                conditions.append(condition)
+                parameters.append(value)
+        query = f"SELECT {self._COLUMNS} FROM scenarios"
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+        query += " ORDER BY name"
+        if limit is not None:
+            query += " LIMIT ?"
+            parameters.append(limit)
+        return [self._scenario(row) for row in self._connection.execute(query, parameters)]
+
+    def summary(self, name: str) -> dict:
+        """The monthly payment, payoff month and total interest of a scenario, cached in the store."""
+        summaries = self.summaries([name])
+        if name not in summaries:
+            raise KeyError(name)
+        return summaries[name]
+
+    def summaries(self, names: list = None) -> dict:
+        """
+        Summaries of the named scenarios (all by default), keyed by name. Those not cached
+        yet are computed and stored in one transaction.
+        """
+        from mortgage.cache import ScheduleCache
+        from mortgage.calculator import MortgageCalculator
+
+        query = (f"SELECT s.id, {', '.join('s.' + column for column in self._COLUMNS.split(', '))}, "
+                 f"{', '.join('r.' + field for field in SUMMARY_FIELDS)} "
+                 f"FROM scenarios s LEFT JOIN summaries r ON r.scenario_id = s.id")
+        if names is None:
+            rows = self._connection.execute(query).fetchall()
+        else:
+            rows = [row for name in names
+                    for row in self._connection.execute(query + " WHERE s.name = ?", (name,))]
+
+        results, computed = {}, []
+        no_cache = ScheduleCache(maxsize=0)
+        for row in rows:
+            scenario_id, scenario_row, cached = row[0], row[1:8], row[8:]
+            if cached[0] is not None:
+                results[scenario_row[0]] = dict(zip(SUMMARY_FIELDS, cached))
+                continue
+            scenario = self._scenario(scenario_row)
+            calculator = MortgageCalculator(**scenario.details, cache=no_cache)
+            summary = calculator.summarize(scenario.plan)
+            values = (calculator.monthly_payment, summary.final_month, summary.total_interest)
+            results[scenario.name] = dict(zip(SUMMARY_FIELDS, values))
+            computed.append((scenario_id, *values))
+        if computed:
+            with self._connection:
+                self._connection.executemany(
+                    "INSERT OR REPLACE INTO summaries (scenario_id, monthly_payment, payoff_month, total_interest) "
+                    "VALUES (?, ?, ?, ?)", computed)
+        return results
+
+    def import_json(self, name: str, details_file: str = "data/mortgage_details.json",
+                    prepayment_file: str = "data/prepayment_details.json", borrower: str = None):
+        """Store the scenario of the single-scenario JSON files (the prepayment file is optional)."""
+        import os
+
+        with open(data_path(details_file), "r") as f:
+            details = json.load(f)
+        plan = None
+        if prepayment_file and os.path.exists(data_path(prepayment_file)):
+            plan = PrepaymentPlan.load(data_path(prepayment_file), horizon=details["loan_term"] * 12)
+        self.save(name, details, plan, borrower)
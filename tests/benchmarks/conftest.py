@@ -0,0 +1,138 @@
+# tests/benchmarks/conftest.py
+"""
+Throughput gates for the pytest-benchmark suite.
+
+Every benchmark reports loans per second. So that the baselines carry over between
+machines, throughputs are compared relative to a reference workload timed in the same run
+(a plain-Python loop of closed-form payments): baselines.json (or --baseline-file) holds
+each benchmark's throughput divided by the reference's. A benchmark whose relative
+throughput falls more than --regression-threshold (a fraction, default 0.5) below its
+baseline is reported at the end of the run, and fails it with --fail-on-regression. Run
+with --update-baselines to record the current figures instead.
+
+The suite is opt-in: run it from tests/ with
+
+    PYTHONPATH=../src python -m pytest benchmarks [--max-loans 1000000] [--fail-on-regression]
+"""
+
+import json
+import os
+import time
+
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+DEFAULT_BASELINE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baselines.json")
+
+# Where the session's gate is kept for the end-of-run report.
+_GATE = pytest.StashKey()
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("mortgage benchmarks")
+    group.addoption("--max-loans", type=int, default=10000,
+                    help="Largest loan count to benchmark (up to 1000000).")
+    group.addoption("--baseline-file", default=DEFAULT_BASELINE_FILE, help="JSON file of baseline throughputs.")
+    group.addoption("--regression-threshold", type=float, default=0.5,
+                    help="Flag throughput drops of more than this fraction of the baseline.")
+    group.addoption("--fail-on-regression", action="store_true",
+                    help="Fail regressed benchmarks instead of only reporting them.")
+    group.addoption("--update-baselines", action="store_true", help="Write the measured throughputs as baselines.")
+
+
+def reference_throughput(loans: int = 20000, rounds: int = 5) -> float:
+    """Loans per second of the reference workload, the fastest of `rounds` runs."""
+    from mortgage.annuity import monthly_payment
+
+    parameters = [(300000.0 + i, (3.0 + i % 500 / 100) / 1200, 360) for i in range(loans)]
+    best = float("inf")
+    for _ in range(rounds):
+        start = time.perf_counter()
+        for principal, rate, months in parameters:
+            monthly_payment(principal, rate, months)
+        best = min(best, time.perf_counter() - start)
+    return loans / best
+
+
+class ThroughputGate:
+    def __init__(self, config):
+        self.path = config.getoption("--baseline-file")
+        self.threshold = config.getoption("--regression-threshold")
+        self.fail_on_regression = config.getoption("--fail-on-regression")
+        self.update = config.getoption("--update-baselines")
+        self.max_loans = config.getoption("--max-loans")
+        self.measured = {}
+        self.regressions = []
+        self.baselines = {}
+        self._reference = None
+        if os.path.exists(self.path):
+            with open(self.path, "r") as f:
+                self.baselines = json.load(f)
+
+    @property
+    def reference(self) -> float:
+        if self._reference is None:
+            self._reference = reference_throughput()
+        return self._reference
+
+    def check(self, name: str, loans_per_second: float):
+        relative = loans_per_second / self.reference
+        self.measured[name] = relative
+        baseline = self.baselines.get(name)
+        if self.update or baseline is None:
+            return
+        if relative < baseline * (1 - self.threshold):
+            message = (f"{name}: {relative:.4g}x the reference throughput is below the baseline of "
+                       f"{baseline:.4g}x by more than {self.threshold:.0%}")
+            self.regressions.append(message)
+            if self.fail_on_regression:
+                pytest.fail(message, pytrace=False)
+
+    def save(self):
+        baselines = dict(self.baselines)
+        baselines.update({name: float(f"{value:.4g}") for name, value in self.measured.items()})
+        with open(self.path, "w") as f:
+            json.dump(dict(sorted(baselines.items())), f, indent=2)
+            f.write("\n")
+
+
+@pytest.fixture(scope="session")
+def throughput_gate(request):
+    gate = ThroughputGate(request.config)
+    request.config.stash[_GATE] = gate
+    yield gate
+    if gate.update and gate.measured:
+        gate.save()
+
+
+def pytest_terminal_summary(terminalreporter, config):
+    gate = config.stash.get(_GATE, None)
+    if gate is not None and gate.regressions and not gate.fail_on_regression:
+        terminalreporter.section("throughput regressions (report only; see --fail-on-regression)")
+        for message in gate.regressions:
+            terminalreporter.write_line(message)
+
+
+@pytest.fixture
+def measure(benchmark, throughput_gate, request):
+    """
+    Benchmark `function(*args)` processing `loans` loans and gate its throughput.
+    Larger runs use fewer rounds so that every benchmark takes a few seconds at most. The
+    fastest round is gated, as it is the least disturbed by other load on the machine;
+    gate=False only reports it.
+    """
+    def run(function, loans: int, *args, gate: bool = True):
+        if loans > throughput_gate.max_loans:
+            pytest.skip(f"{loans:,d} loans is above --max-loans")
+        rounds = max(3, min(50, 20000 // loans))
+        benchmark.pedantic(function, args=args, rounds=rounds, iterations=1, warmup_rounds=1)
+        if benchmark.disabled:
+            # --benchmark-disable runs each benchmark once, as a plain test, with nothing to gate.
+            return None
+        loans_per_second = loans / benchmark.stats.stats.min
+        benchmark.extra_info["loans_per_second"] = loans_per_second
+        if gate:
+            throughput_gate.check(request.node.name, loans_per_second)
+        return loans_per_second
+    return run
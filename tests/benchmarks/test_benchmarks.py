@@ -0,0 +1,129 @@
+# tests/benchmarks/test_benchmarks.py
+
+import io
+import os
+import random
+import subprocess
+import sys
+from contextlib import redirect_stdout
+from types import SimpleNamespace
+
+import pytest
+
+from mortgage.cache import ScheduleCache
+from mortgage.calculator import MortgageCalculator
+from mortgage.plan import PrepaymentPlan
+from mortgage.prepayment import solve_prepayment_amount
+
+try:
+    import numpy as np
+    from mortgage.batch import iter_batches, monthly_payments
+except ImportError:  # NumPy is an optional dependency.
+    np = None
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "data")
+SRC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "src")
+
+# Loan counts benchmarked; counts above --max-loans are skipped.
+ALL_COUNTS = [1, 100, 10000, 1000000]
+# Month-by-month schedules take too long to repeat for a million loans.
+SCHEDULE_COUNTS = [1, 100, 10000]
+PRINT_COUNTS = [1, 100]
+
+_NO_CACHE = ScheduleCache(maxsize=0)
+
+
+def random_loans(count: int, seed: int = 0) -> list:
+    """(home_value, down_payment, loan_term, interest_rate) tuples of distinct loans."""
+    rng = random.Random(seed)
+    return [(rng.uniform(200000, 1000000), rng.uniform(20000, 150000), rng.choice((15, 20, 30)),
+             rng.uniform(3.0, 8.0)) for _ in range(count)]
+
+
+def calculators(count: int) -> list:
+    return [MortgageCalculator(*loan, cache=_NO_CACHE) for loan in random_loans(count)]
+
+
+@pytest.fixture(scope="module")
+def dense_plan() -> dict:
+    """The 360-month, $4,000 per month plan of data/prepayment_details.json."""
+    return PrepaymentPlan.load(os.path.join(DATA_DIR, "prepayment_details.json")).to_dict()
+
+
+@pytest.mark.parametrize("loans", ALL_COUNTS)
+def test_monthly_payment(measure, loans):
+    # Lightweight stand-ins carrying the attributes _calculate_monthly_payment reads.
+    parameters = [SimpleNamespace(principal=home_value - down_payment, monthly_rate=rate / 100 / 12,
+                                  total_payments=term * 12)
+                  for home_value, down_payment, term, rate in random_loans(min(loans, 1000))]
+    parameters = (parameters * (loans // len(parameters) + 1))[:loans]
+    calculate = MortgageCalculator._calculate_monthly_payment
+    measure(lambda: [calculate(loan) for loan in parameters], loans)
+
+
+@pytest.mark.skipif(np is None, reason="NumPy is required for the batch engine")
+@pytest.mark.parametrize("loans", ALL_COUNTS)
+def test_monthly_payment_vectorized(measure, loans):
+    principals, rates, terms = (np.array(column) for column in zip(
+        *[(home_value - down_payment, rate / 100 / 12, term * 12)
+          for home_value, down_payment, term, rate in random_loans(min(loans, 1000))]))
+    repeats = loans // len(principals) + 1
+    principals, rates, terms = (np.tile(column, repeats)[:loans] for column in (principals, rates, terms))
+    measure(monthly_payments, loans, principals, rates, terms)
+
+
+@pytest.mark.parametrize("loans", SCHEDULE_COUNTS)
+def test_schedule(measure, loans):
+    loan_calculators = calculators(loans)
+    measure(lambda: [calculator.get_amortization_schedule() for calculator in loan_calculators], loans)
+
+
+@pytest.mark.parametrize("loans", SCHEDULE_COUNTS)
+def test_schedule_dense_plan(measure, loans, dense_plan):
+    loan_calculators = calculators(loans)
+    measure(lambda: [calculator.get_amortization_schedule(dense_plan) for calculator in loan_calculators], loans)
+
+
+@pytest.mark.skipif(np is None, reason="NumPy is required for the batch engine")
+@pytest.mark.parametrize("loans", ALL_COUNTS)
+def test_schedule_batch(measure, loans):
+    home_values, down_payments, terms, rates = (np.array(column) for column in zip(*random_loans(min(loans, 10000))))
+    repeats = loans // len(home_values) + 1
+    principals = np.tile(home_values - down_payments, repeats)[:loans]
+    rates, terms = np.tile(rates, repeats)[:loans], np.tile(terms, repeats)[:loans]
+
+    def amortize():
+        for _ in iter_batches(principals, rates, terms, chunk_size=10000):
+            pass
+    measure(amortize, loans)
+
+
+@pytest.mark.parametrize("verify", [False, True], ids=["closed_form", "verified"])
+@pytest.mark.parametrize("loans", ALL_COUNTS)
+def test_prepayment_solver(measure, loans, verify):
+    rng = random.Random(1)
+    borrowers = [({"home_value": home_value, "down_payment": down_payment, "loan_term": term,
+                   "interest_rate": rate}, rng.randint(12, term * 12 - 1))
+                 for home_value, down_payment, term, rate in random_loans(min(loans, 1000))]
+    borrowers = (borrowers * (loans // len(borrowers) + 1))[:loans]
+    measure(lambda: [solve_prepayment_amount(details, target, verify=verify) for details, target in borrowers],
+            loans)
+
+
+@pytest.mark.parametrize("loans", PRINT_COUNTS)
+def test_print_schedule(measure, loans, dense_plan):
+    loan_calculators = calculators(loans)
+
+    def print_schedules():
+        with redirect_stdout(io.StringIO()):
+            for calculator in loan_calculators:
+                calculator.print_schedule(dense_plan)
+                calculator.print_updated_summary(dense_plan)
+    measure(print_schedules, loans)
+
+
+def test_cold_start_one_shot(measure):
+    # Launches per second of the one-shot entry point, from a fresh interpreter to exit. Process
+    # start-up depends on the OS and disk more than on the code, so it is reported but not gated.
+    command = [sys.executable, "main.py", "--principal", "400000", "--rate", "6.375"]
+    measure(lambda: subprocess.run(command, cwd=SRC_DIR, stdout=subprocess.DEVNULL, check=True), 1, gate=False)
@@ -0,0 +1,13 @@
+# tests/conftest.py
+
+import os
+
+BENCHMARKS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "benchmarks")
+
+
+def pytest_ignore_collect(collection_path, config):
+    """The benchmark suite only runs when its directory is named (pytest benchmarks)."""
+    if str(collection_path) != BENCHMARKS_DIR:
+        return None
+    named = (os.path.abspath(str(arg).split("::")[0]) for arg in config.args)
+    return not any(path.startswith(BENCHMARKS_DIR) for path in named)
@@ -0,0 +1,70 @@
+# tests/test_allocation.py
+
+import unittest
+from mortgage.allocation import LoanAccount, allocate_prepayments
+from mortgage.annuity import ClosedFormLoan
+from mortgage.calculator import MortgageCalculator
+
+
+class TestAllocation(unittest.TestCase):
+    def setUp(self):
+        self.loans = [
+            LoanAccount("modest", 360000, 6.625, 360),
+            LoanAccount("heloc", 40000, 8.5, 120),
+            LoanAccount("car", 15000, 4.0, 48),
+        ]
+
+    def simulate(self, result, loan):
+        """Interest and payoff month of the allocated plan, by the closed-form schedule math."""
+        closed = ClosedFormLoan(loan.balance, loan.monthly_rate, loan.payment, loan.remaining_months,
+                                result.plans[loan.name])
+        return closed.cumulative_interest(), closed.payoff_month
+
+    def test_matches_simulation(self):
+        result = allocate_prepayments(self.loans, 1500)
+        for loan in self.loans:
+            interest, payoff_month = self.simulate(result, loan)
+            self.assertEqual(result.payoff_months[loan.name], payoff_month)
+            self.assertAlmostEqual(result.interest[loan.name], interest, places=4)
+
+    def test_matches_month_by_month_schedule(self):
+        calculator = MortgageCalculator(450000, 90000, 30, 6.625)
+        loan = LoanAccount.from_calculator("modest", calculator)
+        result = allocate_prepayments([loan], 2000)
+        schedule = calculator.get_amortization_schedule(result.plans["modest"])
+        self.assertEqual(result.payoff_months["modest"], schedule.final_month)
+        self.assertAlmostEqual(result.total_interest, schedule.total_interest(), places=4)
+
+    def test_avalanche_pays_highest_rate_first_and_saves_most(self):
+        avalanche = allocate_prepayments(self.loans, 1500)
+        snowball = allocate_prepayments(self.loans, 1500, strategy="snowball")
+        self.assertEqual(avalanche.plans["heloc"].rules[0].start_month, 1)
+        self.assertFalse(avalanche.plans["car"])
+        self.assertLessEqual(avalanche.total_interest, snowball.total_interest)
+        self.assertGreater(avalanche.interest_saved, 0)
+
+        no_budget = allocate_prepayments(self.loans, 0, rollover=False)
+        self.assertAlmostEqual(no_budget.interest_saved, 0, places=4)
+        self.assertEqual(no_budget.payoff_months, {"modest": 360, "heloc": 120, "car": 48})
+
+    def test_payoff_targets(self):
+        self.loans[0].target_month = 120
+        result = allocate_prepayments(self.loans, 3000)
+        self.assertLessEqual(result.payoff_months["modest"], 120)
+        for loan in self.loans:
+            self.assertEqual(self.simulate(result, loan)[1], result.payoff_months[loan.name])
+
+        with self.assertRaises(ValueError):
+            allocate_prepayments(self.loans, 500)
+
+    def test_interest_only_line(self):
+        heloc = LoanAccount("heloc", 50000, 9.0, 120, payment=50000 * 0.09 / 12)
+        result = allocate_prepayments([heloc], 0)
+        self.assertIsNone(result.payoff_months["heloc"])
+        self.assertAlmostEqual(result.total_interest, 50000 * 0.09 / 12 * 120, places=4)
+        self.assertEqual(allocate_prepayments([heloc], 1000).payoff_months["heloc"],
+                         self.simulate(allocate_prepayments([heloc], 1000), heloc)[1])
+
+
+if __name__ == '__main__':
+    unittest.main()
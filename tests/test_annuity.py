@@ -0,0 +1,116 @@
+# tests/test_annuity.py
+
+import unittest
+from mortgage import annuity
+from mortgage.calculator import MortgageCalculator
+from fractions import Fraction
+from mortgage.rates import RateSchedule
+
+
+class TestAnnuity(unittest.TestCase):
+    def test_balance_after_matches_simulation(self):
+        calculator = MortgageCalculator(home_value=500000, down_payment=100000, loan_term=30, interest_rate=6.375)
+        schedule = calculator.get_amortization_schedule({})
+        balance = annuity.balance_after(calculator.principal, calculator.monthly_rate, calculator.monthly_payment, 60)
+        self.assertAlmostEqual(balance, schedule[59].balance, places=6)
+
+    def test_periodic_weight_is_sum_of_monthly_weights(self):
+        monthly_rate = 0.06 / 12
+        expected = sum(annuity.prepayment_weight(monthly_rate, month, 120) for month in range(7, 121, 12))
+        self.assertAlmostEqual(annuity.periodic_prepayment_weight(monthly_rate, 7, 12, 100, 120), expected)
+
+    def test_annuity_factor_is_accurate_for_tiny_rates(self):
+        for monthly_rate in (1e-15, 1e-12, 1e-9, 1e-6, 0.06 / 12):
+            rate = Fraction(monthly_rate)
+            exact = rate / (1 - (1 + rate) ** -360)
+            self.assertAlmostEqual(float((Fraction(annuity.annuity_factor(monthly_rate, 360)) - exact) / exact), 0,
+                                   places=14)
+        self.assertEqual(annuity.annuity_factor(0, 360), 1 / 360)
+
+    def test_months_to_payoff(self):
+        self.assertEqual(annuity.months_to_payoff(400000, 0.06 / 12, annuity.monthly_payment(400000, 0.06 / 12, 360)),
+                         360)
+        self.assertEqual(annuity.months_to_payoff(1000, 0, 300), 4)
+        self.assertIsNone(annuity.months_to_payoff(1000, 0.01, 10))
+
+
+class TestRandomAccessQueries(unittest.TestCase):
+    def setUp(self):
+        self.calculator = MortgageCalculator(home_value=500000, down_payment=100000, loan_term=30,
+                                             interest_rate=6.375)
+
+    def assertMatchesSchedule(self, prepayment_schedule):
+        schedule = self.calculator.get_amortization_schedule(prepayment_schedule)
+        loan = self.calculator.closed_form(prepayment_schedule)
+        self.assertEqual(loan.payoff_month, schedule.final_month)
+        for month in (1, 12, 37, 60, schedule.final_month - 1, schedule.final_month):
+            if month > schedule.final_month:
+                continue
+            self.assertAlmostEqual(loan.balance_at(month), schedule[month - 1].balance, places=2)
+        self.assertAlmostEqual(loan.cumulative_interest(), schedule.total_interest(), places=2)
+        self.assertAlmostEqual(loan.cumulative_interest(13, 48), sum(schedule.interest_payment[12:48]), places=2)
+
+    def test_without_prepayments(self):
+        self.assertMatchesSchedule({})
+        self.assertEqual(self.calculator.balance_at(0), self.calculator.principal)
+        self.assertEqual(self.calculator.balance_at(400), 0)
+
+    def test_sparse_lump_sums(self):
+        self.assertMatchesSchedule({12: 25000, 37: 40000, 90: 10000})
+
+    def test_dense_prepayments(self):
+        self.assertMatchesSchedule({month: 4000 for month in range(1, 361)})
+
+    def test_lump_sum_pays_off_the_loan(self):
+        prepayments = {24: 1000000}
+        self.assertMatchesSchedule(prepayments)
+        self.assertEqual(self.calculator.payoff_month(prepayments), 24)
+        self.assertEqual(self.calculator.balance_at(30, prepayments), 0)
+
+
+class TestRateResets(unittest.TestCase):
+    def assertMatchesSchedule(self, calculator, prepayment_schedule=None):
+        schedule = calculator.get_amortization_schedule(prepayment_schedule)
+        loan = calculator.closed_form(prepayment_schedule)
+        self.assertEqual(loan.payoff_month, schedule.final_month)
+        for month in (1, 12, 60, 61, 72, 150, schedule.final_month):
+            if month > schedule.final_month:
+                continue
+            self.assertAlmostEqual(loan.balance_at(month), schedule[month - 1].balance, places=2)
+        self.assertAlmostEqual(loan.cumulative_interest(), schedule.total_interest(), places=2)
+        self.assertAlmostEqual(loan.cumulative_interest(55, 90), sum(schedule.interest_payment[54:90]), places=2)
+
+    def test_arm_resets(self):
+        rates = RateSchedule.arm(5.5, [7.0, 9.0, 6.0, 4.0] + [5.0] * 21)
+        calculator = MortgageCalculator(500000, 100000, 30, 5.5, rate_schedule=rates)
+        self.assertMatchesSchedule(calculator)
+        self.assertMatchesSchedule(calculator, {12: 25000, 61: 40000, 90: 10000})
+        self.assertMatchesSchedule(calculator, {month: 2000 for month in range(1, 361)})
+        # One checkpoint per reset rather than one per month.
+        self.assertEqual(len(calculator.closed_form()._months), 26)
+
+    def test_payment_is_reamortized_at_reset(self):
+        calculator = MortgageCalculator(500000, 100000, 30, 5.5, rate_schedule=RateSchedule({61: 7.5}))
+        schedule = calculator.get_amortization_schedule()
+        expected = annuity.monthly_payment(schedule[59].balance, 7.5 / 100 / 12, 300)
+        self.assertAlmostEqual(schedule[60].payment, expected, places=9)
+        self.assertAlmostEqual(schedule[-1].balance, 0, places=6)
+        self.assertEqual(len(schedule), 360)
+
+    def test_recast_after_lump_sum(self):
+        prepayments = {24: 100000}
+        recast = MortgageCalculator(500000, 100000, 30, 6.0, rate_schedule=RateSchedule(recasts=[24]))
+        self.assertMatchesSchedule(recast, prepayments)
+        schedule = recast.get_amortization_schedule(prepayments)
+        # The loan keeps its original term, with a lower payment from the recast month on.
+        self.assertEqual(len(schedule), 360)
+        self.assertLess(schedule[23].payment, schedule[22].payment)
+
+    def test_buydown(self):
+        rates = RateSchedule.buydown(7.0)
+        self.assertEqual(rates.changes, {1: 5.0, 13: 6.0, 25: 7.0})
+        self.assertMatchesSchedule(MortgageCalculator(500000, 100000, 30, 7.0, rate_schedule=rates))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,102 @@
+# tests/test_batch.py
+
+import unittest
+from mortgage.calculator import MortgageCalculator
+
+try:
+    import numpy as np
+    from mortgage.batch import (SCHEDULE_FIELDS, AnnuityFactorTable, amortize_batch, amortize_cents_batch,
+                                iter_batches, monthly_payments, payments_cents)
+    from mortgage.cents import ROUNDING_MODES, amortize_cents, payment_cents, rate_units
+except ImportError:  # NumPy is an optional dependency.
+    np = None
+
+
+@unittest.skipIf(np is None, "NumPy is required for the batch engine")
+class TestBatchAmortization(unittest.TestCase):
+    def setUp(self):
+        # A mix of terms, rates (including 0%) and principals, matching MortgageCalculator inputs.
+        self.loans = [
+            (500000, 100000, 30, 6.375),
+            (699000, 139800, 30, 6.625),
+            (300000, 60000, 15, 5.5),
+            (200000, 20000, 10, 0.0),
+        ]
+        self.prepayments = [
+            {},
+            {month: 4000.0 for month in range(1, 361)},
+            {12: 50000.0, 24: 50000.0},
+            {1: 500000.0},  # Overpays the balance in the first month.
+        ]
+
+    def _scalar_schedules(self):
+        schedules = []
+        for (home_value, down_payment, loan_term, interest_rate), plan in zip(self.loans, self.prepayments):
+            calculator = MortgageCalculator(home_value, down_payment, loan_term, interest_rate)
+            schedules.append(calculator.get_amortization_schedule(plan))
+        return schedules
+
+    def test_matches_scalar_schedule_to_the_cent(self):
+        principals = [home_value - down_payment for home_value, down_payment, _, _ in self.loans]
+        batch = amortize_batch(principals, [loan[3] for loan in self.loans], [loan[2] for loan in self.loans],
+                               self.prepayments)
+        for index, expected in enumerate(self._scalar_schedules()):
+            actual = batch.schedule(index)
+            self.assertEqual(len(actual), len(expected))
+            for actual_row, expected_row in zip(actual, expected):
+                for field in SCHEDULE_FIELDS:
+                    self.assertAlmostEqual(actual_row[field], expected_row[field], places=2)
+
+    def test_annuity_factor_table(self):
+        table = AnnuityFactorTable()
+        principals = np.full(6, 400000.0)
+        # On the sheet, off the 1/8% grid, 0%, a non-standard term, above the sheet and negative.
+        rates = np.array([6.375, 6.4, 0.0, 3.125, 15.5, -0.125])
+        terms = np.array([30, 30, 15, 7, 30, 30])
+        expected = monthly_payments(principals, rates / 100 / 12, terms * 12)
+        np.testing.assert_array_equal(table.payments(principals, rates, terms), expected)
+        self.assertEqual(table.factors.shape, (121, len(table.terms)))
+        calculator = MortgageCalculator(500000, 100000, 30, 6.375)
+        self.assertAlmostEqual(table.payments([400000], [6.375], [30])[0], calculator.monthly_payment, places=8)
+
+    def test_prepayment_matrix_and_chunks(self):
+        principals = np.full(5, 400000.0)
+        extras = np.zeros((5, 360))
+        extras[:, 0] = np.arange(5) * 10000.0
+        whole = amortize_batch(principals, 6.375, 30, extras)
+        chunked = list(iter_batches(principals, 6.375, 30, extras, chunk_size=2))
+        self.assertEqual([start for start, _ in chunked], [0, 2, 4])
+        self.assertTrue(np.allclose(np.concatenate([batch.total_interest() for _, batch in chunked]),
+                                    whole.total_interest()))
+        # Larger first-month prepayments always reduce the total interest.
+        self.assertTrue(np.all(np.diff(whole.total_interest()) < 0))
+
+    def test_cents_batch_matches_scalar_cents_engine_exactly(self):
+        principals = [(home_value - down_payment) * 100 for home_value, down_payment, _, _ in self.loans]
+        for mode in ROUNDING_MODES:
+            batch = amortize_cents_batch(principals, [loan[3] for loan in self.loans],
+                                         [loan[2] for loan in self.loans], self.prepayments, rounding=mode)
+            self.assertEqual(batch.interest_payment.dtype, np.int64)
+            for index, (principal, (_, _, loan_term, interest_rate), plan) in enumerate(
+                    zip(principals, self.loans, self.prepayments)):
+                expected = amortize_cents(principal, rate_units(interest_rate), loan_term * 12, plan, rounding=mode)
+                self.assertEqual(batch.schedule(index), expected)
+
+    def test_cents_batch_rounds_prepayments_half_up(self):
+        plan = {1: 100.125, 2: 0.005, 3: 1.005}
+        batch = amortize_cents_batch([10000000], [6.375], [30], [plan])
+        self.assertEqual(batch.extra_payment[0, :3].tolist(), [10013, 1, 101])
+        self.assertEqual(batch.schedule(0), amortize_cents(10000000, rate_units(6.375), 360, plan))
+
+    def test_vectorized_cent_payments(self):
+        rng = np.random.default_rng(0)
+        principals = rng.integers(1000000, 100000000, 2000)
+        units = rng.integers(1, 100000, 2000)
+        terms = rng.choice([120, 180, 360], 2000)
+        for mode in ROUNDING_MODES:
+            expected = [payment_cents(int(p), int(u), int(n), mode) for p, u, n in zip(principals, units, terms)]
+            self.assertEqual(payments_cents(principals, units, terms, mode).tolist(), expected)
+
+
+if __name__ == '__main__':
+    unittest.main()
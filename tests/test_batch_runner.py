@@ -0,0 +1,107 @@
+# tests/test_batch_runner.py
+
+import csv
+import io
+import json
+import os
+import tempfile
+import unittest
+from mortgage.calculator import MortgageCalculator
+from utils.batch_runner import run_batch
+from utils.loan_files import iter_loan_records, parse_prepayment_plan
+
+
+class TestBatchRunner(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.loans = [
+            {"loan_id": "a", "home_value": 699000.0, "down_payment": 139800.0, "loan_term": 30, "interest_rate": 6.625,
+             "prepayments": {"1": 4000.0, "2": 4000.0, "3": 4000.0}},
+            {"loan_id": "b", "home_value": 500000, "down_payment": 100000, "loan_term": 15, "interest_rate": 5.5,
+             "prepayment_amount": 1000, "prepayment_frequency_months": 12},
+            {"loan_id": "c", "home_value": 300000, "loan_term": 30, "interest_rate": 6.0},  # Missing down payment.
+        ]
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def path(self, name: str) -> str:
+        return os.path.join(self.directory.name, name)
+
+    def test_jsonl_batch(self):
+        with open(self.path("loans.jsonl"), "w") as f:
+            for loan in self.loans:
+                f.write(json.dumps(loan) + "\n")
+        log = io.StringIO()
+        stats = run_batch(self.path("loans.jsonl"), self.path("summaries.csv"), self.path("schedules.jsonl"),
+                          chunk_size=100, log=log)
+        self.assertEqual((stats["processed"], stats["skipped"]), (2, 1))
+        self.assertIn("down_payment", log.getvalue())
+
+        with open(self.path("summaries.csv"), newline="") as f:
+            summaries = list(csv.DictReader(f))
+        calculator = MortgageCalculator(699000.0, 139800.0, 30, 6.625)
+        expected = calculator.summarize({1: 4000.0, 2: 4000.0, 3: 4000.0})
+        self.assertEqual(summaries[0]["loan_id"], "a")
+        self.assertEqual(int(summaries[0]["payoff_month"]), expected.final_month)
+        self.assertAlmostEqual(float(summaries[0]["total_interest"]), expected.total_interest, places=6)
+
+        with open(self.path("schedules.jsonl")) as f:
+            schedule_rows = [json.loads(line) for line in f]
+        payoff_months = sum(int(summary["payoff_month"]) for summary in summaries)
+        self.assertEqual(len(schedule_rows), payoff_months)
+
+    def test_malformed_and_unpayable_records_are_skipped(self):
+        with open(self.path("loans.jsonl"), "w") as f:
+            f.write(json.dumps(self.loans[0]) + "\n")
+            f.write('{"loan_id": "broken", "home_value": 500000,\n')
+            f.write("[1, 2, 3]\n")
+            f.write(json.dumps({"loan_id": "zero", "home_value": 400000, "down_payment": 400000, "loan_term": 30,
+                                "interest_rate": 6.0}) + "\n")
+            f.write(json.dumps({"loan_id": "term", "home_value": 400000, "down_payment": 0, "loan_term": 0,
+                                "interest_rate": 6.0}) + "\n")
+            f.write(json.dumps(self.loans[1]) + "\n")
+        log = io.StringIO()
+        stats = run_batch(self.path("loans.jsonl"), self.path("summaries.csv"), log=log)
+        self.assertEqual((stats["processed"], stats["skipped"]), (2, 4))
+        for line_number in (2, 3, 4, 5):
+            self.assertIn(f"loans.jsonl:{line_number}:", log.getvalue())
+        with open(self.path("summaries.csv"), newline="") as f:
+            self.assertEqual([row["loan_id"] for row in csv.DictReader(f)], ["a", "b"])
+
+    def test_malformed_prepayments_and_terms_are_skipped(self):
+        bad_loans = [dict(self.loans[0], loan_id="list", prepayments=[]),
+                     dict(self.loans[0], loan_id="text", prepayments={"5": "abc"}),
+                     dict(self.loans[0], loan_id="month", prepayments={"0": 1000.0}),
+                     dict(self.loans[0], loan_id="rule", prepayments={"rules": [{"start_month": 1}]}),
+                     dict(self.loans[0], loan_id="fraction", loan_term=30.5)]
+        with open(self.path("loans.jsonl"), "w") as f:
+            for loan in bad_loans + [self.loans[1]]:
+                f.write(json.dumps(loan) + "\n")
+        log = io.StringIO()
+        stats = run_batch(self.path("loans.jsonl"), self.path("summaries.csv"), log=log)
+        self.assertEqual((stats["processed"], stats["skipped"]), (1, 5))
+        for line_number in range(1, 6):
+            self.assertIn(f"loans.jsonl:{line_number}:", log.getvalue())
+
+    def test_csv_input_with_rule_columns(self):
+        with open(self.path("loans.csv"), "w", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=["loan_id", "home_value", "down_payment", "loan_term",
+                                                   "interest_rate", "prepayment_amount", "prepayment_frequency_months"])
+            writer.writeheader()
+            writer.writerow({key: value for key, value in self.loans[1].items()})
+        (line_number, record), = iter_loan_records(self.path("loans.csv"))
+        self.assertEqual(line_number, 2)
+        plan = parse_prepayment_plan(record, 180)
+        self.assertEqual(list(plan)[:3], [1, 13, 25])
+
+        stats = run_batch(self.path("loans.csv"), self.path("summaries.jsonl"), chunk_size=1)
+        self.assertEqual(stats["processed"], 1)
+        with open(self.path("summaries.jsonl")) as f:
+            summary = json.loads(f.readline())
+        expected = MortgageCalculator(500000, 100000, 15, 5.5).summarize(plan)
+        self.assertEqual(summary["payoff_month"], expected.final_month)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,73 @@
+# tests/test_cache.py
+
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+from mortgage.cache import ScheduleCache, plan_key
+from mortgage.calculator import MortgageCalculator
+
+
+class TestScheduleCache(unittest.TestCase):
+    def setUp(self):
+        self.cache = ScheduleCache(maxsize=2)
+        self.calculator = MortgageCalculator(home_value=500000, down_payment=100000, loan_term=30,
+                                             interest_rate=6.375, cache=self.cache)
+
+    def test_repeated_schedules_hit_the_cache(self):
+        first = self.calculator.get_amortization_schedule({12: 5000})
+        second = self.calculator.get_amortization_schedule({12: 5000.0, 24: 0})
+        self.assertEqual(first, second)
+        self.assertEqual(self.cache.info()["hits"], 1)
+        self.assertEqual(self.cache.info()["misses"], 1)
+
+    def test_callers_cannot_corrupt_cached_schedules(self):
+        first = self.calculator.get_amortization_schedule({12: 5000})
+        expected = first.copy()
+        first.append(999, 1.0, 1.0, 1.0, 1.0, 1.0)
+        first.balance[0] = -1.0
+        other = MortgageCalculator(500000, 100000, 30, 6.375, cache=self.cache)
+        self.assertEqual(other.get_amortization_schedule({12: 5000}), expected)
+        self.assertEqual(self.cache.info()["hits"], 1)
+
+    def test_least_recently_used_entry_is_evicted(self):
+        self.calculator.get_amortization_schedule({})
+        self.calculator.get_amortization_schedule({1: 1000})
+        self.calculator.get_amortization_schedule({})
+        self.calculator.get_amortization_schedule({2: 1000})
+        self.assertEqual(self.cache.evictions, 1)
+        self.assertIn(self.calculator._cache_key({}), self.cache)
+        self.assertNotIn(self.calculator._cache_key({1: 1000}), self.cache)
+
+    def test_mutating_the_loan_recomputes_its_schedules(self):
+        original = self.calculator.get_amortization_schedule({})
+        self.calculator.interest_rate = 5.0
+        self.assertAlmostEqual(self.calculator.monthly_rate, 5.0 / 100 / 12)
+        updated = self.calculator.get_amortization_schedule({})
+        self.assertLess(updated.total_interest(), original.total_interest())
+        # The old loan's schedule stays cached for other calculators with its terms.
+        self.assertEqual(len(self.cache), 2)
+
+    def test_summary_reuses_printed_schedule(self):
+        with patch('builtins.print'):
+            self.calculator.print_schedule({6: 2000})
+            self.calculator.print_updated_summary({6: 2000})
+        self.assertEqual(self.cache.hits, 1)
+
+    def test_persistence(self):
+        self.calculator.get_amortization_schedule({12: 5000})
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "schedules.pickle")
+            self.cache.save(path)
+            restored = ScheduleCache(maxsize=2, path=path)
+        key = self.calculator._cache_key({12: 5000})
+        self.assertEqual(restored.get(key), self.cache.get(key))
+
+    def test_plan_key(self):
+        self.assertEqual(plan_key(None), plan_key({}))
+        self.assertEqual(plan_key({1: 100, 2: 0}), plan_key({1: 100.0}))
+        self.assertNotEqual(plan_key({1: 100}), plan_key({2: 100}))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,93 @@
+# tests/test_cents.py
+
+import unittest
+from decimal import ROUND_HALF_EVEN, Decimal
+from mortgage.calculator import MortgageCalculator
+from mortgage.cents import (RATE_DENOMINATOR, ROUNDING_MODES, CentsSchedule, amortize_cents, payment_cents,
+                            rate_units, round_div, to_cents)
+from mortgage.plan import PrepaymentPlan, PrepaymentRule
+from mortgage.rates import RateSchedule
+
+
+class TestRounding(unittest.TestCase):
+    def test_rounding_modes(self):
+        expected = {
+            "half_even": [0, 2, 2, 1],
+            "half_up": [1, 2, 3, 1],
+            "down": [0, 1, 2, 1],
+            "up": [1, 2, 3, 2],
+        }
+        for mode, values in expected.items():
+            self.assertEqual([round_div(n, 2, mode) for n in (1, 3, 5)] + [round_div(4, 3, mode)], values, mode)
+        with self.assertRaises(ValueError):
+            round_div(1, 2, "bankers")
+
+    def test_conversions(self):
+        self.assertEqual(to_cents(1234.565), 123457)
+        self.assertEqual(to_cents("0.1"), 10)
+        self.assertEqual(rate_units(6.375), 63750)
+        with self.assertRaises(ValueError):
+            rate_units(6.123456)
+
+    def test_payment_matches_decimal_formula(self):
+        rate = Decimal(63750) / RATE_DENOMINATOR
+        expected = (40000000 * rate / (1 - (1 + rate) ** -360)).quantize(Decimal(1), ROUND_HALF_EVEN)
+        self.assertEqual(payment_cents(40000000, 63750, 360), int(expected))
+        self.assertEqual(payment_cents(24000000, 0, 120), 200000)
+
+
+class TestCentsSchedule(unittest.TestCase):
+    def setUp(self):
+        self.calculator = MortgageCalculator(home_value=500000, down_payment=100000, loan_term=30,
+                                             interest_rate=6.375)
+
+    def assertBalanced(self, schedule: CentsSchedule, principal: int):
+        self.assertIsInstance(schedule.balance[0], int)
+        self.assertEqual(schedule.balance[-1], 0)
+        self.assertEqual(sum(schedule.principal_payment) + sum(schedule.extra_payment), principal)
+        for month in range(len(schedule)):
+            opening = principal if month == 0 else schedule.balance[month - 1]
+            self.assertEqual(opening - schedule.extra_payment[month] - schedule.principal_payment[month],
+                             schedule.balance[month])
+            self.assertEqual(schedule.payment[month],
+                             schedule.principal_payment[month] + schedule.interest_payment[month])
+
+    def test_exact_schedule_ends_at_zero_and_tracks_the_float_engine(self):
+        for plan in ({}, {month: 4000.0 for month in range(1, 361)},
+                     PrepaymentPlan([PrepaymentRule(12, 12, None, 25000.0)], horizon=360)):
+            for mode in ROUNDING_MODES:
+                exact = self.calculator.exact_schedule(plan, rounding=mode)
+                self.assertBalanced(exact, 40000000)
+                floating = self.calculator.get_amortization_schedule(plan)
+                self.assertEqual(len(exact), len(floating))
+                # Rounded payments and interest only shift the total interest by a few dollars.
+                self.assertLess(abs(exact.total_interest() / 100 - floating.total_interest()),
+                                1e-4 * floating.total_interest())
+
+    def test_final_payment_true_up(self):
+        # Rounding the payment down leaves a slightly larger final payment.
+        schedule = amortize_cents(40000000, 63750, 360, payment_rounding="down")
+        self.assertEqual(len(schedule), 360)
+        self.assertGreater(schedule.payment[-1], schedule.payment[0])
+        self.assertBalanced(schedule, 40000000)
+
+    def test_overpaying_prepayment(self):
+        schedule = amortize_cents(1000000, 50000, 120, {3: 20000.0})
+        self.assertEqual(len(schedule), 3)
+        self.assertEqual(schedule.payment[-1], 0)
+        self.assertBalanced(schedule, 1000000)
+
+    def test_to_dollars(self):
+        schedule = self.calculator.exact_schedule()
+        dollars = schedule.to_dollars()
+        self.assertEqual(dollars.payment[0], schedule.payment[0] / 100)
+        self.assertEqual(dollars.balance[-1], 0.0)
+
+    def test_rate_schedules_are_rejected(self):
+        self.calculator.rate_schedule = RateSchedule({61: 7.0})
+        with self.assertRaises(ValueError):
+            self.calculator.exact_schedule()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,82 @@
+# tests/test_costcompare.py
+
+import unittest
+from mortgage.calculator import MortgageCalculator
+from mortgage.costcompare import CostComparison
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is an optional dependency.
+    np = None
+
+
+class TestCostComparison(unittest.TestCase):
+    def setUp(self):
+        self.comparison = CostComparison()
+
+    def test_interest_comes_from_the_amortization(self):
+        calculator = MortgageCalculator(450000, 90000, 30, 6.625)
+        summary = calculator.summarize({month: 4250 for month in range(1, 361)})
+        modest = self.comparison.housing()["Worst-Case"]["modest"]
+        self.assertAlmostEqual(modest["interest"], summary.total_interest, places=6)
+        self.assertEqual(modest["payoff_month"], summary.final_month)
+        self.assertEqual(modest["total"], 450000 + 18000 + summary.total_interest)
+        upscale = self.comparison.housing()["Best-Case"]["upscale"]
+        self.assertEqual((upscale["effective_price"], upscale["closing_cost"]), (680000, 28000))
+
+    def test_matches_the_original_formulas(self):
+        result = self.comparison.evaluate(num_children=2, highest_grade_tuition=14596)
+        elementary_tuition = 14596 * 0.57
+        self.assertAlmostEqual(result["tuition"]["1"]["total"], (9 * elementary_tuition + 4 * 14596) * 2)
+        self.assertAlmostEqual(result["tuition"]["2A"]["total"], 6 * elementary_tuition * 2)
+        self.assertEqual(result["tuition"]["3"]["total"], 0)
+        self.assertAlmostEqual(result["future_values"]["upscale"], 680000 * 1.035 ** 15)
+        worst = result["cases"]["Worst-Case"]
+        housing = self.comparison.housing()["Worst-Case"]["modest"]["total"]
+        self.assertAlmostEqual(worst["2B"]["total"], housing + 9 * elementary_tuition * 2)
+        self.assertAlmostEqual(worst["2B"]["net_asset"], 450000 * 1.035 ** 15 - worst["2B"]["total"])
+
+    def test_spec_overrides(self):
+        comparison = CostComparison({"household": {"years": 10},
+                                     "cases": {"Cash": {"modest": {"prepayment_amount": 1e6},
+                                                        "upscale": {"prepayment_amount": 1e6}}}})
+        self.assertEqual(list(comparison.cases), ["Cash"])
+        self.assertEqual(comparison.household["num_children"], 1)
+        # Paid off with the first payment: one month of interest.
+        self.assertEqual(comparison.housing()["Cash"]["modest"]["payoff_month"], 1)
+        with self.assertRaises(ValueError):
+            CostComparison({"options": [{"key": "4", "label": "Rent", "home": "apartment"}]})
+
+    def test_markdown(self):
+        markdown = self.comparison.to_markdown()
+        self.assertIn("## Cost-Benefit Analysis Over 15 Years: Worst-Case vs. Best-Case", markdown)
+        self.assertIn("| **2A. Hybrid: Private K–5 then Public** | \\$", markdown)
+        self.assertIn("  - Private Elementary (K–5 for 6 yrs): ", markdown)
+        self.assertIn("  - Private Elementary/Middle (K–8 for 9 yrs): ", markdown)
+        self.assertIn("- Closing Costs (4% of \\$700K): \\$**28,000**", markdown)
+        self.assertEqual(markdown.count("| Option "), 4)
+        self.assertIn("- **Total Tuition:** \\$0", markdown)
+
+    @unittest.skipIf(np is None, "NumPy is required for evaluate_households")
+    def test_households_match_evaluate(self):
+        children = np.array([1, 2, 3, 2])
+        tuition = np.array([14596, 27950, 37300, 20000])
+        growth = np.array([0.02, 0.035, 0.05, 0.0])
+        result = self.comparison.evaluate_households(num_children=children, highest_grade_tuition=tuition,
+                                                     annual_growth_rate=growth)
+        self.assertEqual(result["net_asset"].shape, (4, 2, 4))
+        for i in range(4):
+            expected = self.comparison.evaluate(num_children=children[i], highest_grade_tuition=tuition[i],
+                                                annual_growth_rate=growth[i])
+            for c, case in enumerate(self.comparison.cases):
+                for o, option in enumerate(self.comparison.options):
+                    expected_costs = expected["cases"][case][option["key"]]
+                    self.assertAlmostEqual(result["tuition"][i, o], expected_costs["tuition"], places=6)
+                    for field in ("housing", "total", "net_asset"):
+                        self.assertAlmostEqual(result[field][i, c, o], expected_costs[field], places=6)
+        with self.assertRaises(ValueError):
+            self.comparison.evaluate_households(pets=[1])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,86 @@
+# tests/test_export.py
+
+import csv
+import io
+import os
+import tempfile
+import unittest
+from mortgage.calculator import MortgageCalculator
+from utils.export import HEADER, INDEX_ENTRY, RECORD, ScheduleReader, ScheduleWriter, write_csv, write_markdown
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is an optional dependency.
+    np = None
+
+
+class TestScheduleExport(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "schedules.bin")
+        calculator = MortgageCalculator(home_value=500000, down_payment=100000, loan_term=30, interest_rate=6.375)
+        self.schedules = [calculator.get_amortization_schedule({}),
+                          calculator.get_amortization_schedule({month: 5000 for month in range(1, 361)})]
+        with ScheduleWriter(self.path) as writer:
+            for loan_id, schedule in zip((1001, 1002), self.schedules):
+                writer.write(schedule, loan_id=loan_id)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_round_trip(self):
+        with ScheduleReader(self.path) as reader:
+            self.assertEqual(len(reader), 2)
+            self.assertEqual(reader.loan_ids(), [1001, 1002])
+            self.assertEqual(reader.num_months(1), len(self.schedules[1]))
+            self.assertEqual(reader.schedule(reader.position(1002)), self.schedules[1])
+        header_and_index = os.path.getsize(self.path) - RECORD.size * sum(map(len, self.schedules))
+        self.assertEqual(header_and_index, HEADER.size + 2 * INDEX_ENTRY.size + len("10011002"))
+
+    def test_string_loan_ids(self):
+        path = os.path.join(self.directory.name, "batch.bin")
+        with ScheduleWriter(path) as writer:
+            for loan_id, schedule in zip(("loan-a", 7, "ünïcode"), self.schedules + self.schedules[:1]):
+                writer.write(schedule, loan_id=loan_id)
+        with ScheduleReader(path) as reader:
+            self.assertEqual(reader.loan_ids(), ["loan-a", 7, "ünïcode"])
+            self.assertEqual(reader.schedule(reader.position("loan-a")), self.schedules[0])
+            self.assertEqual(reader.schedule(reader.position(7)), self.schedules[1])
+
+    def test_month_range_slice(self):
+        with ScheduleReader(self.path) as reader:
+            window = reader.schedule(0, start_month=60, end_month=72)
+            self.assertEqual(list(window.month), list(range(60, 73)))
+            self.assertEqual(window, self.schedules[0][59:72])
+            self.assertEqual(len(reader.schedule(1, start_month=1000)), 0)
+
+    @unittest.skipIf(np is None, "NumPy is not installed")
+    def test_numpy_view(self):
+        with ScheduleReader(self.path) as reader:
+            records = reader.to_numpy(0, start_month=1, end_month=12)
+            self.assertEqual(records["month"].tolist(), list(range(1, 13)))
+            self.assertEqual(records["balance"].tolist(), self.schedules[0].balance[:12].tolist())
+        # Closing the reader while a view is alive leaves the map to the view.
+        self.assertEqual(records["month"].tolist(), list(range(1, 13)))
+
+    def test_text_writers(self):
+        csv_output = io.StringIO()
+        write_csv(self.schedules[0][:2], csv_output, loan_id=7)
+        lines = csv_output.getvalue().splitlines()
+        self.assertEqual(lines[0], "loan_id,month,payment,principal_payment,interest_payment,extra_payment,balance")
+        self.assertTrue(lines[1].startswith("7,1,2495.48,370.48,2125.00,0.00,"))
+
+        csv_output = io.StringIO()
+        write_csv(self.schedules[0][:2], csv_output, loan_id='loan "a", b')
+        rows = list(csv.reader(io.StringIO(csv_output.getvalue())))
+        self.assertEqual([row[:2] for row in rows[1:]], [['loan "a", b', "1"], ['loan "a", b', "2"]])
+
+        markdown_output = io.StringIO()
+        write_markdown(self.schedules[0], markdown_output)
+        lines = markdown_output.getvalue().splitlines()
+        self.assertEqual(len(lines), 2 + 360)
+        self.assertTrue(lines[2].startswith("| 1 | 2,495.48 |"))
+
+
+if __name__ == '__main__':
+    unittest.main()
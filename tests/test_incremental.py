@@ -0,0 +1,71 @@
+# tests/test_incremental.py
+
+import unittest
+from mortgage.cache import ScheduleCache
+from mortgage.calculator import MortgageCalculator
+from mortgage.incremental import IncrementalSchedule
+from mortgage.rates import RateSchedule
+
+
+class TestIncrementalSchedule(unittest.TestCase):
+    def setUp(self):
+        self.calculator = MortgageCalculator(500000, 100000, 30, 6.375, cache=ScheduleCache(maxsize=0))
+        self.plan = {month: 500 for month in range(1, 361, 12)}
+        self.plan[37] = 20000
+
+    def assertMatchesFullRecompute(self, incremental):
+        expected = self.calculator.get_amortization_schedule(dict(incremental.prepayments))
+        # Bit-identical, not merely close.
+        self.assertEqual(incremental.schedule, expected)
+
+    def test_modify_add_and_remove(self):
+        incremental = IncrementalSchedule(self.calculator, self.plan)
+        self.assertMatchesFullRecompute(incremental)
+
+        incremental.set_prepayment(37, 35000)
+        self.assertEqual(incremental.recomputed_months, len(incremental.schedule) - 36)
+        self.assertMatchesFullRecompute(incremental)
+
+        incremental.add_prepayment(200, 10000)
+        self.assertMatchesFullRecompute(incremental)
+        incremental.add_prepayment(200, 5000)
+        self.assertEqual(incremental.prepayments[200], 15000)
+        self.assertMatchesFullRecompute(incremental)
+
+        incremental.remove_prepayment(37)
+        self.assertNotIn(37, incremental.prepayments)
+        self.assertMatchesFullRecompute(incremental)
+
+        incremental.update({100: 1000, 50: 2000, 61: 0})
+        self.assertEqual(incremental.recomputed_months, len(incremental.schedule) - 49)
+        self.assertMatchesFullRecompute(incremental)
+
+    def test_unchanged_edit_recomputes_nothing(self):
+        incremental = IncrementalSchedule(self.calculator, self.plan)
+        incremental.set_prepayment(37, 20000)
+        self.assertEqual(incremental.recomputed_months, 0)
+
+    def test_edits_around_payoff(self):
+        incremental = IncrementalSchedule(self.calculator, self.plan)
+        incremental.set_prepayment(120, 1000000)  # Pays the loan off in month 120.
+        self.assertEqual(incremental.schedule.final_month, 120)
+        self.assertMatchesFullRecompute(incremental)
+        incremental.set_prepayment(300, 5000)  # After the payoff: no effect.
+        self.assertEqual(incremental.recomputed_months, 0)
+        self.assertMatchesFullRecompute(incremental)
+        incremental.remove_prepayment(120)
+        self.assertMatchesFullRecompute(incremental)
+
+    def test_rate_resets_and_loan_changes(self):
+        self.calculator.rate_schedule = RateSchedule.arm(5.5, [7.0, 8.0, 6.0] + [6.5] * 22)
+        incremental = IncrementalSchedule(self.calculator, self.plan)
+        incremental.set_prepayment(90, 15000)
+        self.assertMatchesFullRecompute(incremental)
+
+        self.calculator.interest_rate = 5.0
+        incremental.set_prepayment(90, 10000)
+        self.assertMatchesFullRecompute(incremental)
+
+
+if __name__ == '__main__':
+    unittest.main()
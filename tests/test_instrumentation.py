@@ -0,0 +1,114 @@
+# tests/test_instrumentation.py
+
+import json
+import os
+import tempfile
+import unittest
+import urllib.request
+from mortgage.cache import ScheduleCache
+from mortgage.calculator import MortgageCalculator
+from mortgage.instrumentation import METRICS, Histogram, Metrics, profiling, serve_metrics
+from mortgage.plan import PrepaymentPlan
+from mortgage.prepayment import solve_prepayment_amount
+
+DETAILS = {"home_value": 500000, "down_payment": 100000, "loan_term": 30, "interest_rate": 6.375}
+
+
+class TestMetrics(unittest.TestCase):
+    def setUp(self):
+        METRICS.reset()
+        METRICS.enable()
+        self.addCleanup(METRICS.disable)
+        self.addCleanup(METRICS.reset)
+        self.calculator = MortgageCalculator(**DETAILS, cache=ScheduleCache(maxsize=8))
+
+    def test_disabled_registry_records_nothing(self):
+        METRICS.disable()
+        self.calculator.get_amortization_schedule({12: 5000})
+        solve_prepayment_amount(DETAILS, 120)
+        self.assertEqual(METRICS.snapshot(), {"counters": {}, "histograms": {}})
+
+    def test_schedule_and_cache_counters(self):
+        plan = {12: 5000}
+        schedule = self.calculator.get_amortization_schedule(plan)
+        self.calculator.get_amortization_schedule(plan)
+        counters = METRICS.counters
+        self.assertEqual(counters["schedule.built"], 1)
+        self.assertEqual(counters["schedule.months_simulated"], len(schedule))
+        self.assertEqual(counters["prepayment.lookups"], len(schedule))
+        self.assertEqual(counters["cache.hits"], 1)
+        self.assertEqual(counters["cache.misses"], 1)
+        self.assertEqual(METRICS.histograms["schedule.build_seconds"].count, 1)
+
+    def test_summary_with_horizon_counts_simulated_months(self):
+        self.calculator.summarize(horizon=60)
+        self.assertEqual(METRICS.counters["schedule.months_simulated"], 60)
+        self.assertNotIn("prepayment.lookups", METRICS.counters)
+
+    def test_solver_iterations(self):
+        solve_prepayment_amount(DETAILS, 120)
+        self.assertEqual(METRICS.counters["solver.iterations"], 0)
+        solve_prepayment_amount(DETAILS, 120, verify=True)
+        self.assertEqual(METRICS.counters["solver.calls"], 2)
+        self.assertGreaterEqual(METRICS.counters["solver.iterations"], 1)
+        self.assertEqual(METRICS.histograms["solver.seconds"].count, 2)
+
+    def test_persistence_timings(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "plan.json")
+            PrepaymentPlan(overrides={12: 5000}).save(path)
+            PrepaymentPlan.load(path)
+        self.assertEqual(METRICS.histograms["persistence.plan_save_seconds"].count, 1)
+        self.assertEqual(METRICS.histograms["persistence.plan_load_seconds"].count, 1)
+
+    def test_exports(self):
+        self.calculator.get_amortization_schedule()
+        text = METRICS.to_prometheus()
+        self.assertIn("# TYPE mortgage_schedule_built_total counter", text)
+        self.assertIn("mortgage_schedule_built_total 1", text)
+        self.assertIn('mortgage_schedule_build_seconds_bucket{le="+Inf"} 1', text)
+        self.assertIn("mortgage_schedule_build_seconds_count 1", text)
+        data = json.loads(METRICS.to_json())
+        self.assertEqual(data["counters"]["schedule.built"], 1)
+
+    def test_metrics_endpoint(self):
+        self.calculator.get_amortization_schedule()
+        server = serve_metrics(port=0)
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+        base = f"http://127.0.0.1:{server.server_address[1]}"
+        with urllib.request.urlopen(base + "/metrics") as response:
+            self.assertIn("mortgage_schedule_built_total 1", response.read().decode())
+        with urllib.request.urlopen(base + "/metrics.json") as response:
+            self.assertEqual(json.load(response)["counters"]["schedule.built"], 1)
+
+
+class TestHistogram(unittest.TestCase):
+    def test_buckets(self):
+        histogram = Histogram(buckets=(0.1, 1.0, float("inf")))
+        for value in (0.05, 0.1, 0.5, 2.0):
+            histogram.observe(value)
+        self.assertEqual(histogram.counts, [2, 1, 1])
+        self.assertEqual(histogram.count, 4)
+        self.assertAlmostEqual(histogram.sum, 2.65)
+
+    def test_disabled_timer_is_shared(self):
+        metrics = Metrics()
+        self.assertIs(metrics.timer("a"), metrics.timer("b"))
+
+
+class TestProfiling(unittest.TestCase):
+    def test_profile_report_and_dump(self):
+        calculator = MortgageCalculator(**DETAILS, cache=ScheduleCache(maxsize=0))
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "profile.out")
+            with profiling(path) as profiler:
+                calculator.get_amortization_schedule()
+            self.assertTrue(os.path.exists(path))
+        report = profiler.report(limit=5)
+        self.assertIn("_iter_rows", report)
+        self.assertIn("Top allocations", report)
+
+
+if __name__ == '__main__':
+    unittest.main()
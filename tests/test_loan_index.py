@@ -0,0 +1,102 @@
+# tests/test_loan_index.py
+
+import unittest
+from unittest import mock
+from mortgage.calculator import MortgageCalculator
+from utils import loan_index
+from utils.loan_index import LoanBookIndex
+from utils.scenario_store import Scenario, ScenarioStore
+
+DETAILS = {"home_value": 500000.0, "down_payment": 100000.0, "loan_term": 30, "interest_rate": 6.375}
+
+
+def _scenarios():
+    scenarios = []
+    for i in range(12):
+        details = dict(DETAILS, home_value=300000.0 + 25000 * i, interest_rate=4.0 + i / 4,
+                       loan_term=15 if i % 3 == 0 else 30)
+        plan = {month: 500.0 * (i % 4) for month in range(1, 361)} if i % 4 else None
+        scenarios.append(Scenario(f"loan-{i:02d}", details, plan))
+    return scenarios
+
+
+class TestLoanBookIndex(unittest.TestCase):
+    def setUp(self):
+        self.store = ScenarioStore(":memory:")
+        self.store.save_many(_scenarios())
+        self.index = LoanBookIndex(self.store)
+
+    def tearDown(self):
+        self.store.close()
+
+    def _check_against_schedules(self):
+        for scenario in self.store.find():
+            schedule = MortgageCalculator(**scenario.details).get_amortization_schedule(
+                scenario.plan.to_dict() if scenario.plan else None)
+            entry = self.index.get(scenario.name)
+            self.assertEqual(entry["payoff_month"], len(schedule))
+            self.assertAlmostEqual(entry["total_interest"], sum(schedule.interest_payment), places=4)
+            self.assertEqual(list(entry["checkpoints"]), list(range(12, len(schedule), 12)))
+            for month, (balance, paid, remaining) in entry["checkpoints"].items():
+                self.assertAlmostEqual(balance, schedule.balance[month - 1], places=4)
+                self.assertAlmostEqual(paid, sum(schedule.interest_payment[:month]), places=4)
+                self.assertAlmostEqual(paid + remaining, entry["total_interest"], places=4)
+
+    def test_entries_match_simulated_schedules(self):
+        self.assertEqual(self.index.refresh(), 12)
+        self._check_against_schedules()
+
+    def test_closed_form_entries_without_numpy(self):
+        with mock.patch.object(loan_index, "amortize_batch", None):
+            self.assertEqual(self.index.refresh(), 12)
+        self._check_against_schedules()
+
+    def test_refresh_is_incremental(self):
+        self.index.refresh()
+        self.assertEqual(self.index.refresh(), 0)
+        self.store.save("loan-01", dict(DETAILS, interest_rate=8.0))
+        self.store.save("new", DETAILS, {12: 50000.0})
+        self.store.delete("loan-02")
+        self.assertEqual(self.index.refresh(), 2)
+        self.assertEqual(len(self.index), 12)
+        self.assertIsNone(self.index.get("loan-02"))
+        self.assertEqual(self.index.get("loan-01")["payoff_month"], 360)
+        self._check_against_schedules()
+
+        # The index persists with the store.
+        self.assertEqual(LoanBookIndex(self.store).refresh(), 0)
+
+    def test_queries(self):
+        self.index.refresh()
+        entries = {name: self.index.get(name) for name in self.store.names()}
+
+        payoffs = sorted((entry["payoff_month"], name) for name, entry in entries.items())
+        self.assertEqual(self.index.payoff_range(first=100, last=250),
+                         [(name, month) for month, name in payoffs if 100 <= month <= 250])
+        self.assertEqual(len(self.index.payoff_range(limit=3)), 3)
+
+        at_month = {name: entry["checkpoints"].get(120, (0.0, entry["total_interest"], 0.0))
+                    for name, entry in entries.items()}
+        self.assertEqual(self.index.balance_range(120, high=200000.0),
+                         sorted(((name, values[0]) for name, values in at_month.items() if values[0] <= 200000.0),
+                                key=lambda row: (row[1], row[0])))
+        self.assertIn(0.0, [balance for _, balance in self.index.balance_range(120, high=0.0)])
+        self.assertNotIn(0.0, [balance for _, balance in self.index.balance_range(120, low=1.0)])
+
+        outstanding = [(name, entry["checkpoints"][60][2]) for name, entry in entries.items()
+                       if 60 in entry["checkpoints"]]
+        self.assertEqual(self.index.top(3, month=60),
+                         sorted(outstanding, key=lambda row: (-row[1], row[0]))[:3])
+        self.assertEqual(self.index.top(2, "total_interest", largest=False),
+                         sorted(((name, entry["total_interest"]) for name, entry in entries.items()),
+                                key=lambda row: (row[1], row[0]))[:2])
+        with self.assertRaises(ValueError):
+            self.index.top(3, month=61)
+        with self.assertRaises(ValueError):
+            self.index.top(3, "payoff_month", month=60)
+        with self.assertRaises(ValueError):
+            self.index.top(3, "interest")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,98 @@
+# tests/test_main.py
+
+import io
+import json
+import os
+import unittest
+from contextlib import redirect_stderr, redirect_stdout
+from unittest.mock import patch
+from main import main, parse_one_shot
+from mortgage.calculator import MortgageCalculator
+from mortgage.prepayment import get_project_root
+from utils.paths import data_path, project_root
+
+
+LOAN = {"home_value": 500000, "down_payment": 100000, "loan_term": 30, "interest_rate": 6.375}
+
+
+class TestOneShotMode(unittest.TestCase):
+    def run_main(self, *argv) -> str:
+        out = io.StringIO()
+        with redirect_stdout(out):
+            main(list(argv))
+        return out.getvalue()
+
+    def test_fast_parser(self):
+        args = parse_one_shot(["--principal", "400000", "--rate", "6.375", "--json"])
+        self.assertEqual((args.principal, args.rate, args.term, args.prepayment, args.json),
+                         (400000.0, 6.375, 30, 0.0, True))
+        # Anything else is left to argparse.
+        self.assertIsNone(parse_one_shot(["--principal", "400000"]))
+        self.assertIsNone(parse_one_shot(["--principal", "x", "--rate", "6"]))
+        self.assertIsNone(parse_one_shot(["--principal", "400000", "--rate", "6", "--batch", "loans.csv"]))
+
+    def test_invalid_loans_are_rejected(self):
+        for argv in (["--principal", "400000", "--rate", "6", "--term", "0"],
+                     ["--principal", "0", "--rate", "6"],
+                     ["--principal", "-400000", "--rate", "6"],
+                     ["--principal", "nan", "--rate", "6"],
+                     ["--principal", "400000", "--rate", "-1200"],
+                     ["--principal", "400000", "--rate", "6", "--prepayment", "-500"]):
+            self.assertIsNone(parse_one_shot(argv), argv)
+            with self.assertRaises(SystemExit) as raised, redirect_stderr(io.StringIO()):
+                self.run_main(*argv)
+            self.assertEqual(raised.exception.code, 2, argv)
+
+    def test_matches_the_calculator(self):
+        result = json.loads(self.run_main("--principal", "400000", "--rate", "6.375", "--term", "15",
+                                          "--prepayment", "500", "--json"))
+        calculator = MortgageCalculator(400000, 0, 15, 6.375)
+        summary = calculator.summarize({month: 500 for month in range(1, 181)})
+        self.assertAlmostEqual(result["monthly_payment"], calculator.monthly_payment, places=8)
+        self.assertEqual(result["payoff_month"], summary.final_month)
+        self.assertAlmostEqual(result["total_interest"], summary.total_interest, places=4)
+
+    def test_text_output(self):
+        output = self.run_main("--principal", "400000", "--rate", "6.375")
+        self.assertIn("Monthly Payment: $2,495.48", output)
+        self.assertIn("Loan is paid off in 30 year(s).", output)
+
+    def test_payoff_wording_matches_the_updated_summary(self):
+        output = self.run_main("--principal", "30000", "--rate", "6", "--prepayment", "4000")
+        summary = io.StringIO()
+        with redirect_stdout(summary):
+            MortgageCalculator(30000, 0, 30, 6).print_updated_summary({month: 4000 for month in range(1, 361)})
+        payoff_line = next(line for line in summary.getvalue().splitlines() if line.startswith("Loan is paid off"))
+        self.assertEqual(payoff_line, "Loan is paid off in 8 month(s).")
+        self.assertIn(payoff_line, output.splitlines())
+
+
+class TestInteractiveMode(unittest.TestCase):
+    def run_interactive(self, answers, *argv) -> tuple:
+        out = io.StringIO()
+        with patch("utils.mortgage_details.get_mortgage_details", return_value=dict(LOAN)), \
+                patch("builtins.input", side_effect=answers) as prompts, redirect_stdout(out):
+            main(list(argv))
+        return prompts.call_count, out.getvalue()
+
+    def test_what_if_changes_are_opt_in(self):
+        # Skip prepayments and the schedule; the flow ends after the updated summary.
+        prompts, _ = self.run_interactive(["", "n"])
+        self.assertEqual(prompts, 2)
+        prompts, output = self.run_interactive(["", "n", "rate 5.5", "term 0", ""], "--what-if")
+        self.assertEqual(prompts, 5)
+        self.assertIn("Interest Rate: 5.50%", output)
+        self.assertIn("The loan term must be at least 1 year.", output)
+
+
+class TestPaths(unittest.TestCase):
+    def test_project_root_is_cached(self):
+        self.assertIs(project_root(), project_root())
+        self.assertEqual(get_project_root(), project_root())
+        self.assertTrue(os.path.isdir(os.path.join(project_root(), "src")))
+        self.assertEqual(data_path("data/mortgage_details.json"),
+                         os.path.join(project_root(), "data", "mortgage_details.json"))
+
+
+if __name__ == '__main__':
+    unittest.main()
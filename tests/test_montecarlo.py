@@ -0,0 +1,74 @@
+# tests/test_montecarlo.py
+
+import unittest
+from mortgage.calculator import MortgageCalculator
+
+try:
+    import numpy as np
+    from mortgage.montecarlo import MonteCarloConfig, run_monte_carlo
+except ImportError:  # NumPy is an optional dependency.
+    np = None
+
+
+@unittest.skipIf(np is None, "NumPy is required for the Monte Carlo engine")
+class TestMonteCarlo(unittest.TestCase):
+    def test_deterministic_paths_match_calculator(self):
+        # With no volatility and a fixed rate every path is the calculator's schedule.
+        config = MonteCarloConfig(home_value=500000, down_payment=100000, interest_rate=6.375,
+                                  monthly_prepayment=300, annual_growth_rate=0.035, horizon_years=15)
+        result = run_monte_carlo(config, paths=10, seed=1)
+
+        calculator = MortgageCalculator(500000, 100000, 30, 6.375)
+        schedule = calculator.get_amortization_schedule({month: 300 for month in range(1, 361)})
+        expected_interest = sum(row['interest_payment'] for row in schedule[:180])
+        np.testing.assert_allclose(result.outputs["total_interest"], expected_interest, rtol=1e-9)
+        np.testing.assert_allclose(result.outputs["ending_balance"], schedule[179]['balance'], atol=0.01)
+        np.testing.assert_allclose(result.outputs["home_value"], 500000 * 1.035 ** 15, rtol=1e-9)
+
+    def test_reproducible_across_workers(self):
+        config = MonteCarloConfig(fixed_period_months=60, monthly_prepayment=500, prepayment_volatility=0.5,
+                                  appreciation_volatility=0.1, annual_tuition=20000, tuition_years=4)
+        serial = run_monte_carlo(config, paths=1000, seed=7, chunk_size=300)
+        parallel = run_monte_carlo(config, paths=1000, seed=7, chunk_size=300, workers=2)
+        for field, values in serial.outputs.items():
+            np.testing.assert_array_equal(values, parallel.outputs[field])
+
+        different = run_monte_carlo(config, paths=1000, seed=8, chunk_size=300)
+        self.assertFalse(np.array_equal(serial.outputs["total_interest"], different.outputs["total_interest"]))
+
+    def test_arm_resets_respect_caps(self):
+        config = MonteCarloConfig(interest_rate=6.0, fixed_period_months=60, index_volatility=3.0,
+                                  periodic_cap=2.0, lifetime_cap=5.0)
+        result = run_monte_carlo(config, paths=2000, seed=3)
+        rates = result.outputs["ending_rate"]
+        self.assertLessEqual(rates.max(), 11.0 + 1e-9)
+        self.assertGreaterEqual(rates.min(), config.rate_floor - 1e-9)
+        self.assertGreater(rates.std(), 0)
+
+        percentiles = result.percentiles("total_interest")
+        self.assertLessEqual(percentiles[5], percentiles[50])
+        self.assertLessEqual(percentiles[50], percentiles[95])
+
+    def test_memory_budget_limits_chunk_size(self):
+        config = MonteCarloConfig(horizon_years=1)
+        small_budget = run_monte_carlo(config, paths=500, seed=0, chunk_size=500, memory_budget_mb=0.01)
+        self.assertEqual(len(small_budget), 500)
+
+    def test_memory_budget_does_not_depend_on_workers(self):
+        config = MonteCarloConfig(horizon_years=2, monthly_prepayment=500, prepayment_volatility=0.5)
+        serial = run_monte_carlo(config, paths=1000, seed=5, chunk_size=1000, memory_budget_mb=0.1)
+        parallel = run_monte_carlo(config, paths=1000, seed=5, chunk_size=1000, memory_budget_mb=0.1, workers=2)
+        np.testing.assert_array_equal(serial.outputs["total_interest"], parallel.outputs["total_interest"])
+
+    def test_prepayment_that_clears_the_balance_pays_off(self):
+        config = MonteCarloConfig(home_value=100000, down_payment=20000, interest_rate=6.0,
+                                  monthly_prepayment=5000, horizon_years=5)
+        result = run_monte_carlo(config, paths=5, seed=0)
+        schedule = MortgageCalculator(100000, 20000, 30, 6.0).get_amortization_schedule(
+            {month: 5000 for month in range(1, 361)})
+        self.assertEqual(result.paid_off_share(), 1.0)
+        self.assertEqual(result.outputs["payoff_month"].tolist(), [len(schedule)] * 5)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,74 @@
+# tests/test_plan.py
+
+import os
+import json
+import tempfile
+import unittest
+from mortgage.calculator import MortgageCalculator
+from mortgage.plan import PrepaymentPlan, PrepaymentRule
+
+
+class TestPrepaymentPlan(unittest.TestCase):
+    def setUp(self):
+        self.plan = PrepaymentPlan(
+            rules=[PrepaymentRule(start_month=1, frequency_months=1, count=None, amount=4000.0),
+                   PrepaymentRule(start_month=12, frequency_months=12, count=3, amount=10000.0)],
+            overrides={5: 0, 7: 25000.0},
+            horizon=360,
+        )
+
+    def test_behaves_like_a_month_dict(self):
+        self.assertEqual(self.plan[1], 4000.0)
+        self.assertEqual(self.plan[12], 14000.0)
+        self.assertEqual(self.plan[7], 25000.0)
+        self.assertEqual(self.plan.get(5, 0), 0)
+        self.assertNotIn(5, self.plan)
+        self.assertNotIn(361, self.plan)
+        self.assertEqual(len(self.plan), 359)
+        self.assertEqual(list(self.plan)[:6], [1, 2, 3, 4, 6, 7])
+
+    def test_schedule_matches_expanded_dict(self):
+        calculator = MortgageCalculator(home_value=699000, down_payment=139800, loan_term=30, interest_rate=6.625)
+        from_plan = calculator.get_amortization_schedule(self.plan)
+        from_dict = calculator.get_amortization_schedule(self.plan.to_dict())
+        self.assertEqual(from_plan, from_dict)
+
+    def test_from_dict_compresses_runs(self):
+        schedule = {month: 4000.0 for month in range(1, 361)}
+        schedule.update({12: 9000.0, 400: 1.0})
+        plan = PrepaymentPlan.from_dict(schedule)
+        self.assertEqual(plan.to_dict(), schedule)
+        self.assertEqual(len(plan.rules), 2)
+        self.assertEqual(plan.overrides, {12: 9000.0, 400: 1.0})
+
+    def test_json_round_trip_and_legacy_files(self):
+        with tempfile.TemporaryDirectory() as directory:
+            filename = os.path.join(directory, "plan.json")
+            self.plan.save(filename)
+            self.assertEqual(PrepaymentPlan.load(filename).to_dict(), self.plan.to_dict())
+
+            legacy = {str(month): 4000.0 for month in range(1, 361)}
+            with open(filename, "w") as f:
+                json.dump(legacy, f)
+            loaded = PrepaymentPlan.load(filename, horizon=360)
+        self.assertEqual(loaded.rules, [PrepaymentRule(1, 1, 360, 4000.0)])
+        self.assertEqual(loaded.to_dict(), {int(month): amount for month, amount in legacy.items()})
+
+    def test_indefinite_rule_needs_a_horizon(self):
+        with self.assertRaises(ValueError):
+            PrepaymentPlan([PrepaymentRule(1, 1, None, 100.0)])
+        plan = PrepaymentPlan([PrepaymentRule(1, 1, None, 100.0)], horizon=360)
+        self.assertEqual(plan, {month: 100.0 for month in range(1, 361)})
+        self.assertEqual(len(plan.items()), 360)
+        with self.assertRaises(ValueError):
+            PrepaymentPlan.from_json({"rules": [PrepaymentRule(1, 1, None, 100.0).to_dict()], "horizon": None})
+
+    def test_loading_uses_the_callers_horizon(self):
+        # An open-ended rule saved for a 15-year loan runs for all 360 months of a 30-year one.
+        data = PrepaymentPlan([PrepaymentRule(1, 1, None, 100.0)], horizon=180).to_json()
+        self.assertEqual(len(PrepaymentPlan.from_json(data, horizon=360)), 360)
+        self.assertEqual(len(PrepaymentPlan.from_json(data)), 180)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,10 +1,22 @@
 # tests/test_prepayment.py
 
+import os
+import tempfile
 import unittest
 from unittest.mock import patch
-from mortgage.prepayment import get_prepayment_schedule
+from mortgage.calculator import MortgageCalculator
+from mortgage.plan import PrepaymentPlan
+from mortgage.prepayment import get_prepayment_schedule, get_prepayment_amount, solve_prepayment_amount
 
 class TestPrepayment(unittest.TestCase):
+    def setUp(self):
+        # The entered plan is saved; keep it out of the repository.
+        self.directory = tempfile.TemporaryDirectory()
+        self.filename = os.path.join(self.directory.name, "prepayment_details.json")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
     @patch('builtins.input', side_effect=[
         "y",    # Equal prepayments? (y/yes)
         "1",    # Start month = 1
@@ -14,11 +26,51 @@ class TestPrepayment(unittest.TestCase):
     ])
     def test_get_prepayment_schedule_indefinite(self, mock_inputs):
         # Assume total_payments is 360 (30 years x 12)
-        schedule = get_prepayment_schedule(total_payments=360, filename="data/test_prepayment_details.json")
+        schedule = get_prepayment_schedule(total_payments=360, filename=self.filename)
         # Expect intervals from month 1 to 360 with frequency 1 (i.e., 360 intervals).
         self.assertEqual(len(schedule), 360)
         # Check that a sample month has the correct prepayment amount.
         self.assertEqual(schedule[1], 5000)
+        # The plan is a single open-ended rule, and is saved as one.
+        self.assertEqual([rule.count for rule in schedule.rules], [None])
+        self.assertEqual(PrepaymentPlan.load(self.filename).rules[0].count, None)
+
+
+class TestPrepaymentAmount(unittest.TestCase):
+    def setUp(self):
+        self.details = {'home_value': 500000, 'down_payment': 100000, 'loan_term': 30, 'interest_rate': 6.375}
+        self.calculator = MortgageCalculator(**self.details)
+
+    def test_solve_prepayment_amount_pays_off_at_target(self):
+        # Quarterly prepayments starting in month 7, targeting a 10-year payoff.
+        extra_payment, schedule = solve_prepayment_amount(self.details, 120, 3, 7)
+        self.assertEqual(sorted(schedule), list(range(7, 121, 3)))
+        amortization = self.calculator.get_amortization_schedule(schedule)
+        self.assertEqual(amortization[-1]["month"], 120)
+        # One cent less per prepayment leaves a balance at the target month.
+        short_schedule = {month: extra_payment - 0.01 for month in schedule}
+        self.assertGreater(len(self.calculator.get_amortization_schedule(short_schedule)), 120)
+
+    def test_solve_prepayment_amount_irregular_months(self):
+        extra_payment, schedule = solve_prepayment_amount(self.details, 100, prepayment_months=[5, 17, 40, 41, 150],
+                                                          verify=True)
+        self.assertEqual(sorted(schedule), [5, 17, 40, 41])
+        self.assertEqual(len(self.calculator.get_amortization_schedule(schedule)), 100)
+
+    def test_solve_prepayment_amount_not_needed(self):
+        extra_payment, schedule = solve_prepayment_amount(self.details, 360)
+        self.assertEqual(extra_payment, 0)
+
+    @patch('builtins.print')
+    @patch('builtins.input', side_effect=[
+        "10",   # Desired payoff time in years
+        "1",    # Frequency = 1 (monthly)
+        "1"     # Start month = 1
+    ])
+    def test_get_prepayment_amount(self, mock_inputs, mock_print):
+        extra_payment, schedule = get_prepayment_amount(self.details)
+        self.assertEqual(len(schedule), 120)
+        self.assertEqual((extra_payment, schedule), solve_prepayment_amount(self.details, 120))
 
 if __name__ == '__main__':
     unittest.main()
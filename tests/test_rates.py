@@ -0,0 +1,41 @@
+# tests/test_rates.py
+
+import unittest
+from mortgage.calculator import MortgageCalculator
+from mortgage.rates import RateSchedule
+
+
+class TestRateSchedule(unittest.TestCase):
+    def test_arm_caps(self):
+        # 5/1 ARM starting at 6%: 2% periodic and 5% lifetime caps, 3% floor.
+        rates = RateSchedule.arm(6.0, [10.0, 12.0, 12.0, 1.0, 1.0], floor=3.0)
+        self.assertEqual(sorted(rates.changes.items())[:5],
+                         [(61, 8.0), (73, 10.0), (85, 11.0), (97, 9.0), (109, 7.0)])
+        self.assertEqual(len(rates.changes), 5)
+
+        first_cap = RateSchedule.arm(6.0, 12.0, initial_cap=5.0, periodic_cap=1.0)
+        self.assertEqual(first_cap.changes[61], 11.0)
+        self.assertEqual(len(first_cap.changes), 25)
+
+    def test_rate_at_and_resets(self):
+        rates = RateSchedule({61: 7.0, 73: 8.0}, recasts=[30])
+        self.assertEqual(rates.rate_at(60, 6.0), 6.0)
+        self.assertEqual(rates.rate_at(75, 6.0), 8.0)
+        self.assertEqual(rates.resets(6.0), [(30, 6.0), (61, 7.0), (73, 8.0)])
+
+    def test_json_round_trip(self):
+        rates = RateSchedule({61: 7.0}, recasts=[30])
+        self.assertEqual(RateSchedule.from_json(rates.to_json()), rates)
+        self.assertEqual(RateSchedule().cache_key(), "")
+
+    def test_changing_rate_schedule_changes_schedule(self):
+        calculator = MortgageCalculator(500000, 100000, 30, 6.0)
+        fixed = calculator.get_amortization_schedule()
+        calculator.rate_schedule = RateSchedule({61: 8.0})
+        adjusted = calculator.get_amortization_schedule()
+        self.assertEqual(fixed[59], adjusted[59])
+        self.assertGreater(adjusted[60].payment, fixed[60].payment)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,105 @@
+# tests/test_scenario_store.py
+
+import json
+import os
+import sqlite3
+import tempfile
+import unittest
+from mortgage.calculator import MortgageCalculator
+from mortgage.plan import PrepaymentPlan, PrepaymentRule
+from utils.scenario_store import Scenario, ScenarioStore
+
+DETAILS = {"home_value": 500000.0, "down_payment": 100000.0, "loan_term": 30, "interest_rate": 6.375}
+
+
+class TestScenarioStore(unittest.TestCase):
+    def setUp(self):
+        self.store = ScenarioStore(":memory:")
+
+    def tearDown(self):
+        self.store.close()
+
+    def test_round_trip(self):
+        self.store.save("monthly", DETAILS, {month: 4000.0 for month in range(1, 361)}, borrower="alice")
+        self.store.save("none", DETAILS)
+        scenario = self.store.get("monthly")
+        self.assertEqual(scenario.details, DETAILS)
+        self.assertEqual(scenario.borrower, "alice")
+        # Plans are stored as compact rules and expanded to the loan's horizon.
+        self.assertEqual(scenario.plan.rules, [PrepaymentRule(1, 1, 360, 4000.0)])
+        self.assertEqual(scenario.plan.to_dict(), {month: 4000.0 for month in range(1, 361)})
+        self.assertIsNone(self.store.get("none").plan)
+        self.assertIsNone(self.store.get("missing"))
+        self.assertEqual(len(self.store), 2)
+        self.assertIn("none", self.store)
+        self.assertEqual(self.store.names(), ["monthly", "none"])
+
+    def test_save_replaces(self):
+        self.store.save("loan", DETAILS, borrower="alice")
+        self.store.save("loan", dict(DETAILS, interest_rate=7.0))
+        self.assertEqual(len(self.store), 1)
+        self.assertEqual(self.store.get("loan").details["interest_rate"], 7.0)
+        self.assertIsNone(self.store.get("loan").borrower)
+        self.store.delete("loan")
+        self.assertEqual(len(self.store), 0)
+
+    def test_find(self):
+        self.store.save_many(Scenario(f"loan-{i:02d}", dict(DETAILS, interest_rate=5 + i / 4, loan_term=15 + 15 * (i % 2)),
+                                      borrower="alice" if i < 4 else "bob") for i in range(10))
+        self.assertEqual([scenario.name for scenario in self.store.find(borrower="alice")],
+                         ["loan-00", "loan-01", "loan-02", "loan-03"])
+        self.assertEqual([scenario.name for scenario in self.store.find(loan_term=30, min_rate=6, max_rate=7)],
+                         ["loan-05", "loan-07"])
+        self.assertEqual(len(self.store.find(limit=3)), 3)
+        self.assertEqual(len(self.store.find()), 10)
+
+    def test_summaries_are_cached_until_the_scenario_changes(self):
+        plan = PrepaymentPlan([PrepaymentRule(1, 1, None, 1000.0)], horizon=360)
+        self.store.save("loan", DETAILS, plan)
+        calculator = MortgageCalculator(**DETAILS)
+        expected = calculator.summarize({month: 1000.0 for month in range(1, 361)})
+        summary = self.store.summary("loan")
+        self.assertEqual(summary["payoff_month"], expected.final_month)
+        self.assertAlmostEqual(summary["total_interest"], expected.total_interest, places=6)
+        self.assertAlmostEqual(summary["monthly_payment"], calculator.monthly_payment, places=8)
+        self.assertEqual(self.store._connection.execute("SELECT COUNT(*) FROM summaries").fetchone()[0], 1)
+        self.assertEqual(self.store.summary("loan"), summary)
+
+        self.store.save("loan", DETAILS)
+        self.assertEqual(self.store._connection.execute("SELECT COUNT(*) FROM summaries").fetchone()[0], 0)
+        self.assertEqual(self.store.summary("loan")["payoff_month"], 360)
+        self.store.delete("loan")
+        self.assertEqual(self.store._connection.execute("SELECT COUNT(*) FROM summaries").fetchone()[0], 0)
+        with self.assertRaises(KeyError):
+            self.store.summary("loan")
+
+    def test_transaction_rolls_back(self):
+        with self.assertRaises(KeyError):
+            with self.store.transaction():
+                self.store._connection.execute(
+                    "INSERT INTO scenarios (name, home_value, down_payment, loan_term, interest_rate) "
+                    "VALUES ('partial', 1, 0, 1, 1)")
+                self.store.save("broken", {"home_value": 1})
+        self.assertEqual(len(self.store), 0)
+
+    def test_persists_and_imports_json(self):
+        with tempfile.TemporaryDirectory() as directory:
+            details_file = os.path.join(directory, "mortgage_details.json")
+            prepayment_file = os.path.join(directory, "prepayment_details.json")
+            with open(details_file, "w") as f:
+                json.dump(DETAILS, f)
+            PrepaymentPlan([PrepaymentRule(12, 12, 5, 10000.0)]).save(prepayment_file)
+
+            path = os.path.join(directory, "scenarios.db")
+            with ScenarioStore(path) as store:
+                store.import_json("imported", details_file, prepayment_file, borrower="carol")
+            with ScenarioStore(path) as store:
+                scenario = store.get("imported")
+            self.assertEqual(scenario.details, DETAILS)
+            self.assertEqual(scenario.plan.to_dict(), {12: 10000.0, 24: 10000.0, 36: 10000.0, 48: 10000.0,
+                                                       60: 10000.0})
+            self.assertEqual(sqlite3.connect(path).execute("SELECT borrower FROM scenarios").fetchone()[0], "carol")
+
+
+if __name__ == '__main__':
+    unittest.main()
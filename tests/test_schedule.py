@@ -0,0 +1,77 @@
+# tests/test_schedule.py
+
+import unittest
+from mortgage.calculator import MortgageCalculator
+from itertools import islice
+from mortgage.schedule import SCHEDULE_FIELDS, AmortizationSchedule, ScheduleRow, ScheduleSummary
+
+
+class TestAmortizationSchedule(unittest.TestCase):
+    def setUp(self):
+        self.calculator = MortgageCalculator(home_value=500000, down_payment=100000, loan_term=30,
+                                             interest_rate=6.375)
+        self.schedule = self.calculator.get_amortization_schedule({12: 10000})
+
+    def test_columns_are_compact(self):
+        schedule = self.calculator.get_amortization_schedule({})
+        self.assertEqual(len(schedule), 360)
+        self.assertEqual(schedule.month.typecode, 'i')
+        self.assertEqual(schedule.balance.typecode, 'd')
+        self.assertEqual(schedule.nbytes, 360 * (4 + 5 * 8))
+
+    def test_rows_support_attribute_and_key_access(self):
+        row = self.schedule[11]
+        self.assertIsInstance(row, ScheduleRow)
+        self.assertEqual(row.month, 12)
+        self.assertEqual(row["extra_payment"], 10000)
+        self.assertEqual(row["balance"], self.schedule.balance[11])
+        with self.assertRaises(AttributeError):
+            row.note = "rows have no __dict__"
+        self.assertEqual([entry.month for entry in self.schedule[:3]], [1, 2, 3])
+
+    def test_round_trip_through_dicts(self):
+        rows = self.schedule.to_dicts()
+        self.assertEqual(set(rows[0]), set(SCHEDULE_FIELDS))
+        rebuilt = AmortizationSchedule.from_columns(*([row[field] for row in rows] for field in SCHEDULE_FIELDS))
+        self.assertEqual(rebuilt, self.schedule)
+        self.assertEqual(self.schedule[-1], rows[-1])
+        self.assertAlmostEqual(self.schedule.total_interest(), sum(row["interest_payment"] for row in rows))
+
+
+
+class TestStreamingAmortization(unittest.TestCase):
+    def setUp(self):
+        self.calculator = MortgageCalculator(home_value=500000, down_payment=100000, loan_term=30,
+                                             interest_rate=6.375)
+        self.prepayments = {month: 1000 for month in range(1, 361, 12)}
+        self.schedule = self.calculator.get_amortization_schedule(self.prepayments)
+
+    def test_iter_amortization_matches_schedule(self):
+        self.assertEqual(list(self.calculator.iter_amortization(self.prepayments)), list(self.schedule))
+
+    def test_iter_amortization_is_lazy(self):
+        first_rows = list(islice(self.calculator.iter_amortization(self.prepayments), 60))
+        self.assertEqual(first_rows[-1], self.schedule[59])
+
+    def test_summarize(self):
+        summary = self.calculator.summarize(self.prepayments)
+        self.assertEqual(summary.final_month, self.schedule.final_month)
+        self.assertEqual(summary.payoff_month, self.schedule.final_month)
+        self.assertEqual(summary.total_interest, self.schedule.total_interest())
+        self.assertAlmostEqual(summary.principal_repaid, self.calculator.principal, places=2)
+
+    def test_summarize_stops_at_horizon(self):
+        summary = self.calculator.summarize(self.prepayments, horizon=60)
+        self.assertEqual(summary.final_month, 60)
+        self.assertIsNone(summary.payoff_month)
+        self.assertEqual(summary.balance, self.schedule[59].balance)
+        self.assertAlmostEqual(summary.principal_repaid, self.calculator.principal - summary.balance, places=6)
+
+    def test_empty_summary(self):
+        summary = ScheduleSummary().update([])
+        self.assertEqual(summary.final_month, 0)
+        self.assertIsNone(summary.payoff_month)
+
+
+if __name__ == '__main__':
+    unittest.main()
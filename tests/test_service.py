@@ -0,0 +1,159 @@
+# tests/test_service.py
+
+import asyncio
+import json
+import unittest
+from mortgage.calculator import MortgageCalculator
+from mortgage.instrumentation import METRICS
+from mortgage.plan import PrepaymentPlan
+from service.batching import Batcher
+from service.server import PricingService
+
+LOAN = {"home_value": 500000, "down_payment": 100000, "loan_term": 30, "interest_rate": 6.375}
+
+
+async def request(port: int, method: str, path: str, body: dict = None) -> tuple:
+    """Send one request on a new connection and return (status, headers, body bytes)."""
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    payload = json.dumps(body).encode() if body is not None else b""
+    writer.write(f"{method} {path} HTTP/1.1\r\nHost: localhost\r\nConnection: close\r\n"
+                 f"Content-Length: {len(payload)}\r\n\r\n".encode() + payload)
+    await writer.drain()
+    response = await reader.read()
+    writer.close()
+    head, _, content = response.partition(b"\r\n\r\n")
+    lines = head.decode().split("\r\n")
+    headers = dict(line.lower().split(": ", 1) for line in lines[1:])
+    if headers.get("transfer-encoding") == "chunked":
+        chunks = []
+        while True:
+            size, _, content = content.partition(b"\r\n")
+            size = int(size, 16)
+            if not size:
+                break
+            chunks.append(content[:size])
+            content = content[size + 2:]
+        content = b"".join(chunks)
+    return int(lines[0].split()[1]), headers, content
+
+
+class TestPricingService(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.service = PricingService(workers=0)
+        self.server = await self.service.start("127.0.0.1", 0)
+        self.port = self.server.sockets[0].getsockname()[1]
+        self.calculator = MortgageCalculator(**LOAN)
+
+    async def asyncTearDown(self):
+        self.server.close()
+        await self.server.wait_closed()
+        self.service.close()
+
+    async def test_concurrent_payments_are_batched(self):
+        responses = await asyncio.gather(*(request(self.port, "POST", "/payment", LOAN) for _ in range(20)))
+        for status, _, content in responses:
+            self.assertEqual(status, 200)
+            self.assertAlmostEqual(json.loads(content)["monthly_payment"], self.calculator.monthly_payment, places=6)
+        self.assertLess(self.service.payments.batches, 20)
+
+    async def test_summary(self):
+        body = dict(LOAN, prepayment_amount=1000)
+        status, _, content = await request(self.port, "POST", "/summary", body)
+        self.assertEqual(status, 200)
+        summary = self.calculator.summarize({month: 1000 for month in range(1, 361)})
+        result = json.loads(content)
+        self.assertEqual(result["payoff_month"], summary.final_month)
+        self.assertAlmostEqual(result["total_interest"], summary.total_interest, places=6)
+
+    async def test_streamed_schedule(self):
+        status, headers, content = await request(self.port, "POST", "/schedule?chunk_months=50", LOAN)
+        self.assertEqual(status, 200)
+        self.assertEqual(headers["transfer-encoding"], "chunked")
+        rows = [json.loads(line) for line in content.decode().splitlines()]
+        self.assertEqual(rows, self.calculator.get_amortization_schedule().to_dicts())
+
+        status, _, content = await request(self.port, "POST", "/schedule?format=csv", LOAN)
+        lines = content.decode().splitlines()
+        self.assertEqual(lines[0], "month,payment,principal_payment,interest_payment,extra_payment,balance")
+        self.assertEqual(len(lines), 361)
+
+    async def test_target_payoff(self):
+        status, _, content = await request(self.port, "POST", "/target-payoff", dict(LOAN, target_months=120))
+        self.assertEqual(status, 200)
+        result = json.loads(content)
+        plan = PrepaymentPlan.from_json(result["prepayments"])
+        self.assertGreater(result["extra_payment"], 0)
+        self.assertLessEqual(self.calculator.payoff_month(plan), 120)
+
+    async def test_metrics(self):
+        METRICS.reset()
+        METRICS.enable()
+        self.addCleanup(METRICS.disable)
+        self.addCleanup(METRICS.reset)
+        self.assertEqual((await request(self.port, "POST", "/summary", LOAN))[0], 200)
+        status, headers, content = await request(self.port, "GET", "/metrics")
+        self.assertEqual(status, 200)
+        self.assertTrue(headers["content-type"].startswith("text/plain"))
+        self.assertIn("mortgage_schedule_simulations_total 1", content.decode())
+        status, _, content = await request(self.port, "GET", "/metrics?format=json")
+        self.assertEqual(json.loads(content)["counters"]["schedule.months_simulated"], 360)
+
+    async def test_errors(self):
+        status, _, content = await request(self.port, "POST", "/payment", {"home_value": 1})
+        self.assertEqual(status, 400)
+        self.assertIn("down_payment", json.loads(content)["error"])
+        self.assertEqual((await request(self.port, "GET", "/nowhere"))[0], 404)
+        self.assertEqual((await request(self.port, "GET", "/payment"))[0], 405)
+        self.assertEqual((await request(self.port, "GET", "/health"))[0], 200)
+
+    async def test_invalid_loans_are_rejected_without_failing_their_batch(self):
+        bad_loans = [dict(LOAN, down_payment=LOAN["home_value"]), dict(LOAN, home_value=0),
+                     dict(LOAN, loan_term=0), dict(LOAN, interest_rate="nan")]
+        # Enough good loans for the vectorized summary path.
+        responses = await asyncio.gather(*(request(self.port, "POST", path, loan)
+                                           for path in ("/payment", "/summary")
+                                           for loan in [LOAN] * 40 + bad_loans))
+        statuses = [status for status, _, _ in responses]
+        self.assertEqual(statuses, ([200] * 40 + [400] * len(bad_loans)) * 2)
+
+    async def test_malformed_prepayments_are_rejected(self):
+        for prepayments in ([], {"5": "abc"}):
+            for path in ("/summary", "/schedule"):
+                status, _, content = await request(self.port, "POST", path, dict(LOAN, prepayments=prepayments))
+                self.assertEqual(status, 400, (path, prepayments))
+                self.assertIn("Invalid loan", json.loads(content)["error"])
+
+    async def test_malformed_content_length(self):
+        for length in ("abc", "-1"):
+            reader, writer = await asyncio.open_connection("127.0.0.1", self.port)
+            writer.write(f"POST /payment HTTP/1.1\r\nConnection: close\r\nContent-Length: {length}\r\n\r\n".encode())
+            await writer.drain()
+            response = await reader.read()
+            writer.close()
+            self.assertTrue(response.startswith(b"HTTP/1.1 400 "), response)
+
+
+class TestBatcher(unittest.IsolatedAsyncioTestCase):
+    async def test_batches_and_failures(self):
+        calls = []
+
+        def double(items):
+            calls.append(len(items))
+            if "bad" in items:
+                raise ValueError("bad item")
+            return [item * 2 for item in items]
+
+        batcher = Batcher(double, max_batch=4, max_delay=0.01)
+        self.assertEqual(await asyncio.gather(*(batcher.submit(i) for i in range(10))), [i * 2 for i in range(10)])
+        self.assertEqual(calls, [4, 4, 2])
+        with self.assertRaises(ValueError):
+            await batcher.submit("bad")
+
+        # A bad item fails only its own request, not the rest of its batch.
+        results = await asyncio.gather(*(batcher.submit(item) for item in (1, "bad", 3)), return_exceptions=True)
+        self.assertEqual(results[0::2], [2, 6])
+        self.assertIsInstance(results[1], ValueError)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,113 @@
+# tests/test_session.py
+
+import io
+import unittest
+from contextlib import redirect_stdout
+from mortgage.cache import ScheduleCache
+from mortgage.calculator import MortgageCalculator
+from mortgage.plan import PrepaymentPlan, PrepaymentRule
+from mortgage.session import LoanSession
+
+PLAN = {37: 20000.0, 120: 5000.0}
+
+
+class TestLoanSession(unittest.TestCase):
+    def setUp(self):
+        self.cache = ScheduleCache(maxsize=0)
+        self.session = LoanSession(500000, 100000, 30, 6.375, PLAN, cache=self.cache)
+
+    def assertMatchesCalculator(self, session):
+        calculator = MortgageCalculator(session.home_value, session.down_payment, session.loan_term,
+                                        session.interest_rate, cache=self.cache)
+        self.assertEqual(session.monthly_payment, calculator.monthly_payment)
+        self.assertEqual(session.schedule, calculator.get_amortization_schedule(session.plan))
+        summary = calculator.summarize(session.plan)
+        self.assertEqual((session.summary.final_month, session.summary.total_interest),
+                         (summary.final_month, summary.total_interest))
+        base = calculator.summarize()
+        self.assertAlmostEqual(session.savings["interest_saved"], base.total_interest - summary.total_interest,
+                               places=6)
+
+    def test_lazy_evaluation(self):
+        self.assertEqual(self.session.evaluations, {})
+        self.assertEqual(self.session.principal, 400000)
+        self.assertEqual(self.session.evaluations, {"principal": 1})
+        self.assertMatchesCalculator(self.session)
+        self.assertEqual(self.session.stale(), [])
+        evaluations = dict(self.session.evaluations)
+        self.session.savings
+        self.assertEqual(self.session.evaluations, evaluations)
+
+    def test_rate_change_invalidates_only_payment_dependent_nodes(self):
+        self.assertMatchesCalculator(self.session)
+        invalidated = self.session.set(interest_rate=5.875)
+        self.assertEqual(sorted(invalidated), ["base_summary", "calculator", "monthly_payment", "monthly_rate",
+                                               "savings", "schedule", "summary"])
+        for name in ("principal", "total_payments", "plan"):
+            self.assertNotIn(name, self.session.stale())
+        self.assertMatchesCalculator(self.session)
+        self.assertEqual(self.session.evaluations["plan"], 1)
+        # Setting the same value again changes nothing.
+        self.assertEqual(self.session.set(interest_rate=5.875), [])
+
+    def test_plan_edits_resume_the_schedule(self):
+        self.assertMatchesCalculator(self.session)
+        invalidated = self.session.apply("extra 200 10000")
+        self.assertEqual(sorted(invalidated), ["plan", "savings", "schedule", "summary"])
+        self.assertMatchesCalculator(self.session)
+        self.assertEqual(self.session.recomputed_months, len(self.session.schedule) - 199)
+        self.assertEqual(self.session.evaluations["base_summary"], 1)
+
+        self.session.set_prepayment(37, 0)
+        self.assertEqual(self.session.plan, {120: 5000.0, 200: 10000.0})
+        self.assertMatchesCalculator(self.session)
+
+        # Plans are accepted in any form; an equivalent plan does not invalidate anything.
+        self.session.prepayments = PrepaymentPlan([PrepaymentRule(1, 12, None, 1000.0)], horizon=360)
+        self.assertMatchesCalculator(self.session)
+        self.assertEqual(self.session.set(prepayments=self.session.prepayments), [])
+
+    def test_loan_changes(self):
+        self.session.apply("home 550000")
+        self.session.apply("down 150000")
+        self.session.apply("term 15")
+        self.assertEqual((self.session.principal, self.session.total_payments), (400000, 180))
+        self.assertMatchesCalculator(self.session)
+        for command in ("rate", "rate x", "extra 12", "principal 1"):
+            with self.assertRaises(ValueError):
+                self.session.apply(command)
+        with self.assertRaises(AttributeError):
+            self.session.monthly_payment = 1000
+
+    def test_invalid_changes_are_rejected(self):
+        self.session.savings
+        stale = self.session.stale()
+        for command in ("term 0", "rate -2000", "rate nan", "down 600000", "extra 0 1000", "extra -5 1000",
+                        "extra 361 1000", "extra 12 -500"):
+            with self.assertRaises(ValueError) as raised:
+                self.session.apply(command)
+            self.assertNotIn("Unrecognized", str(raised.exception), command)
+            self.assertEqual(self.session.stale(), stale, command)
+        with self.assertRaises(ValueError):
+            self.session.set(loan_term=15, prepayments={0: 1000.0})
+        self.assertEqual((self.session.loan_term, self.session.plan), (30, PLAN))
+        with self.assertRaises(ValueError):
+            LoanSession(500000, 600000, 30, 6.375)
+
+    def test_reports(self):
+        out = io.StringIO()
+        with redirect_stdout(out):
+            self.session.print_summary()
+            self.session.print_schedule()
+            self.session.print_updated_summary()
+        calculator = MortgageCalculator(500000, 100000, 30, 6.375, cache=self.cache)
+        expected = io.StringIO()
+        with redirect_stdout(expected):
+            calculator.print_summary()
+            calculator.print_schedule(PLAN)
+            calculator.print_updated_summary(PLAN)
+        self.assertEqual(out.getvalue(), expected.getvalue())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,88 @@
+# tests/test_sweep.py
+
+import csv
+import os
+import tempfile
+import unittest
+from mortgage.calculator import MortgageCalculator
+from mortgage.plan import PrepaymentPlan, PrepaymentRule
+from mortgage.sweep import ScenarioGrid, axis_values, evaluate_scenario, merge_parts, run_sweep
+
+try:
+    import pyarrow
+except ImportError:
+    pyarrow = None
+
+
+class TestSweep(unittest.TestCase):
+    def setUp(self):
+        self.spec = {
+            "home_value": [500000],
+            "down_payment": [100000],
+            "interest_rate": {"start": 5.0, "stop": 5.5, "step": 0.125},
+            "loan_term": [15, 30],
+            "prepayment": [0, 1000],
+        }
+
+    def test_grid_expansion(self):
+        self.assertEqual(axis_values({"start": 5.0, "stop": 8.0, "step": 0.125})[-1], 8.0)
+        self.assertEqual(len(axis_values({"start": 5.0, "stop": 8.0, "step": 0.125})), 25)
+        grid = ScenarioGrid(self.spec)
+        self.assertEqual(len(grid), 5 * 2 * 2)
+        self.assertEqual(grid.scenario(0)["interest_rate"], 5.0)
+        self.assertEqual(grid.scenario(3), dict(grid.scenario(0), loan_term=30, prepayment=1000))
+        self.assertEqual(grid.scenario(len(grid) - 1)["interest_rate"], 5.5)
+
+    def test_evaluate_scenario_matches_summary(self):
+        scenario = ScenarioGrid(self.spec).scenario(3)
+        result = evaluate_scenario(scenario)
+        calculator = MortgageCalculator(500000, 100000, 30, 5.0)
+        plan = PrepaymentPlan([PrepaymentRule(1, 1, None, 1000)], horizon=360)
+        summary = calculator.summarize(plan)
+        self.assertEqual(result["payoff_month"], summary.final_month)
+        self.assertAlmostEqual(result["total_interest"], summary.total_interest, places=2)
+
+    def test_run_and_resume(self):
+        with tempfile.TemporaryDirectory() as directory:
+            output_dir = os.path.join(directory, "sweep")
+            stats = run_sweep(self.spec, output_dir, workers=2, chunk_size=6)
+            self.assertEqual((stats["computed"], stats["skipped"]), (20, 0))
+
+            # Lose one chunk, as if the run had been interrupted, and resume.
+            os.remove(os.path.join(output_dir, "part-00001.csv"))
+            stats = run_sweep(self.spec, output_dir, workers=2, chunk_size=6)
+            self.assertEqual((stats["computed"], stats["skipped"]), (6, 14))
+
+            merged = os.path.join(directory, "results.csv")
+            merge_parts(output_dir, merged)
+            with open(merged, newline="") as f:
+                rows = list(csv.DictReader(f))
+        self.assertEqual([int(row["scenario"]) for row in rows], list(range(20)))
+
+    def test_resume_refuses_a_different_sweep(self):
+        with tempfile.TemporaryDirectory() as directory:
+            run_sweep(self.spec, directory, workers=1, chunk_size=6)
+            with self.assertRaisesRegex(ValueError, "chunk_size"):
+                run_sweep(self.spec, directory, workers=1, chunk_size=5)
+            with self.assertRaisesRegex(ValueError, "spec_sha256"):
+                run_sweep(dict(self.spec, loan_term=[20]), directory, workers=1, chunk_size=6)
+            # The same spec with its keys in another order is the same sweep.
+            stats = run_sweep(dict(reversed(list(self.spec.items()))), directory, workers=1, chunk_size=6)
+            self.assertEqual(stats["skipped"], 20)
+            with self.assertRaises(ValueError):
+                merge_parts(directory, os.path.join(directory, "results.parquet"))
+
+    @unittest.skipIf(pyarrow is None, "pyarrow is not installed")
+    def test_merge_parquet_parts(self):
+        import pyarrow.parquet as pq
+
+        with tempfile.TemporaryDirectory() as directory:
+            output_dir = os.path.join(directory, "sweep")
+            run_sweep(self.spec, output_dir, workers=1, chunk_size=6, file_format="parquet")
+            merged = os.path.join(directory, "results.parquet")
+            merge_parts(output_dir, merged)
+            self.assertEqual(pq.read_table(merged).column("scenario").to_pylist(), list(range(20)))
+
+
+if __name__ == '__main__':
+    unittest.main()
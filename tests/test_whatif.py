@@ -0,0 +1,72 @@
+# tests/test_whatif.py
+
+import unittest
+from unittest import mock
+from mortgage import whatif
+from mortgage.calculator import MortgageCalculator
+from mortgage.plan import PrepaymentPlan, PrepaymentRule
+from mortgage.rates import RateSchedule
+from mortgage.whatif import compare_plans, format_comparison
+
+
+class TestComparePlans(unittest.TestCase):
+    def setUp(self):
+        self.calculator = MortgageCalculator(home_value=500000, down_payment=100000, loan_term=30, interest_rate=6.375)
+        self.plans = {
+            "monthly": PrepaymentPlan([PrepaymentRule(1, 1, None, 1000.0)], horizon=360),
+            "yearly": PrepaymentPlan([PrepaymentRule(12, 12, None, 12000.0)], horizon=360),
+            "lump sum": {60: 100000.0},
+            "pay off early": PrepaymentPlan([PrepaymentRule(1, 1, None, 500.0)], {24: 1e6}, horizon=360),
+            "nothing": {},
+        }
+
+    def check_against_simulation(self, rows, calculator):
+        base = calculator.summarize({})
+        for row in rows:
+            summary = calculator.summarize(self.plans[row["plan"]])
+            self.assertEqual(row["payoff_month"], summary.final_month)
+            self.assertEqual(row["months_saved"], base.final_month - summary.final_month)
+            self.assertAlmostEqual(row["total_interest"], summary.total_interest, places=4)
+            self.assertAlmostEqual(row["interest_saved"], base.total_interest - summary.total_interest, places=4)
+            self.assertAlmostEqual(row["total_extra"], summary.total_extra, places=4)
+
+    def test_matches_simulation(self):
+        rows = compare_plans(self.calculator, self.plans)
+        self.check_against_simulation(rows, self.calculator)
+        # The balance left at month 24 is paid off with the lump sum, not the whole $1M.
+        early = next(row for row in rows if row["plan"] == "pay off early")
+        self.assertEqual(early["payoff_month"], 24)
+        self.assertLess(early["total_extra"], 400000)
+        nothing = next(row for row in rows if row["plan"] == "nothing")
+        self.assertEqual((nothing["interest_saved"], nothing["efficiency"]), (0, 0.0))
+
+    def test_without_numpy_and_with_rate_schedules(self):
+        with mock.patch.object(whatif, "summarize_plans", None):
+            self.check_against_simulation(compare_plans(self.calculator, self.plans), self.calculator)
+        arm = MortgageCalculator(500000, 100000, 30, 5.0, rate_schedule=RateSchedule.arm(5.0, 7.0))
+        self.check_against_simulation(compare_plans(arm, self.plans), arm)
+
+    def test_zero_rate(self):
+        calculator = MortgageCalculator(500000, 100000, 30, 0)
+        self.check_against_simulation(compare_plans(calculator, self.plans), calculator)
+
+    def test_ranking(self):
+        rows = compare_plans(self.calculator, self.plans)
+        self.assertEqual([row["rank"] for row in rows], [1, 2, 3, 4, 5])
+        saved = [row["interest_saved"] for row in rows]
+        self.assertEqual(saved, sorted(saved, reverse=True))
+        rows = compare_plans(self.calculator, self.plans, sort_by="payoff_month")
+        self.assertEqual(rows[0]["plan"], "pay off early")
+        rows = compare_plans(self.calculator, list(self.plans.values()), sort_by="efficiency")
+        self.assertEqual({row["plan"] for row in rows}, {f"Plan {number}" for number in range(1, 6)})
+        with self.assertRaises(ValueError):
+            compare_plans(self.calculator, self.plans, sort_by="name")
+
+    def test_format(self):
+        table = format_comparison(compare_plans(self.calculator, self.plans))
+        self.assertEqual(len(table.splitlines()), 6)
+        self.assertIn("Interest Saved", table.splitlines()[0])
+
+
+if __name__ == '__main__':
+    unittest.main()